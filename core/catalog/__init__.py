@@ -0,0 +1,12 @@
+"""Course catalog module."""
+
+from .index import CatalogError, CourseCatalog, Exercise, Lesson, Module, load_catalog
+
+__all__ = [
+    "CatalogError",
+    "CourseCatalog",
+    "Exercise",
+    "Lesson",
+    "Module",
+    "load_catalog",
+]
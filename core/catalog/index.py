@@ -0,0 +1,396 @@
+"""Cached, typed index of the course modules, lessons and exercises.
+
+Every ``modules/*/module.yaml`` is parsed once into a ``CourseCatalog``. The
+parsed data is persisted to a JSON cache together with each file's size,
+mtime and SHA-256; on the next load only files whose content changed are
+parsed again. Within a process the catalog is also memoized, so scripts and
+tests can call ``load_catalog()`` freely.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..utils.io import load_yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CACHE_FILENAME = Path(".cache") / "catalog.json"
+
+_CACHE_FORMAT = 1
+
+
+class CatalogError(KeyError):
+    """Raised when a module, lesson or exercise slug is not in the catalog."""
+
+
+@dataclass(frozen=True)
+class Lesson:
+    """Lesson entry of a module."""
+
+    slug: str
+    title: str
+    notebook: Path
+    est_time_min: int | None
+    test_enabled: bool
+    data: dict[str, Any] = field(compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class Exercise:
+    """Exercise entry of a module."""
+
+    slug: str
+    title: str
+    notebook: Path
+    tests: Path | None
+    max_score: int | None
+    create: bool
+    test_enabled: bool
+    data: dict[str, Any] = field(compare=False, repr=False)
+
+
+@dataclass(frozen=True)
+class Module:
+    """Course module parsed from its ``module.yaml``.
+
+    ``data`` keeps the raw YAML mapping, so schema checks and scripts can
+    still inspect every field; the typed attributes use safe defaults when a
+    field is missing.
+    """
+
+    slug: str
+    title: str
+    order: int
+    path: Path
+    prerequisites: tuple[str, ...]
+    outcomes: tuple[str, ...]
+    lessons: tuple[Lesson, ...]
+    exercises: tuple[Exercise, ...]
+    test_enabled: bool
+    data: dict[str, Any] = field(compare=False, repr=False)
+
+    @property
+    def directory(self) -> Path:
+        """Module directory (parent of ``module.yaml``)."""
+        return self.path.parent
+
+    def lesson(self, slug: str) -> Lesson:
+        """Return the lesson with the given slug."""
+        for lesson in self.lessons:
+            if lesson.slug == slug:
+                return lesson
+        raise CatalogError(f"Lesson '{slug}' not found in module '{self.slug}'")
+
+    def exercise(self, slug: str) -> Exercise:
+        """Return the exercise with the given slug."""
+        for exercise in self.exercises:
+            if exercise.slug == slug:
+                return exercise
+        raise CatalogError(f"Exercise '{slug}' not found in module '{self.slug}'")
+
+    @classmethod
+    def from_data(cls, yaml_path: Path, data: dict[str, Any]) -> "Module":
+        """Build a module from the raw ``module.yaml`` mapping."""
+        module_dir = yaml_path.parent
+        lessons = tuple(
+            Lesson(
+                slug=str(item.get("slug", "")),
+                title=str(item.get("title", "")),
+                notebook=module_dir / str(item.get("notebook", "")),
+                est_time_min=item.get("est_time_min"),
+                test_enabled=bool(item.get("test_enabled", True)),
+                data=item,
+            )
+            for item in _as_list(data.get("lessons"))
+            if isinstance(item, dict)
+        )
+        exercises = tuple(
+            Exercise(
+                slug=str(item.get("slug", "")),
+                title=str(item.get("title", "")),
+                notebook=module_dir
+                / str(item.get("notebook", f"exercises/{item.get('slug')}.ipynb")),
+                tests=module_dir / item["tests"] if item.get("tests") else None,
+                max_score=item.get("max_score"),
+                create=bool(item.get("create", False)),
+                test_enabled=bool(item.get("test_enabled", True)),
+                data=item,
+            )
+            for item in _as_list(data.get("exercises"))
+            if isinstance(item, dict)
+        )
+        order = data.get("order")
+        return cls(
+            slug=str(data.get("slug", module_dir.name)),
+            title=str(data.get("title", "")),
+            order=order if isinstance(order, int) else 0,
+            path=yaml_path,
+            prerequisites=tuple(str(p) for p in _as_list(data.get("prerequisites"))),
+            outcomes=tuple(str(o) for o in _as_list(data.get("outcomes"))),
+            lessons=lessons,
+            exercises=exercises,
+            test_enabled=bool(data.get("test_enabled", True)),
+            data=data,
+        )
+
+
+def _as_list(value: Any) -> list[Any]:
+    return value if isinstance(value, list) else []
+
+
+@dataclass
+class CourseCatalog:
+    """Index of all course modules with slug lookups and prerequisite queries."""
+
+    root: Path
+    modules: list[Module]
+    missing_yaml: list[Path] = field(default_factory=list)
+    errors: dict[Path, str] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._by_slug = {module.slug: module for module in self.modules}
+
+    def __iter__(self) -> Iterator[Module]:
+        return iter(self.modules)
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self._by_slug
+
+    @property
+    def slugs(self) -> set[str]:
+        """Slugs of all modules."""
+        return set(self._by_slug)
+
+    def module(self, slug: str) -> Module:
+        """Return the module with the given slug."""
+        try:
+            return self._by_slug[slug]
+        except KeyError:
+            raise CatalogError(f"Module '{slug}' not found") from None
+
+    def lesson(self, module_slug: str, lesson_slug: str) -> Lesson:
+        """Return a lesson by module and lesson slug."""
+        return self.module(module_slug).lesson(lesson_slug)
+
+    def exercise(self, module_slug: str, exercise_slug: str) -> Exercise:
+        """Return an exercise by module and exercise slug."""
+        return self.module(module_slug).exercise(exercise_slug)
+
+    def enabled_modules(self) -> list[Module]:
+        """Modules with ``test_enabled`` (default True)."""
+        return [module for module in self.modules if module.test_enabled]
+
+    def by_order(self) -> list[Module]:
+        """Modules sorted by their ``order`` field."""
+        return sorted(self.modules, key=lambda module: (module.order, module.slug))
+
+    def prerequisites(self, slug: str, transitive: bool = False) -> list[str]:
+        """
+        Return the prerequisite slugs of a module.
+
+        Args:
+            slug: Module slug
+            transitive: Include prerequisites of prerequisites
+
+        Returns:
+            Slugs, direct ones in declaration order; transitive ones in
+            dependency order (a module always after its own prerequisites)
+        """
+        direct = list(self.module(slug).prerequisites)
+        if not transitive:
+            return direct
+        result: list[str] = []
+        visiting: set[str] = set()
+
+        def visit(current: str) -> None:
+            if current in result or current in visiting:
+                return
+            visiting.add(current)
+            if current in self._by_slug:
+                for prereq in self._by_slug[current].prerequisites:
+                    visit(prereq)
+            visiting.discard(current)
+            result.append(current)
+
+        for prereq in direct:
+            visit(prereq)
+        return result
+
+    def dependents(self, slug: str, transitive: bool = False) -> list[str]:
+        """Return the slugs of modules that require ``slug``."""
+        dependents = [
+            module.slug for module in self.by_order() if slug in module.prerequisites
+        ]
+        if not transitive:
+            return dependents
+        return [
+            module.slug
+            for module in self.by_order()
+            if slug in self.prerequisites(module.slug, transitive=True)
+        ]
+
+    def missing_prerequisites(self) -> dict[str, list[str]]:
+        """Map module slug to the prerequisites that do not exist."""
+        missing = {}
+        for module in self.modules:
+            unknown = [p for p in module.prerequisites if p not in self._by_slug]
+            if unknown:
+                missing[module.slug] = unknown
+        return missing
+
+    def topological_order(self) -> list[str]:
+        """
+        Return module slugs so that every module comes after its prerequisites.
+
+        Raises:
+            ValueError: If the prerequisite graph has a cycle
+        """
+        order: list[str] = []
+        state: dict[str, int] = {}
+
+        def visit(current: str, path: list[str]) -> None:
+            if state.get(current) == 2:
+                return
+            if state.get(current) == 1:
+                cycle = " -> ".join([*path, current])
+                raise ValueError(f"Prerequisite cycle: {cycle}")
+            state[current] = 1
+            for prereq in self._by_slug[current].prerequisites:
+                if prereq in self._by_slug:
+                    visit(prereq, [*path, current])
+            state[current] = 2
+            order.append(current)
+
+        for module in self.by_order():
+            visit(module.slug, [])
+        return order
+
+
+def _file_signature(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _scan(root: Path) -> tuple[list[Path], list[Path]]:
+    """Return (module.yaml paths, module dirs without module.yaml)."""
+    modules_dir = root / "modules"
+    if not modules_dir.exists():
+        return [], []
+    yaml_paths, missing = [], []
+    for module_dir in sorted(p for p in modules_dir.iterdir() if p.is_dir()):
+        yaml_path = module_dir / "module.yaml"
+        if yaml_path.exists():
+            yaml_paths.append(yaml_path)
+        else:
+            missing.append(module_dir)
+    return yaml_paths, missing
+
+
+def _read_cache(cache_path: Path, root: Path) -> dict[str, Any]:
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("format") != _CACHE_FORMAT or cache.get("root") != str(root):
+        return {}
+    files: dict[str, Any] = cache.get("files", {})
+    return files
+
+
+def _write_cache(cache_path: Path, root: Path, files: dict[str, Any]) -> None:
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"format": _CACHE_FORMAT, "root": str(root), "files": files},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # The cache is an optimization: read-only checkouts, and YAML values
+        # JSON cannot hold (dates, ...), just skip it.
+        pass
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+_MEMO: dict[Path, tuple[tuple[tuple[str, int, int], ...], CourseCatalog]] = {}
+
+
+def load_catalog(
+    root: Path | str | None = None,
+    cache_path: Path | str | None = None,
+    use_cache: bool = True,
+    strict: bool = True,
+) -> CourseCatalog:
+    """
+    Build (or reuse) the catalog of all ``modules/*/module.yaml`` files.
+
+    Args:
+        root: Project root (defaults to the repository containing ``core``)
+        cache_path: JSON cache file (defaults to ``<root>/.cache/catalog.json``)
+        use_cache: Reuse the in-process and on-disk caches
+        strict: Raise if a module.yaml cannot be read or parsed; with False
+            such files are skipped and listed in ``errors``
+
+    Returns:
+        CourseCatalog with modules sorted by directory name
+
+    Raises:
+        ValueError: If ``strict`` and any module.yaml cannot be parsed
+    """
+    root_path = Path(root).resolve() if root is not None else PROJECT_ROOT
+    yaml_paths, missing = _scan(root_path)
+    signature = tuple((str(path), *_file_signature(path)) for path in yaml_paths)
+    if use_cache and root_path in _MEMO and _MEMO[root_path][0] == signature:
+        return _MEMO[root_path][1]
+
+    cache_file = Path(cache_path) if cache_path else root_path / CACHE_FILENAME
+    cached = _read_cache(cache_file, root_path) if use_cache else {}
+    files: dict[str, Any] = {}
+    modules = []
+    errors = {}
+    dirty = not use_cache or set(cached) != {
+        p.relative_to(root_path).as_posix() for p in yaml_paths
+    }
+
+    for yaml_path, (_, size, mtime_ns) in zip(yaml_paths, signature, strict=True):
+        rel = yaml_path.relative_to(root_path).as_posix()
+        entry = cached.get(rel)
+        if entry is None or (entry["size"], entry["mtime_ns"]) != (size, mtime_ns):
+            digest = _sha256(yaml_path)
+            if entry is None or entry["sha256"] != digest:
+                try:
+                    entry = {"sha256": digest, "data": load_yaml(yaml_path)}
+                except Exception as e:
+                    errors[yaml_path] = str(e)
+                    continue
+            entry = {**entry, "size": size, "mtime_ns": mtime_ns}
+            dirty = True
+        files[rel] = entry
+        modules.append(Module.from_data(yaml_path, entry["data"]))
+
+    if use_cache and dirty:
+        _write_cache(cache_file, root_path, files)
+    if strict and errors:
+        details = "\n".join(f"  {path}: {error}" for path, error in errors.items())
+        raise ValueError(f"Invalid module.yaml files:\n{details}")
+
+    catalog = CourseCatalog(root_path, modules, missing, errors)
+    if use_cache and not errors:
+        _MEMO[root_path] = (signature, catalog)
+    return catalog
@@ -0,0 +1,33 @@
+"""Clustering for data that does not fit in memory."""
+
+from .evaluation import (
+    ClusterScores,
+    SilhouetteEstimate,
+    cluster_scores,
+    sampled_silhouette,
+    silhouette_samples_multi,
+    silhouette_scores,
+)
+from .hierarchical import NNChainClustering, condensed_distances, nn_chain_linkage
+from .kmeans import (
+    KMeansSweepResult,
+    StreamingKMeans,
+    reservoir_sample,
+    streaming_kmeans_sweep,
+)
+
+__all__ = [
+    "ClusterScores",
+    "SilhouetteEstimate",
+    "cluster_scores",
+    "sampled_silhouette",
+    "silhouette_samples_multi",
+    "silhouette_scores",
+    "NNChainClustering",
+    "condensed_distances",
+    "nn_chain_linkage",
+    "KMeansSweepResult",
+    "StreamingKMeans",
+    "reservoir_sample",
+    "streaming_kmeans_sweep",
+]
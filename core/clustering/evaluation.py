@@ -0,0 +1,393 @@
+"""Cluster quality scores for large datasets.
+
+* ``silhouette_scores`` computes the exact silhouette without the (n, n)
+  distance matrix: distances are produced one block of rows at a time, and
+  one sparse product per block turns them into the per-cluster distance sums
+  of *every* labeling at once. Comparing k = 2..10 therefore costs a single
+  distance pass instead of one O(n^2) call per k.
+* ``sampled_silhouette`` estimates the mean silhouette from a sample drawn
+  per cluster (stratified, proportional allocation). Each sampled point's
+  silhouette is exact (measured against all points), so the estimate is
+  unbiased and its confidence interval comes from the stratified variance.
+* ``cluster_scores`` computes inertia, Calinski-Harabasz and Davies-Bouldin
+  from per-cluster sufficient statistics (counts, sums, sums of squared
+  norms) accumulated over chunks. Davies-Bouldin needs the mean distance to
+  the centroid, which takes a second pass once the centroids are known.
+"""
+
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import numpy as np
+from scipy import sparse, stats
+from scipy.spatial.distance import cdist
+
+from ..utils.datasets import DEFAULT_CHUNK_SIZE, ChunkSource, iter_chunks
+
+DEFAULT_MAX_MEMORY_MB = 64
+
+FloatArray = np.ndarray[Any, np.dtype[np.float64]]
+IntArray = np.ndarray[Any, np.dtype[np.intp]]
+
+
+class _Labelings:
+    """Several labelings of the same rows, encoded as stacked cluster codes."""
+
+    def __init__(self, labelings: Sequence[Any], n_samples: int | None = None) -> None:
+        self.codes: list[IntArray] = []
+        self.n_clusters: list[int] = []
+        for labels in labelings:
+            _, codes = np.unique(np.asarray(labels), return_inverse=True)
+            if n_samples is None:
+                n_samples = len(codes)
+            elif len(codes) != n_samples:
+                raise ValueError(
+                    f"Labels have {len(codes)} entries, X has {n_samples} rows"
+                )
+            self.codes.append(codes.ravel())
+            self.n_clusters.append(int(codes.max()) + 1 if len(codes) else 0)
+        if not self.codes:
+            raise ValueError("At least one labeling is needed")
+        self.offsets = np.concatenate([[0], np.cumsum(self.n_clusters)])
+        self.counts = np.bincount(
+            np.concatenate(
+                [
+                    codes + offset
+                    for codes, offset in zip(self.codes, self.offsets[:-1], strict=True)
+                ]
+            ),
+            minlength=int(self.offsets[-1]),
+        )
+
+    def segments(self) -> list[slice]:
+        return [
+            slice(a, b)
+            for a, b in zip(self.offsets[:-1], self.offsets[1:], strict=True)
+        ]
+
+    def indicator(self, rows: slice | IntArray) -> sparse.csr_matrix:
+        """(rows, total clusters) 0/1 matrix with one 1 per labeling and row."""
+        columns = np.stack(
+            [
+                codes[rows] + offset
+                for codes, offset in zip(self.codes, self.offsets[:-1], strict=True)
+            ],
+            axis=1,
+        )
+        n_rows, n_labelings = columns.shape
+        return sparse.csr_matrix(
+            (
+                np.ones(columns.size),
+                columns.ravel(),
+                np.arange(0, columns.size + 1, n_labelings),
+            ),
+            shape=(n_rows, int(self.offsets[-1])),
+        )
+
+
+def _distances(
+    X: FloatArray, rows: IntArray, X_sq: FloatArray | None, metric: str
+) -> FloatArray:
+    """Distances from ``X[rows]`` to every row of ``X``."""
+    Q = X[rows]
+    if X_sq is None:
+        block: FloatArray = cdist(Q, X, metric=metric)
+        return block
+    d2 = Q @ X.T
+    d2 *= -2
+    d2 += X_sq[rows, None]
+    d2 += X_sq[None, :]
+    np.maximum(d2, 0.0, out=d2)
+    d2[np.arange(len(rows)), rows] = 0.0  # exact zero to itself
+    distances: FloatArray = np.sqrt(d2, out=d2)
+    return distances
+
+
+def _silhouette_rows(
+    X: FloatArray,
+    rows: IntArray,
+    labelings: _Labelings,
+    metric: str,
+    max_memory_mb: float,
+) -> FloatArray:
+    """Exact silhouette of ``X[rows]`` for every labeling, (n_labelings, rows)."""
+    for n_clusters in labelings.n_clusters:
+        if not 2 <= n_clusters <= len(X) - 1:
+            raise ValueError(
+                f"Silhouette needs 2 <= n_clusters <= n_samples - 1, got {n_clusters}"
+            )
+    X_sq = np.einsum("ij,ij->i", X, X) if metric == "euclidean" else None
+    # (n, total clusters): one product per block gives all per-cluster sums
+    members = labelings.indicator(slice(None)).T.tocsr()
+    block_rows = max(1, int(max_memory_mb * 2**20) // (8 * len(X)))
+    values = np.empty((len(labelings.codes), len(rows)))
+    for start in range(0, len(rows), block_rows):
+        block = rows[start : start + block_rows]
+        sums = (members @ _distances(X, block, X_sq, metric).T).T
+        local = np.arange(len(block))
+        for i, segment in enumerate(labelings.segments()):
+            counts = labelings.counts[segment]
+            own = labelings.codes[i][block]
+            cluster_sums = sums[:, segment]
+            own_size = counts[own]
+            a = cluster_sums[local, own] / np.maximum(own_size - 1, 1)
+            means = cluster_sums / counts
+            means[local, own] = np.inf
+            b = means.min(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                s = (b - a) / np.maximum(a, b)
+            # Points alone in their cluster score 0 (as in scikit-learn)
+            values[i, start : start + len(block)] = np.where(
+                own_size > 1, np.nan_to_num(s), 0.0
+            )
+    return values
+
+
+def silhouette_samples_multi(
+    X: Any,
+    labelings: Sequence[Any],
+    metric: str = "euclidean",
+    max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+) -> FloatArray:
+    """
+    Exact silhouette of every sample, for several labelings in one pass.
+
+    Args:
+        X: (n_samples, n_features) data (a memmap is read block by block)
+        labelings: Label arrays, one per clustering (e.g. one per k)
+        metric: "euclidean" (BLAS) or any ``cdist`` metric
+        max_memory_mb: Budget of one block of distances
+
+    Returns:
+        (n_labelings, n_samples) silhouette values
+    """
+    X = np.asarray(X, dtype=np.float64)
+    labels = _Labelings(labelings, len(X))
+    return _silhouette_rows(X, np.arange(len(X)), labels, metric, max_memory_mb)
+
+
+def silhouette_scores(
+    X: Any,
+    labelings: Sequence[Any],
+    metric: str = "euclidean",
+    max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+) -> FloatArray:
+    """
+    Mean silhouette of each labeling; equals ``silhouette_score`` per labeling.
+
+    Example:
+        >>> labelings = [KMeans(k).fit_predict(X) for k in range(2, 11)]
+        >>> scores = silhouette_scores(X, labelings)  # one distance pass
+    """
+    values: FloatArray = silhouette_samples_multi(
+        X, labelings, metric, max_memory_mb
+    ).mean(axis=1)
+    return values
+
+
+@dataclass
+class SilhouetteEstimate:
+    """Mean silhouette estimated from a stratified sample."""
+
+    mean: float
+    std_error: float
+    low: float
+    high: float
+    confidence: float
+    sample_size: int
+
+    def to_dict(self) -> dict[str, Any]:
+        """Flat row for a DataFrame."""
+        return asdict(self)
+
+    def __str__(self) -> str:
+        return (
+            f"silhouette = {self.mean:.4f} "
+            f"({self.confidence:.0%} CI: {self.low:.4f} to {self.high:.4f}, "
+            f"n = {self.sample_size})"
+        )
+
+
+def _stratified_sample(
+    codes: IntArray, sample_size: int, rng: np.random.Generator
+) -> list[IntArray]:
+    """Row indices per cluster, proportional to the cluster sizes."""
+    counts = np.bincount(codes)
+    allocation = np.minimum(
+        counts, np.maximum(np.round(sample_size * counts / len(codes)), 2)
+    ).astype(np.intp)
+    order = np.argsort(codes, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    return [
+        rng.choice(order[starts[h] : starts[h + 1]], allocation[h], replace=False)
+        for h in range(len(counts))
+    ]
+
+
+def sampled_silhouette(
+    X: Any,
+    labels: Any,
+    sample_size: int = 2000,
+    confidence: float = 0.95,
+    metric: str = "euclidean",
+    random_state: int | None = None,
+    max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+) -> SilhouetteEstimate:
+    """
+    Estimate the mean silhouette with a confidence interval.
+
+    About ``sample_size`` points are drawn per cluster in proportion to its
+    size (at least 2 each), and their silhouettes are computed exactly
+    against all ``n`` points: O(sample_size * n) instead of O(n^2). The
+    interval uses the stratified-sampling variance with the finite
+    population correction, so a sample covering every point has zero width.
+
+    Args:
+        X: (n_samples, n_features) data
+        labels: Cluster of each sample
+        sample_size: Approximate number of sampled points
+        confidence: Confidence level of the interval
+        metric: "euclidean" or any ``cdist`` metric
+        random_state: Seed of the sample
+        max_memory_mb: Budget of one block of distances
+
+    Returns:
+        SilhouetteEstimate
+    """
+    X = np.asarray(X, dtype=np.float64)
+    labelings = _Labelings([labels], len(X))
+    codes = labelings.codes[0]
+    strata = _stratified_sample(codes, sample_size, np.random.default_rng(random_state))
+    rows = np.concatenate(strata)
+    values = _silhouette_rows(X, rows, labelings, metric, max_memory_mb)[0]
+
+    n = len(codes)
+    mean = variance = 0.0
+    start = 0
+    for h, stratum in enumerate(strata):
+        sampled = values[start : start + len(stratum)]
+        start += len(stratum)
+        weight = labelings.counts[h] / n
+        mean += weight * float(sampled.mean())
+        if len(sampled) > 1:
+            correction = 1 - len(sampled) / labelings.counts[h]
+            variance += (
+                weight**2 * correction * float(sampled.var(ddof=1)) / len(sampled)
+            )
+    std_error = float(np.sqrt(variance))
+    z = float(stats.norm.ppf(0.5 + confidence / 2))
+    return SilhouetteEstimate(
+        mean=mean,
+        std_error=std_error,
+        low=mean - z * std_error,
+        high=mean + z * std_error,
+        confidence=confidence,
+        sample_size=len(rows),
+    )
+
+
+@dataclass
+class ClusterScores:
+    """Internal validity scores of one labeling."""
+
+    n_clusters: int
+    inertia: float
+    calinski_harabasz: float
+    davies_bouldin: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Flat row for a DataFrame."""
+        return asdict(self)
+
+
+def cluster_scores(
+    X: ChunkSource,
+    labelings: Sequence[Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[ClusterScores]:
+    """
+    Inertia, Calinski-Harabasz and Davies-Bouldin of several labelings.
+
+    The first pass accumulates, per cluster of every labeling, the count,
+    the sum of the rows and the sum of their squared norms (one sparse
+    product per chunk), all relative to the mean of the first chunk so that
+    a large feature offset does not cancel the within-cluster sums.
+    Inertia and Calinski-Harabasz follow from these alone; a second pass
+    measures the mean distance of each cluster's points to its centroid for
+    Davies-Bouldin. Scores equal scikit-learn's ``calinski_harabasz_score``
+    and ``davies_bouldin_score`` up to rounding.
+
+    Args:
+        X: Data as accepted by ``iter_chunks`` (array, memmap, file, ...)
+        labelings: Label arrays aligned with the rows of ``X``
+        chunk_size: Rows per chunk
+
+    Returns:
+        One ClusterScores per labeling
+    """
+    labels = _Labelings(labelings)
+    n_total = int(labels.offsets[-1])
+    sums: FloatArray | None = None
+    squared = np.zeros(n_total)
+    start = 0
+    n_labels = len(labels.codes[0])
+    shift: FloatArray | None = None
+    for block in iter_chunks(X, chunk_size, dtype=np.float64):
+        if start + len(block) > n_labels:
+            raise ValueError(f"Labels have {n_labels} entries, X has more rows")
+        if shift is None:
+            shift = block.mean(axis=0)
+        block = block - shift
+        members = labels.indicator(slice(start, start + len(block))).T.tocsr()
+        block_sums = members @ block
+        sums = block_sums if sums is None else sums + block_sums
+        squared += members @ np.einsum("ij,ij->i", block, block)
+        start += len(block)
+    if sums is None or shift is None:
+        raise ValueError("The data source is empty")
+    if start != n_labels:
+        raise ValueError(f"Labels have {n_labels} entries, X has {start} rows")
+
+    counts = labels.counts.astype(np.float64)
+    # Centroids relative to the shift; every score below is shift-invariant
+    centroids = sums / np.maximum(counts, 1)[:, None]
+    within = squared - counts * np.einsum("ij,ij->i", centroids, centroids)
+
+    # Second pass: mean distance of each cluster's points to its centroid
+    spread = np.zeros(n_total)
+    start = 0
+    for block in iter_chunks(X, chunk_size, dtype=np.float64):
+        block = block - shift
+        for codes, offset in zip(labels.codes, labels.offsets[:-1], strict=True):
+            own = codes[start : start + len(block)] + offset
+            distance = np.linalg.norm(block - centroids[own], axis=1)
+            spread += np.bincount(own, weights=distance, minlength=n_total)
+        start += len(block)
+    spread /= np.maximum(counts, 1)
+
+    results = []
+    for i, segment in enumerate(labels.segments()):
+        k = labels.n_clusters[i]
+        if not 2 <= k <= start - 1:
+            raise ValueError(f"Scores need 2 <= n_clusters <= n_samples - 1, got {k}")
+        n_k, c_k = counts[segment], centroids[segment]
+        overall = sums[segment].sum(axis=0) / start
+        between = float(np.sum(n_k * np.sum((c_k - overall) ** 2, axis=1)))
+        intra = float(max(within[segment].sum(), 0.0))
+        ch = 1.0 if intra == 0 else between * (start - k) / (intra * (k - 1))
+
+        s_k = spread[segment]
+        separation = cdist(c_k, c_k)
+        separation[separation == 0] = np.inf
+        ratios = (s_k[:, None] + s_k[None, :]) / separation
+        db = 0.0 if np.allclose(s_k, 0) else float(ratios.max(axis=1).mean())
+        results.append(
+            ClusterScores(
+                n_clusters=k,
+                inertia=intra,
+                calinski_harabasz=float(ch),
+                davies_bouldin=db,
+            )
+        )
+    return results
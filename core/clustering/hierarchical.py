@@ -0,0 +1,291 @@
+"""Agglomerative clustering with the nearest-neighbor chain algorithm.
+
+The classic agglomerative loop scans the whole distance matrix for the
+closest pair at every merge. The nearest-neighbor chain follows nearest
+neighbors from any cluster until two clusters are each other's nearest
+neighbor, and merges them: for the "reducible" linkages (ward, complete,
+average, single) this yields the same hierarchy in O(n^2) time, looking at
+one row of distances at a time.
+
+Memory depends on the linkage:
+
+* **ward** needs no distance matrix. The Ward distance of two clusters
+  follows from their centroids and sizes,
+  ``sqrt(2 |A| |B| / (|A| + |B|)) * ||c_A - c_B||``, so only the (n, d)
+  centroids are kept;
+* **complete**, **average** and **single** keep a condensed float32 matrix
+  (``n (n - 1) / 2`` values, half of SciPy's float64 one), filled in row
+  blocks and updated in place with the Lance-Williams formulas.
+
+The result is a SciPy linkage matrix, so ``scipy.cluster.hierarchy``'s
+``dendrogram`` and ``fcluster`` work on it unchanged.
+"""
+
+from typing import Any
+
+import numpy as np
+from scipy.cluster.hierarchy import fcluster
+from scipy.spatial.distance import cdist
+from sklearn.base import BaseEstimator, ClusterMixin
+
+METHODS = ("ward", "complete", "average", "single")
+
+# Rows of the condensed matrix computed per cdist call
+_BLOCK_ROWS = 256
+
+FloatArray = np.ndarray[Any, np.dtype[np.float64]]
+
+
+def condensed_distances(
+    X: Any,
+    metric: str = "euclidean",
+    dtype: Any = np.float32,
+    block_rows: int = _BLOCK_ROWS,
+) -> np.ndarray[Any, Any]:
+    """
+    Condensed pairwise distances (as ``scipy.spatial.distance.pdist``).
+
+    The distances are computed ``block_rows`` rows at a time and stored in
+    ``dtype``, so the peak memory is the condensed array itself.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n = len(X)
+    condensed = np.empty(n * (n - 1) // 2, dtype=dtype)
+    for start in range(0, n - 1, block_rows):
+        stop = min(start + block_rows, n - 1)
+        block = cdist(X[start:stop], X[start + 1 :], metric=metric)
+        for i in range(start, stop):
+            # Row i holds d(i, j) for j > i, at offset n*i - i*(i+1)/2
+            offset = n * i - i * (i + 1) // 2
+            condensed[offset : offset + n - 1 - i] = block[i - start, i - start :]
+    return condensed
+
+
+def _condensed_index(n: int, i: int, others: np.ndarray[Any, Any]) -> Any:
+    """Positions of d(i, j) in a condensed matrix, for every j in ``others``."""
+    low = np.minimum(others, i)
+    high = np.maximum(others, i)
+    return n * low - low * (low + 1) // 2 + high - low - 1
+
+
+class _WardDistances:
+    """
+    Ward distances from cluster centroids; no pairwise matrix.
+
+    Active clusters occupy the first ``m`` slots of the centroid array;
+    a retired cluster's slot is filled with the last one, so each row is one
+    contiguous pass over the active centroids.
+    """
+
+    def __init__(self, X: FloatArray) -> None:
+        self.centroids = X.copy()
+        self.sizes = np.ones(len(X))
+        self.ids = np.arange(len(X))
+        self.slot = np.arange(len(X))
+        self.m = len(X)
+
+    def first(self) -> int:
+        return int(self.ids[0])
+
+    def row(self, c: int) -> tuple[np.ndarray[Any, Any], FloatArray]:
+        m, s = self.m, self.slot[c]
+        diff = self.centroids[:m] - self.centroids[s]
+        sizes = self.sizes[:m]
+        weight = 2 * self.sizes[s] * sizes / (self.sizes[s] + sizes)
+        distances: FloatArray = np.sqrt(weight * np.einsum("ij,ij->i", diff, diff))
+        distances[s] = np.inf
+        return self.ids[:m], distances
+
+    def position(self, k: int) -> int:
+        return int(self.slot[k])
+
+    def merge(self, a: int, b: int) -> None:
+        sa, sb = self.slot[a], self.slot[b]
+        total = self.sizes[sa] + self.sizes[sb]
+        self.centroids[sa] = (
+            self.sizes[sa] * self.centroids[sa] + self.sizes[sb] * self.centroids[sb]
+        ) / total
+        self.sizes[sa] = total
+        self.m -= 1
+        last = self.m
+        self.centroids[sb] = self.centroids[last]
+        self.sizes[sb] = self.sizes[last]
+        self.ids[sb] = self.ids[last]
+        self.slot[self.ids[sb]] = sb
+
+
+class _CondensedDistances:
+    """Condensed matrix updated with the Lance-Williams formulas."""
+
+    def __init__(self, condensed: np.ndarray[Any, Any], n: int, method: str) -> None:
+        self.condensed = condensed
+        self.n = n
+        self.method = method
+        self.sizes = np.ones(n)
+        self.active = np.arange(n)
+
+    def first(self) -> int:
+        return int(self.active[0])
+
+    def row(self, c: int) -> tuple[np.ndarray[Any, Any], Any]:
+        distances = self.condensed[_condensed_index(self.n, c, self.active)]
+        distances[self.position(c)] = np.inf
+        return self.active, distances
+
+    def position(self, k: int) -> int:
+        return int(np.searchsorted(self.active, k))
+
+    def merge(self, a: int, b: int) -> None:
+        self.active = np.delete(self.active, self.position(b))
+        others = np.delete(self.active, self.position(a))
+        index_a = _condensed_index(self.n, a, others)
+        d_a = self.condensed[index_a]
+        d_b = self.condensed[_condensed_index(self.n, b, others)]
+        if self.method == "complete":
+            merged = np.maximum(d_a, d_b)
+        elif self.method == "single":
+            merged = np.minimum(d_a, d_b)
+        else:
+            size_a, size_b = self.sizes[a], self.sizes[b]
+            merged = (size_a * d_a + size_b * d_b) / (size_a + size_b)
+        self.condensed[index_a] = merged
+        self.sizes[a] += self.sizes[b]
+
+
+def _nn_chain(distances: Any, n: int) -> FloatArray:
+    """
+    Merges (a, b, distance) in the order the chain finds them.
+
+    The merged cluster keeps the index ``a``; ``b`` is retired.
+    """
+    merges = np.empty((n - 1, 3))
+    chain: list[int] = []
+    for step in range(n - 1):
+        if not chain:
+            chain.append(distances.first())
+        while True:
+            ids, row = distances.row(chain[-1])
+            position = int(np.argmin(row))
+            # On ties prefer the previous chain element, so the chain
+            # always ends in a reciprocal pair
+            if len(chain) > 1:
+                previous = distances.position(chain[-2])
+                if row[previous] <= row[position]:
+                    position = previous
+            nearest, best = int(ids[position]), float(row[position])
+            if len(chain) > 1 and nearest == chain[-2]:
+                break
+            chain.append(nearest)
+        b, a = chain.pop(), chain.pop()
+        a, b = min(a, b), max(a, b)
+        merges[step] = a, b, best
+        distances.merge(a, b)
+    return merges
+
+
+def _to_scipy(merges: FloatArray, n: int) -> FloatArray:
+    """Sort the merges by distance and number the clusters as SciPy does."""
+    order = np.argsort(merges[:, 2], kind="stable")
+    cluster_id = np.arange(n)
+    size = np.ones(n)
+    Z = np.empty((n - 1, 4))
+    for step, (a, b, distance) in enumerate(merges[order]):
+        a, b = int(a), int(b)
+        first, second = sorted((cluster_id[a], cluster_id[b]))
+        size[a] += size[b]
+        Z[step] = first, second, distance, size[a]
+        cluster_id[a] = n + step
+    return Z
+
+
+def nn_chain_linkage(
+    X: Any,
+    method: str = "ward",
+    metric: str = "euclidean",
+    block_rows: int = _BLOCK_ROWS,
+) -> FloatArray:
+    """
+    Hierarchical clustering as a SciPy linkage matrix.
+
+    Args:
+        X: (n_samples, n_features) data, or a condensed distance vector
+            with ``metric="precomputed"`` (not for ward)
+        method: "ward", "complete", "average" or "single"
+        metric: Any ``scipy.spatial.distance.cdist`` metric (ward requires
+            "euclidean")
+        block_rows: Rows per block when filling the condensed matrix
+
+    Returns:
+        (n - 1, 4) linkage matrix, as ``scipy.cluster.hierarchy.linkage``
+
+    Example:
+        >>> Z = nn_chain_linkage(X_scaled, method="average")
+        >>> dendrogram(Z, truncate_mode="lastp", p=30)
+        >>> labels = fcluster(Z, t=4, criterion="maxclust")
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    distances: _WardDistances | _CondensedDistances
+    if method == "ward":
+        if metric != "euclidean":
+            raise ValueError("Ward linkage requires the euclidean metric")
+        data = np.asarray(X, dtype=np.float64)
+        n = len(data)
+        distances = _WardDistances(data)
+    elif metric == "precomputed":
+        condensed = np.array(X, dtype=np.float32)
+        n = int(round((1 + np.sqrt(1 + 8 * len(condensed))) / 2))
+        if n * (n - 1) // 2 != len(condensed):
+            raise ValueError("X is not a condensed distance vector")
+        distances = _CondensedDistances(condensed, n, method)
+    else:
+        condensed = condensed_distances(X, metric, block_rows=block_rows)
+        n = len(X)
+        distances = _CondensedDistances(condensed, n, method)
+    if n < 2:
+        raise ValueError("At least 2 samples are needed")
+    return _to_scipy(_nn_chain(distances, n), n)
+
+
+class NNChainClustering(ClusterMixin, BaseEstimator):  # type: ignore[misc]
+    """
+    Agglomerative clustering on ``nn_chain_linkage``; scikit-learn compatible.
+
+    Args:
+        n_clusters: Number of clusters (ignored with ``distance_threshold``)
+        linkage: "ward", "complete", "average" or "single"
+        metric: Distance metric (ward requires "euclidean")
+        distance_threshold: Cut the tree at this merge distance instead
+
+    Attributes:
+        linkage_matrix_: SciPy linkage matrix (for ``dendrogram``)
+        labels_: Cluster of each sample, from 0
+        n_clusters_: Number of clusters found
+    """
+
+    def __init__(
+        self,
+        n_clusters: int | None = 2,
+        linkage: str = "ward",
+        metric: str = "euclidean",
+        distance_threshold: float | None = None,
+    ) -> None:
+        self.n_clusters = n_clusters
+        self.linkage = linkage
+        self.metric = metric
+        self.distance_threshold = distance_threshold
+
+    def fit(self, X: Any, y: Any = None) -> "NNChainClustering":
+        """Build the hierarchy and cut it."""
+        self.linkage_matrix_ = nn_chain_linkage(X, self.linkage, self.metric)
+        if self.distance_threshold is not None:
+            labels = fcluster(
+                self.linkage_matrix_, self.distance_threshold, criterion="distance"
+            )
+        elif self.n_clusters is not None:
+            labels = fcluster(self.linkage_matrix_, self.n_clusters, "maxclust")
+        else:
+            raise ValueError("Set n_clusters or distance_threshold")
+        self.labels_ = labels - 1
+        self.n_clusters_ = int(labels.max())
+        return self
@@ -0,0 +1,437 @@
+"""Streaming mini-batch K-Means over chunked data, for several k at once.
+
+Tables with tens of millions of rows are read with ``iter_chunks`` one
+block at a time, so they never have to fit in memory:
+
+1. **Seeding**: one pass draws a uniform reservoir sample (Algorithm R,
+   vectorized per block) and runs k-means++ on it. k-means++ picks centers
+   one after another, so the first k centers of a run for the largest k
+   are a k-means++ seeding for every smaller k.
+2. **Training**: each pass splits the blocks into mini-batches and applies
+   the mini-batch K-Means update (every center moves to the running mean of
+   the points ever assigned to it). The centers of *all* k values are
+   stacked, so one matrix product per mini-batch gives the distances for
+   every k, and one sparse product gives all the per-center sums.
+3. **Evaluation**: a last pass computes the exact inertia of the final
+   centers for every k, which is the elbow curve.
+
+Blocks are shuffled internally, but the mini-batch updates still assume
+that the row order of the source is not sorted by cluster.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClusterMixin, TransformerMixin
+from sklearn.cluster import kmeans_plusplus
+
+from ..utils.datasets import DEFAULT_CHUNK_SIZE, ChunkSource, iter_chunks
+
+FloatArray = np.ndarray[Any, np.dtype[np.float64]]
+IntArray = np.ndarray[Any, np.dtype[np.intp]]
+
+
+def reservoir_sample(
+    source: ChunkSource,
+    size: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: Sequence[str] | None = None,
+    random_state: int | np.random.Generator | None = None,
+) -> tuple[np.ndarray[Any, Any], int]:
+    """
+    Uniform sample of ``size`` rows of a stream, in one pass.
+
+    Row ``t`` of the stream (0-based) replaces a random slot of the
+    reservoir with probability ``size / (t + 1)``; the draws of a whole
+    block are made at once.
+
+    Returns:
+        (sample, number of rows in the stream); the sample has
+        ``min(size, n_rows)`` rows
+    """
+    rng = np.random.default_rng(random_state)
+    reservoir: np.ndarray[Any, Any] | None = None
+    filled = seen = 0
+    for block in iter_chunks(source, chunk_size, columns):
+        if reservoir is None:
+            reservoir = np.empty((size, block.shape[1]), dtype=block.dtype)
+        take = min(size - filled, len(block))
+        reservoir[filled : filled + take] = block[:take]
+        filled += take
+        rest = block[take:]
+        if len(rest):
+            positions = seen + take + np.arange(len(rest))
+            slots = (rng.random(len(rest)) * (positions + 1)).astype(np.int64)
+            hits = np.flatnonzero(slots < size)
+            # Later rows overwrite earlier ones aiming at the same slot
+            last = len(hits) - 1 - np.unique(slots[hits][::-1], return_index=True)[1]
+            reservoir[slots[hits[last]]] = rest[hits[last]]
+        seen += len(block)
+    if reservoir is None:
+        raise ValueError("The data source is empty")
+    return reservoir[:filled], seen
+
+
+class _StackedKMeans:
+    """Centers of several k values in one (sum(k), n_features) array."""
+
+    def __init__(self, k_values: list[int], seeds: FloatArray) -> None:
+        self.k_values = k_values
+        self.offsets = np.concatenate([[0], np.cumsum(k_values)])
+        self.centers = np.concatenate([seeds[:k] for k in k_values]).astype(
+            np.float64, copy=False
+        )
+        self.counts = np.zeros(len(self.centers))
+        # Distances are expanded as |x|^2 - 2 x.c + |c|^2 around this point:
+        # around the origin, a large feature offset would cancel them away
+        self.origin = self.centers.mean(axis=0)
+
+    def segments(self) -> list[slice]:
+        return [
+            slice(a, b)
+            for a, b in zip(self.offsets[:-1], self.offsets[1:], strict=True)
+        ]
+
+    def _centered(self, X: np.ndarray[Any, Any]) -> FloatArray:
+        centered: FloatArray = np.asarray(X, dtype=np.float64) - self.origin
+        return centered
+
+    def assign(self, X: np.ndarray[Any, Any]) -> tuple[IntArray, FloatArray]:
+        """Stacked center index and squared distance of each row, per k."""
+        return self._assign_centered(self._centered(X))
+
+    def _assign_centered(self, X: FloatArray) -> tuple[IntArray, FloatArray]:
+        centers = self.centers - self.origin
+        d2 = X @ centers.T
+        d2 *= -2
+        d2 += np.einsum("ij,ij->i", centers, centers)
+        labels = np.empty((len(self.k_values), len(X)), dtype=np.intp)
+        distances = np.empty((len(self.k_values), len(X)))
+        x_sq = np.einsum("ij,ij->i", X, X)
+        for i, segment in enumerate(self.segments()):
+            part = d2[:, segment]
+            labels[i] = part.argmin(axis=1)
+            distances[i] = part[np.arange(len(X)), labels[i]] + x_sq
+            labels[i] += segment.start
+        np.maximum(distances, 0.0, out=distances)
+        return labels, distances
+
+    def _sums(self, X: np.ndarray[Any, Any]) -> tuple[FloatArray, IntArray]:
+        """Sum and count of the rows assigned to each center, for every k."""
+        X = self._centered(X)
+        labels, _ = self._assign_centered(X)
+        # (sum(k), batch) indicator matrix: one product sums the rows per center
+        # for every k at once
+        n_k, n = labels.shape
+        indicator = sparse.csr_matrix(
+            (np.ones(n_k * n), (labels.ravel(), np.tile(np.arange(n), n_k))),
+            shape=(len(self.centers), n),
+        )
+        counts = np.bincount(labels.ravel(), minlength=len(self.centers))
+        sums = np.asarray(indicator @ X) + counts[:, None] * self.origin
+        return sums, counts
+
+    def refine(self, sample: FloatArray, n_iter: int) -> None:
+        """Lloyd iterations on an in-memory sample."""
+        for _ in range(n_iter):
+            sums, counts = self._sums(sample)
+            hit = counts > 0
+            self.centers[hit] = sums[hit] / counts[hit, None]
+
+    def update(self, X: np.ndarray[Any, Any]) -> IntArray:
+        """One mini-batch step for every k; returns the per-center batch counts."""
+        sums, batch_counts = self._sums(X)
+        hit = batch_counts > 0
+        new_counts = self.counts[hit] + batch_counts[hit]
+        self.centers[hit] += (
+            sums[hit] - batch_counts[hit, None] * self.centers[hit]
+        ) / new_counts[:, None]
+        self.counts[hit] = new_counts
+        return batch_counts
+
+
+def _seed(
+    sample: FloatArray, k_values: list[int], n_init: int, rng: np.random.Generator
+) -> _StackedKMeans:
+    """Best of ``n_init`` k-means++ seedings per k, refined on the sample."""
+    best: _StackedKMeans | None = None
+    best_inertia = np.full(len(k_values), np.inf)
+    for _ in range(n_init):
+        seeds, _ = kmeans_plusplus(
+            sample, k_values[-1], random_state=int(rng.integers(2**31))
+        )
+        model = _StackedKMeans(k_values, seeds)
+        model.refine(sample, n_iter=10)
+        inertia = model.assign(sample)[1].sum(axis=1)
+        if best is None:
+            best, best_inertia = model, inertia
+            continue
+        for i, segment in enumerate(model.segments()):
+            if inertia[i] < best_inertia[i]:
+                best.centers[segment] = model.centers[segment]
+                best_inertia[i] = inertia[i]
+    assert best is not None
+    return best
+
+
+@dataclass
+class KMeansSweepResult:
+    """Centers and inertia of streaming K-Means for each k."""
+
+    k_values: list[int]
+    centers: list[FloatArray]
+    inertia: FloatArray
+    cluster_sizes: list[IntArray]
+    n_samples: int
+    n_epochs: int
+
+    @property
+    def elbow_k(self) -> int:
+        """
+        k at the elbow of the inertia curve.
+
+        The point farthest below the straight line from the first to the
+        last k (both axes scaled to [0, 1]).
+        """
+        k = np.asarray(self.k_values, dtype=np.float64)
+        inertia = self.inertia
+        if len(k) < 3:
+            return self.k_values[0]
+        x = (k - k[0]) / (k[-1] - k[0])
+        span = inertia[0] - inertia[-1]
+        y = (inertia - inertia[-1]) / span if span > 0 else np.zeros_like(k)
+        return self.k_values[int(np.argmax(1 - x - y))]
+
+    def predict(self, X: Any, k: int) -> IntArray:
+        """Nearest center of each row of ``X`` for the model with ``k`` clusters."""
+        centers = self.centers[self.k_values.index(k)]
+        model = _StackedKMeans([k], centers)
+        labels: IntArray = model.assign(np.asarray(X, dtype=np.float64))[0][0]
+        return labels
+
+    def to_dict(self) -> dict[str, list[Any]]:
+        """Elbow curve as columns, for a DataFrame."""
+        return {"k": list(self.k_values), "inertia": self.inertia.tolist()}
+
+    def plot(self, ax: Any = None) -> Any:
+        """Plot the elbow curve, marking ``elbow_k``."""
+        import matplotlib.pyplot as plt
+
+        if ax is None:
+            _, ax = plt.subplots(figsize=(8, 5))
+        ax.plot(self.k_values, self.inertia, "o-")
+        ax.axvline(self.elbow_k, color="gray", linestyle="--", label="cotovelo")
+        ax.set_xlabel("k")
+        ax.set_ylabel("Inércia")
+        ax.set_title("Método do cotovelo")
+        ax.legend()
+        return ax
+
+
+def streaming_kmeans_sweep(
+    source: ChunkSource,
+    k_values: Sequence[int] = (2, 3, 4, 5, 6, 7, 8, 9, 10),
+    batch_size: int = 4096,
+    max_epochs: int = 5,
+    reservoir_size: int = 20000,
+    n_init: int = 3,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: Sequence[str] | None = None,
+    tol: float = 1e-4,
+    random_state: int | None = None,
+) -> KMeansSweepResult:
+    """
+    Fit mini-batch K-Means for every k in one stream of passes.
+
+    Args:
+        source: Data, as accepted by ``iter_chunks`` (array, memmap, .npy
+            or CSV path, dataset name, or a function returning an iterable
+            of blocks)
+        k_values: Numbers of clusters to fit
+        batch_size: Rows per mini-batch update
+        max_epochs: Maximum number of training passes over the data
+        reservoir_size: Rows sampled for the k-means++ seeding
+        n_init: Seedings tried on the sample; the one with the lowest
+            sample inertia is kept for each k
+        chunk_size: Rows read from the source at a time
+        columns: Feature columns (DataFrames, CSV files and datasets)
+        tol: Stop once no center moved more than ``tol`` times the mean
+            feature variance (squared distance) in a pass
+        random_state: Seed of the sample, the seeding and the batch order
+
+    Returns:
+        KMeansSweepResult with the centers and the exact inertia per k
+
+    Example:
+        >>> result = streaming_kmeans_sweep("customers.csv", range(2, 11),
+        ...                                 columns=["age", "income"])
+        >>> result.plot()
+        >>> labels = result.predict(X_new, k=result.elbow_k)
+    """
+    k_values = sorted({int(k) for k in k_values})
+    if not k_values or k_values[0] < 1:
+        raise ValueError("k_values must be positive")
+    if n_init < 1:
+        raise ValueError(f"n_init must be positive, got {n_init}")
+    rng = np.random.default_rng(random_state)
+    sample, n_samples = reservoir_sample(
+        source, reservoir_size, chunk_size, columns, rng
+    )
+    if len(sample) < k_values[-1]:
+        raise ValueError(
+            f"k={k_values[-1]} needs at least {k_values[-1]} rows, got {len(sample)}"
+        )
+    sample = sample.astype(np.float64)
+    model = _seed(sample, k_values, n_init, rng)
+    tolerance = tol * float(np.mean(np.var(sample, axis=0)))
+
+    n_epochs = 0
+    for n_epochs in range(1, max_epochs + 1):
+        previous = model.centers.copy()
+        epoch_counts = np.zeros(len(model.centers), dtype=np.int64)
+        for block in iter_chunks(source, chunk_size, columns):
+            block = block[rng.permutation(len(block))]
+            for start in range(0, len(block), batch_size):
+                epoch_counts += model.update(block[start : start + batch_size])
+        shift = np.sum((model.centers - previous) ** 2, axis=1)
+        # Centers that received no point restart on random sample rows
+        dead = epoch_counts == 0
+        if dead.any() and n_epochs < max_epochs:
+            model.centers[dead] = sample[rng.choice(len(sample), int(dead.sum()))]
+            model.counts[dead] = 0
+        elif shift.max() <= tolerance:
+            break
+
+    inertia = np.zeros(len(k_values))
+    sizes = np.zeros(len(model.centers), dtype=np.intp)
+    for block in iter_chunks(source, chunk_size, columns):
+        labels, distances = model.assign(block)
+        inertia += distances.sum(axis=1)
+        sizes += np.bincount(labels.ravel(), minlength=len(model.centers))
+    segments = model.segments()
+    return KMeansSweepResult(
+        k_values=k_values,
+        centers=[model.centers[segment].copy() for segment in segments],
+        inertia=inertia,
+        cluster_sizes=[sizes[segment] for segment in segments],
+        n_samples=n_samples,
+        n_epochs=n_epochs,
+    )
+
+
+class StreamingKMeans(
+    ClusterMixin, TransformerMixin, BaseEstimator  # type: ignore[misc]
+):
+    """
+    Mini-batch K-Means on chunked data; scikit-learn compatible.
+
+    ``fit`` accepts any source of ``iter_chunks`` besides in-memory arrays,
+    and ``partial_fit`` takes one block at a time for data that arrives as
+    a stream.
+
+    Args:
+        n_clusters: Number of clusters
+        batch_size: Rows per mini-batch update
+        max_epochs: Maximum number of passes over the data in ``fit``
+        reservoir_size: Rows sampled for the k-means++ seeding
+        n_init: Seedings tried on the sample (the best is kept)
+        chunk_size: Rows read from the source at a time
+        tol: Relative center shift that stops training
+        random_state: Seed
+    """
+
+    def __init__(
+        self,
+        n_clusters: int = 8,
+        batch_size: int = 4096,
+        max_epochs: int = 5,
+        reservoir_size: int = 20000,
+        n_init: int = 3,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        tol: float = 1e-4,
+        random_state: int | None = None,
+    ) -> None:
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.max_epochs = max_epochs
+        self.reservoir_size = reservoir_size
+        self.n_init = n_init
+        self.chunk_size = chunk_size
+        self.tol = tol
+        self.random_state = random_state
+
+    def fit(self, X: ChunkSource, y: Any = None) -> "StreamingKMeans":
+        """Fit on an array or any chunked source (``y`` is ignored)."""
+        result = streaming_kmeans_sweep(
+            X,
+            [self.n_clusters],
+            batch_size=self.batch_size,
+            max_epochs=self.max_epochs,
+            reservoir_size=self.reservoir_size,
+            n_init=self.n_init,
+            chunk_size=self.chunk_size,
+            tol=self.tol,
+            random_state=self.random_state,
+        )
+        self._set_model(result.centers[0])
+        self._model.counts = result.cluster_sizes[0].astype(np.float64)
+        self.inertia_ = float(result.inertia[0])
+        self.n_epochs_ = result.n_epochs
+        if isinstance(X, np.ndarray) and not isinstance(X, np.memmap):
+            self.labels_ = self.predict(X)
+        return self
+
+    def _set_model(self, centers: FloatArray) -> None:
+        self._model = _StackedKMeans([self.n_clusters], centers)
+        self.cluster_centers_ = self._model.centers
+        self.n_features_in_ = centers.shape[1]
+
+    def partial_fit(self, X: Any, y: Any = None) -> "StreamingKMeans":
+        """Update the centers with one block (the first block seeds them)."""
+        X = np.asarray(X, dtype=np.float64)
+        if not hasattr(self, "_model"):
+            if len(X) < self.n_clusters:
+                raise ValueError(
+                    f"The first block needs at least {self.n_clusters} rows"
+                )
+            seeds, _ = kmeans_plusplus(
+                X, self.n_clusters, random_state=self.random_state
+            )
+            self._set_model(seeds)
+        for start in range(0, len(X), self.batch_size):
+            self._model.update(X[start : start + self.batch_size])
+        return self
+
+    def predict(self, X: Any) -> IntArray:
+        """Index of the nearest center of each row, computed in chunks."""
+        labels = [
+            self._model.assign(block)[0][0]
+            for block in iter_chunks(X, self.chunk_size, dtype=np.float64)
+        ]
+        return np.concatenate(labels) if labels else np.empty(0, dtype=np.intp)
+
+    def fit_predict(self, X: Any, y: Any = None) -> IntArray:
+        """Fit, then return the cluster of each row."""
+        return self.fit(X).predict(X)
+
+    def transform(self, X: Any) -> FloatArray:
+        """Euclidean distance of each row to each center."""
+        X = np.asarray(X, dtype=np.float64)
+        centers = self.cluster_centers_
+        d2 = (
+            np.einsum("ij,ij->i", X, X)[:, None]
+            - 2 * X @ centers.T
+            + np.einsum("ij,ij->i", centers, centers)
+        )
+        distances: FloatArray = np.sqrt(np.maximum(d2, 0.0))
+        return distances
+
+    def score(self, X: Any, y: Any = None) -> float:
+        """Opposite of the inertia of ``X`` (higher is better)."""
+        total = 0.0
+        for block in iter_chunks(X, self.chunk_size, dtype=np.float64):
+            total += float(self._model.assign(block)[1].sum())
+        return -total
@@ -0,0 +1,5 @@
+"""Dimensionality reduction for data that does not fit in memory."""
+
+from .pca import StreamingPCA
+
+__all__ = ["StreamingPCA"]
@@ -0,0 +1,273 @@
+"""PCA for datasets larger than memory, as a scikit-learn transformer.
+
+``StreamingPCA.fit`` reads the data with ``iter_chunks`` and never holds
+more than one chunk. It uses randomized subspace iteration on the
+covariance matrix ``C = Xc^T Xc`` (``Xc`` being the centered data), which
+is never formed either: each pass over the chunks computes ``C @ Q`` for a
+thin (n_features, n_components + n_oversamples) basis ``Q``, and the
+centering is applied to the accumulated sums at the end of the pass. After
+``n_iter`` passes the components come from the eigenvectors of the small
+matrix ``Q^T C Q`` (Rayleigh-Ritz). When the basis would be as wide as the
+data, one pass computes ``C`` itself and the result is exact.
+
+``partial_fit`` instead updates the components incrementally, one block
+at a time (as ``sklearn.decomposition.IncrementalPCA``), for data that can
+only be read once.
+
+Sums are taken relative to the mean of the first chunk, which avoids the
+cancellation of ``X^T X - n mu mu^T`` when the mean is large compared with
+the spread. The fitted components are stored as float32.
+"""
+
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from ..utils.datasets import DEFAULT_CHUNK_SIZE, ChunkSource, iter_chunks
+
+FloatArray = np.ndarray[Any, np.dtype[np.float64]]
+
+
+def _flip_signs(components: FloatArray) -> FloatArray:
+    """Make the largest coefficient of each component positive (deterministic)."""
+    largest = np.argmax(np.abs(components), axis=1)
+    signs = np.sign(components[np.arange(len(components)), largest])
+    signs[signs == 0] = 1
+    flipped: FloatArray = components * signs[:, None]
+    return flipped
+
+
+class _CovarianceProduct:
+    """One pass over the chunks: ``C @ Q`` plus the moments of the data."""
+
+    def __init__(self, shift: FloatArray | None) -> None:
+        self.shift = shift
+        self.n = 0
+        self.sum: FloatArray | None = None
+        self.squared = 0.0
+        self.product: FloatArray | None = None
+
+    def add(self, block: FloatArray, Q: FloatArray | None) -> None:
+        if self.shift is None:
+            self.shift = block.mean(axis=0)
+        centered = block - self.shift
+        total = centered.sum(axis=0)
+        self.sum = total if self.sum is None else self.sum + total
+        self.squared += float(np.einsum("ij,ij->", centered, centered))
+        self.n += len(block)
+        part = centered.T @ (centered if Q is None else centered @ Q)
+        self.product = part if self.product is None else self.product + part
+
+    def finish(self, Q: FloatArray | None) -> tuple[FloatArray, FloatArray, float]:
+        """(C @ Q, mean, total sum of squares around the mean)."""
+        if self.product is None or self.sum is None or self.shift is None:
+            raise ValueError("The data source is empty")
+        offset = self.sum / self.n  # mean - shift
+        # sum (x - mean)(x - mean)^T = sum (x - s)(x - s)^T - n (mean - s)(mean - s)^T
+        projected = offset if Q is None else offset @ Q
+        product = self.product - self.n * np.outer(offset, projected)
+        total = self.squared - self.n * float(offset @ offset)
+        return product, self.shift + offset, total
+
+
+class StreamingPCA(TransformerMixin, BaseEstimator):  # type: ignore[misc]
+    """
+    Out-of-core PCA; drop-in for ``PCA`` in a scikit-learn Pipeline.
+
+    Args:
+        n_components: Number of components to keep
+        n_oversamples: Extra basis vectors of the randomized iteration
+        n_iter: Power-iteration passes over the data (the fit makes
+            ``n_iter + 1`` passes; 0 when the exact covariance is used).
+            The default matches scikit-learn's randomized PCA; flat
+            spectra need more passes, fast-decaying ones fewer
+        whiten: Scale the projections to unit variance
+        chunk_size: Rows read at a time
+        columns: Feature columns (DataFrames, CSV files and datasets)
+        random_state: Seed of the random starting basis
+
+    Attributes:
+        components_: (n_components, n_features) float32 principal axes
+        explained_variance_: Variance along each component
+        explained_variance_ratio_: Share of the total variance
+        singular_values_: Singular values of the centered data
+        mean_: Per-feature mean
+        n_samples_seen_: Number of rows used
+
+    Example:
+        >>> pca = StreamingPCA(n_components=50).fit("big_table.csv")
+        >>> for Z in pca.iter_transform("big_table.csv"):
+        ...     ...
+        >>> make_pipeline(StandardScaler(), StreamingPCA(10), LogisticRegression())
+    """
+
+    def __init__(
+        self,
+        n_components: int = 2,
+        n_oversamples: int = 10,
+        n_iter: int = 7,
+        whiten: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        columns: Sequence[str] | None = None,
+        random_state: int | None = None,
+    ) -> None:
+        self.n_components = n_components
+        self.n_oversamples = n_oversamples
+        self.n_iter = n_iter
+        self.whiten = whiten
+        self.chunk_size = chunk_size
+        self.columns = columns
+        self.random_state = random_state
+
+    def _blocks(self, X: ChunkSource) -> Iterator[FloatArray]:
+        return iter_chunks(X, self.chunk_size, self.columns, dtype=np.float64)
+
+    def _pass(
+        self, X: ChunkSource, Q: FloatArray | None, shift: FloatArray | None
+    ) -> tuple[_CovarianceProduct, FloatArray, FloatArray, float]:
+        accumulator = _CovarianceProduct(shift)
+        for block in self._blocks(X):
+            accumulator.add(block, Q)
+        product, mean, total = accumulator.finish(Q)
+        return accumulator, product, mean, total
+
+    def fit(self, X: ChunkSource, y: Any = None) -> "StreamingPCA":
+        """
+        Fit on an array or any source of ``iter_chunks`` (``y`` is ignored).
+
+        Each pass re-reads the source, so files and memory maps are never
+        loaded whole.
+        """
+        first = next(iter(self._blocks(X)), None)
+        if first is None:
+            raise ValueError("The data source is empty")
+        n_features = first.shape[1]
+        k = self.n_components
+        if not 1 <= k <= n_features:
+            raise ValueError(
+                f"n_components must be between 1 and {n_features}, got {k}"
+            )
+        width = k + self.n_oversamples
+        shift = first.mean(axis=0)
+
+        if width >= n_features:
+            # The basis would span everything: use the covariance itself
+            accumulator, covariance, mean, total = self._pass(X, None, shift)
+            eigenvalues, vectors = np.linalg.eigh(covariance)
+        else:
+            rng = np.random.default_rng(self.random_state)
+            Q, _ = np.linalg.qr(rng.standard_normal((n_features, width)))
+            for _ in range(self.n_iter):
+                _, product, _, _ = self._pass(X, Q, shift)
+                Q, _ = np.linalg.qr(product)
+            accumulator, product, mean, total = self._pass(X, Q, shift)
+            small = Q.T @ product
+            eigenvalues, rotation = np.linalg.eigh((small + small.T) / 2)
+            vectors = Q @ rotation
+
+        order = np.argsort(eigenvalues)[::-1][:k]
+        eigenvalues = np.maximum(eigenvalues[order], 0.0)
+        n = accumulator.n
+        self._set_components(
+            _flip_signs(vectors[:, order].T), eigenvalues, mean, total, n
+        )
+        return self
+
+    def _set_components(
+        self,
+        components: FloatArray,
+        eigenvalues: FloatArray,
+        mean: FloatArray,
+        total: float,
+        n: int,
+    ) -> None:
+        denominator = max(n - 1, 1)
+        self.components_ = components.astype(np.float32)
+        self.singular_values_ = np.sqrt(eigenvalues)
+        self.explained_variance_ = eigenvalues / denominator
+        self.explained_variance_ratio_ = (
+            eigenvalues / total if total > 0 else np.zeros_like(eigenvalues)
+        )
+        self.mean_ = mean
+        self.var_ = total / denominator
+        self.n_samples_seen_ = n
+        self.n_components_ = len(components)
+        self.n_features_in_ = components.shape[1]
+
+    def partial_fit(self, X: Any, y: Any = None) -> "StreamingPCA":
+        """
+        Update the components with one block of rows.
+
+        The previous components (scaled by their singular values), the
+        centered block and a mean-shift correction row are stacked, and the
+        top ``n_components`` right singular vectors of that small matrix are
+        the new components.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        m = len(X)
+        block_mean = X.mean(axis=0)
+        block_ss = float(np.sum((X - block_mean) ** 2))
+        if not hasattr(self, "components_"):
+            n, mean, total = 0, block_mean, block_ss
+            stacked = X - block_mean
+        else:
+            n = self.n_samples_seen_
+            mean = (n * self.mean_ + m * block_mean) / (n + m)
+            correction = np.sqrt(n * m / (n + m)) * (self.mean_ - block_mean)
+            total = (
+                self.var_ * max(n - 1, 1)
+                + block_ss
+                + n
+                * m
+                / (n + m)
+                * float((self.mean_ - block_mean) @ (self.mean_ - block_mean))
+            )
+            stacked = np.vstack(
+                [
+                    self.singular_values_[:, None] * self.components_,
+                    X - block_mean,
+                    correction,
+                ]
+            )
+        if n + m < self.n_components or X.shape[1] < self.n_components:
+            raise ValueError(
+                f"n_components={self.n_components} needs at least that many "
+                "rows and features"
+            )
+        _, singular_values, Vt = np.linalg.svd(stacked, full_matrices=False)
+        k = self.n_components
+        self._set_components(
+            _flip_signs(Vt[:k]), singular_values[:k] ** 2, mean, total, n + m
+        )
+        return self
+
+    def transform(self, X: Any) -> np.ndarray[Any, Any]:
+        """
+        Project ``X`` onto the components (float32).
+
+        The mean is subtracted in float64, since a large feature offset
+        would cancel the spread in float32; only the product with the
+        components runs in float32.
+        """
+        centered = (np.asarray(X, dtype=np.float64) - self.mean_).astype(np.float32)
+        projected: np.ndarray[Any, Any] = centered @ self.components_.T
+        if self.whiten:
+            projected /= np.sqrt(self.explained_variance_).astype(np.float32)
+        return projected
+
+    def iter_transform(self, X: ChunkSource) -> Iterator[np.ndarray[Any, Any]]:
+        """Projections of a chunked source, one block at a time."""
+        for block in self._blocks(X):
+            yield self.transform(block)
+
+    def inverse_transform(self, Z: Any) -> np.ndarray[Any, Any]:
+        """Map projections back to the feature space (float64)."""
+        Z = np.asarray(Z, dtype=np.float32)
+        if self.whiten:
+            Z = Z * np.sqrt(self.explained_variance_).astype(np.float32)
+        restored: np.ndarray[Any, Any] = (Z @ self.components_).astype(
+            np.float64
+        ) + self.mean_
+        return restored
@@ -0,0 +1,31 @@
+"""PyTorch utilities for the deep-learning module (CPU-oriented)."""
+
+from .embeddings import EmbeddingCache, backbone_fingerprint, cache_embeddings
+from .images import (
+    BatchAugment,
+    ImageBatchDataset,
+    ImageStore,
+    image_loader,
+    write_image_store,
+)
+from .sequences import CharVocabulary, SequenceDataset, encode_corpus, load_corpus
+from .training import CPUTrainer, EpochReport, configure_cpu_threads, make_loader
+
+__all__ = [
+    "EmbeddingCache",
+    "backbone_fingerprint",
+    "cache_embeddings",
+    "BatchAugment",
+    "ImageBatchDataset",
+    "ImageStore",
+    "image_loader",
+    "write_image_store",
+    "CharVocabulary",
+    "SequenceDataset",
+    "encode_corpus",
+    "load_corpus",
+    "CPUTrainer",
+    "EpochReport",
+    "configure_cpu_threads",
+    "make_loader",
+]
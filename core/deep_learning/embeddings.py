@@ -0,0 +1,248 @@
+"""Embedding cache for training a head on a frozen backbone.
+
+When only the head of a network is trained, the backbone's output for a
+given input never changes, so recomputing it every epoch wastes almost all
+of the training time. ``cache_embeddings`` runs the backbone once over the
+dataset, in batches and in inference mode, and writes the embeddings to a
+memory-mapped ``.npy`` file. The file is keyed by a hash of the backbone
+(architecture and every weight and buffer) and of the data, so changing
+either computes a new cache, while re-running a notebook reuses the old
+one. Weights may come from a local checkpoint or a seeded random
+initialization; no download is involved.
+
+Augmentation must not be applied to the data being cached: the cache
+stores one embedding per sample.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+from torch import nn
+from torch.utils.data import DataLoader, Dataset, TensorDataset
+
+from .images import ImageBatchDataset, image_loader, raw_to_npy
+from .training import CPUTrainer, EpochReport, make_loader
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "embeddings"
+
+EMBEDDINGS_FILENAME = "embeddings.npy"
+LABELS_FILENAME = "labels.npy"
+META_FILENAME = "meta.json"
+
+
+def backbone_fingerprint(backbone: nn.Module) -> str:
+    """Hash of the module structure and all its parameters and buffers."""
+    digest = hashlib.sha256(repr(backbone).encode())
+    for name, tensor in backbone.state_dict().items():
+        tensor = tensor.detach().cpu().contiguous().reshape(-1)
+        digest.update(f"{name}:{tensor.dtype}:{tuple(tensor.shape)}".encode())
+        digest.update(tensor.view(torch.uint8).numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _data_fingerprint(data: Any) -> str:
+    if isinstance(data, ImageBatchDataset):
+        if data.augment is not None:
+            raise ValueError("Cache the dataset without augmentation")
+        return f"{data.store.checksum()}:normalize={data.normalize}"
+    # Bytes of the inputs and targets as one stream each, so the key does
+    # not depend on how the data is wrapped or batched (no backbone pass)
+    inputs_digest, targets_digest = hashlib.sha256(), hashlib.sha256()
+    layout = ""
+    for inputs, targets in _batches(data, 1024):
+        X = np.ascontiguousarray(_as_numpy(inputs))
+        inputs_digest.update(X.tobytes())
+        layout = f"{X.dtype.str}{X.shape[1:]}"
+        if targets is not None:
+            y = np.ascontiguousarray(_as_numpy(targets))
+            targets_digest.update(y.tobytes())
+            layout += f":{y.dtype.str}{y.shape[1:]}"
+    return f"{inputs_digest.hexdigest()}:{targets_digest.hexdigest()}:{layout}"
+
+
+def _as_numpy(value: Any) -> Any:
+    return value.detach().cpu().numpy() if isinstance(value, torch.Tensor) else value
+
+
+def _parameter_dtype(backbone: nn.Module) -> torch.dtype:
+    """Floating type of the backbone's weights (float32 if it has none)."""
+    parameter = next(backbone.parameters(), None)
+    return parameter.dtype if parameter is not None else torch.float32
+
+
+def _batches(data: Any, batch_size: int) -> Iterator[tuple[Any, Any]]:
+    """(inputs, targets) batches, in order, of any supported data source."""
+    if isinstance(data, ImageBatchDataset):
+        yield from image_loader(data, batch_size, shuffle=False, num_workers=0)
+    elif isinstance(data, DataLoader):
+        yield from data
+    elif isinstance(data, tuple | torch.Tensor | np.ndarray):
+        X, y = data if isinstance(data, tuple) else (data, None)
+        for start in range(0, len(X), batch_size):
+            yield (
+                torch.as_tensor(X[start : start + batch_size]),
+                None if y is None else torch.as_tensor(y[start : start + batch_size]),
+            )
+    elif isinstance(data, Dataset):
+        yield from make_loader(data, batch_size, shuffle=False, num_workers=0)
+    else:
+        raise TypeError(f"Unsupported data source: {type(data).__name__}")
+
+
+@dataclass
+class EmbeddingCache:
+    """Backbone outputs for a dataset, memory-mapped from disk."""
+
+    path: Path
+    key: str
+    embeddings: np.ndarray[Any, Any]
+    labels: np.ndarray[Any, Any] | None
+    cached: bool
+
+    def __len__(self) -> int:
+        return len(self.embeddings)
+
+    def dataset(self) -> TensorDataset:
+        """(embedding, label) pairs as tensors sharing the mapped memory."""
+        tensors = [torch.from_numpy(self.embeddings)]
+        if self.labels is not None:
+            tensors.append(torch.from_numpy(self.labels))
+        return TensorDataset(*tensors)
+
+    def train_head(
+        self,
+        head: nn.Module,
+        optimizer: torch.optim.Optimizer,
+        loss_fn: Callable[[torch.Tensor, torch.Tensor], torch.Tensor],
+        epochs: int,
+        batch_size: int = 256,
+        val_cache: "EmbeddingCache | None" = None,
+        seed: int | None = None,
+        callback: Callable[[EpochReport], None] | None = None,
+    ) -> list[EpochReport]:
+        """
+        Train ``head`` on the cached embeddings with ``CPUTrainer``.
+
+        Args:
+            head: Module mapping embeddings to outputs
+            optimizer: Optimizer over ``head.parameters()``
+            loss_fn: Loss function
+            epochs: Number of epochs
+            batch_size: Samples per batch
+            val_cache: Cache of the validation data (same backbone)
+            seed: Seed of the shuffling order
+            callback: Called with each epoch's report
+        """
+        generator = torch.Generator()
+        if seed is not None:
+            generator.manual_seed(seed)
+        train_loader = make_loader(
+            self.dataset(), batch_size, shuffle=True, num_workers=0, generator=generator
+        )
+        val_loader = None
+        if val_cache is not None:
+            val_loader = make_loader(val_cache.dataset(), batch_size, num_workers=0)
+        trainer = CPUTrainer(head, optimizer, loss_fn)
+        return trainer.fit(train_loader, epochs, val_loader, callback)
+
+
+def _open(path: Path, key: str, cached: bool) -> EmbeddingCache:
+    labels_path = path / LABELS_FILENAME
+    return EmbeddingCache(
+        path=path,
+        key=key,
+        # Copy-on-write: tensors may share the pages, the file is never changed
+        embeddings=np.load(path / EMBEDDINGS_FILENAME, mmap_mode="c"),
+        labels=np.load(labels_path) if labels_path.exists() else None,
+        cached=cached,
+    )
+
+
+@torch.inference_mode()
+def cache_embeddings(
+    backbone: nn.Module,
+    data: Any,
+    cache_dir: Path | str | None = None,
+    batch_size: int = 256,
+    dtype: Any = np.float32,
+    data_key: str | None = None,
+) -> EmbeddingCache:
+    """
+    Compute (or load) the backbone's embeddings of every sample of ``data``.
+
+    Args:
+        backbone: Frozen feature extractor (set to eval mode here)
+        data: ``(X, y)`` arrays/tensors, an ``X`` array/tensor, a Dataset
+            of (input, target) pairs, an ImageBatchDataset or a DataLoader
+            (not shuffled)
+        cache_dir: Cache directory (default: ``<repo>/.cache/embeddings``)
+        batch_size: Samples per backbone forward pass
+        dtype: Storage type of the embeddings (float32, or float16 to halve
+            the file)
+        data_key: Identifier of the data, skipping its hash (e.g. a file
+            checksum already known)
+
+    Returns:
+        EmbeddingCache; ``cached`` tells whether it was loaded from disk
+
+    Example:
+        >>> backbone = models.resnet18()
+        >>> backbone.load_state_dict(torch.load("weights/resnet18.pt"))
+        >>> backbone.fc = nn.Identity()
+        >>> train = cache_embeddings(backbone, train_set)
+        >>> head = nn.Linear(512, 10)
+        >>> train.train_head(head, torch.optim.Adam(head.parameters()),
+        ...                  nn.CrossEntropyLoss(), epochs=10)
+    """
+    backbone.eval()
+    digest = hashlib.sha256()
+    digest.update(backbone_fingerprint(backbone).encode())
+    digest.update((data_key or _data_fingerprint(data)).encode())
+    digest.update(np.dtype(dtype).str.encode())
+    key = digest.hexdigest()[:32]
+    root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    path = root / key
+    if (path / META_FILENAME).exists():
+        return _open(path, key, cached=True)
+
+    tmp_path = root / f".{key}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+    n_samples = 0
+    label_chunks = []
+    # Embeddings are appended to a raw file, since the sample count of a
+    # generic dataset is only known at the end
+    raw_path = tmp_path / "embeddings.raw"
+    width: tuple[int, ...] = ()
+    # NumPy arrays come as float64; the hash above uses the bytes as given
+    input_dtype = _parameter_dtype(backbone)
+    with open(raw_path, "wb") as f:
+        for inputs, targets in _batches(data, batch_size):
+            if inputs.is_floating_point():
+                inputs = inputs.to(input_dtype)
+            outputs = backbone(inputs).float().flatten(1).cpu().numpy()
+            width = outputs.shape[1:]
+            f.write(outputs.astype(dtype, copy=False).tobytes())
+            n_samples += len(outputs)
+            if targets is not None and targets.numel():
+                label_chunks.append(_as_numpy(targets))
+
+    raw_to_npy(raw_path, tmp_path / EMBEDDINGS_FILENAME, dtype, (n_samples, *width))
+    if label_chunks:
+        np.save(tmp_path / LABELS_FILENAME, np.concatenate(label_chunks))
+    meta = {"n_samples": n_samples, "width": list(width), "dtype": np.dtype(dtype).str}
+    (tmp_path / META_FILENAME).write_text(json.dumps(meta), encoding="utf-8")
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        # Another process wrote the same cache first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return _open(path, key, cached=False)
@@ -0,0 +1,395 @@
+"""Compact image datasets: uint8 on disk, float32 one batch at a time.
+
+``write_image_store`` converts images to uint8 once (1 byte per pixel
+instead of 8 for float64) and writes them chunk by chunk to a ``.npy``
+file in (N, C, H, W) layout, together with the labels and the per-channel
+mean and standard deviation. ``ImageBatchDataset`` memory-maps the store,
+so only the pages of the batches being read are resident.
+
+Each item of the dataset is a whole batch: the DataLoader sends a list of
+indices to a worker, which gathers the uint8 rows, converts them to float32
+and applies ``BatchAugment`` to the batch as a whole (vectorized flips,
+shifts, crops and noise) before normalizing. Augmented copies of the
+dataset are never stored.
+"""
+
+import json
+import shutil
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+from numpy.lib.stride_tricks import sliding_window_view
+from torch.utils.data import (
+    BatchSampler,
+    DataLoader,
+    Dataset,
+    RandomSampler,
+    SequentialSampler,
+    get_worker_info,
+)
+
+from ..utils.datasets import file_checksum
+
+IMAGES_FILENAME = "images.npy"
+LABELS_FILENAME = "labels.npy"
+META_FILENAME = "meta.json"
+
+FloatArray = np.ndarray[Any, np.dtype[np.float32]]
+
+
+def raw_to_npy(
+    raw_path: Path, npy_path: Path, dtype: Any, shape: tuple[int, ...]
+) -> None:
+    """
+    Turn a file of raw C-order values into a ``.npy`` file, then delete it.
+
+    Lets writers stream rows whose total count is only known at the end.
+    """
+    with open(npy_path, "wb") as out:
+        np.lib.format.write_array_header_1_0(  # type: ignore[no-untyped-call]
+            out, {"descr": np.dtype(dtype).str, "fortran_order": False, "shape": shape}
+        )
+        with open(raw_path, "rb") as f:
+            shutil.copyfileobj(f, out, 1 << 24)
+    raw_path.unlink()
+
+
+def _to_nchw(
+    chunk: np.ndarray[Any, Any], shape: tuple[int, ...] | None, channels_last: bool
+) -> np.ndarray[Any, Any]:
+    if shape is not None:
+        chunk = chunk.reshape(len(chunk), *shape)
+    if chunk.ndim == 3:
+        return chunk[:, None]
+    if chunk.ndim != 4:
+        raise ValueError(
+            f"Images must be (N, H, W) or (N, C, H, W), got {chunk.shape}; "
+            "pass shape= for flattened images"
+        )
+    return chunk.transpose(0, 3, 1, 2) if channels_last else chunk
+
+
+@dataclass
+class ImageStore:
+    """A uint8 image store on disk (see ``write_image_store``)."""
+
+    path: Path
+    n_images: int
+    image_shape: tuple[int, int, int]
+    mean: list[float]
+    std: list[float]
+    has_labels: bool
+
+    @classmethod
+    def open(cls, path: Path | str) -> "ImageStore":
+        """Read the metadata of a store."""
+        path = Path(path)
+        meta = json.loads((path / META_FILENAME).read_text(encoding="utf-8"))
+        return cls(
+            path=path,
+            n_images=meta["n_images"],
+            image_shape=tuple(meta["image_shape"]),  # type: ignore[arg-type]
+            mean=meta["mean"],
+            std=meta["std"],
+            has_labels=meta["has_labels"],
+        )
+
+    def images(self) -> np.ndarray[Any, np.dtype[np.uint8]]:
+        """Memory-mapped (N, C, H, W) uint8 pixels."""
+        images: np.ndarray[Any, np.dtype[np.uint8]] = np.load(
+            self.path / IMAGES_FILENAME, mmap_mode="r"
+        )
+        return images
+
+    def labels(self) -> np.ndarray[Any, Any] | None:
+        """Labels, if the store has them."""
+        if not self.has_labels:
+            return None
+        labels: np.ndarray[Any, Any] = np.load(self.path / LABELS_FILENAME)
+        return labels
+
+    def checksum(self) -> str:
+        """SHA-256 of the pixels and the labels, identifying the content."""
+        images = file_checksum(self.path / IMAGES_FILENAME)
+        if not self.has_labels:
+            return images
+        return f"{images}:{file_checksum(self.path / LABELS_FILENAME)}"
+
+
+def write_image_store(
+    path: Path | str,
+    images: Any,
+    labels: Any = None,
+    value_range: tuple[float, float] = (0.0, 255.0),
+    shape: tuple[int, ...] | None = None,
+    channels_last: bool = False,
+    chunk_size: int = 4096,
+) -> ImageStore:
+    """
+    Convert images to uint8 and write them to a store directory.
+
+    Args:
+        path: Output directory
+        images: Array (or an iterable of array chunks) of images
+        labels: Optional labels, one per image
+        value_range: Pixel values mapped to 0 and 255 (e.g. (0, 1) for
+            images already scaled)
+        shape: Image shape for flattened rows, e.g. (1, 28, 28) for MNIST
+        channels_last: Input images are (N, H, W, C)
+        chunk_size: Images converted at a time (when ``images`` is an array)
+
+    Returns:
+        The ImageStore, with per-channel mean/std of the [0, 1] pixels
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    if isinstance(images, np.ndarray) or hasattr(images, "iloc"):
+        array = np.asarray(images)
+        chunks: Iterable[Any] = (
+            array[i : i + chunk_size] for i in range(0, len(array), chunk_size)
+        )
+    else:
+        chunks = images
+    low, high = value_range
+    scale = 255.0 / (high - low)
+
+    tmp_path = path / f".{IMAGES_FILENAME}.tmp"
+    n_images = 0
+    sums: np.ndarray[Any, np.dtype[np.float64]] | None = None
+    squares: np.ndarray[Any, np.dtype[np.float64]] | None = None
+    image_shape: tuple[int, ...] = ()
+    with open(tmp_path, "wb") as f:
+        for raw in chunks:
+            chunk = _to_nchw(np.asarray(raw), shape, channels_last)
+            if chunk.dtype != np.uint8:
+                chunk = np.clip(np.rint((chunk - low) * scale), 0, 255).astype(np.uint8)
+            if sums is None or squares is None:
+                image_shape = chunk.shape[1:]
+                sums = np.zeros(image_shape[0])
+                squares = np.zeros(image_shape[0])
+            elif chunk.shape[1:] != image_shape:
+                raise ValueError(f"Image shape changed: {chunk.shape[1:]}")
+            values = chunk.astype(np.float64) / 255.0
+            sums += values.sum(axis=(0, 2, 3))
+            squares += (values**2).sum(axis=(0, 2, 3))
+            f.write(np.ascontiguousarray(chunk).tobytes())
+            n_images += len(chunk)
+    if sums is None or squares is None:
+        raise ValueError("No images to write")
+
+    raw_to_npy(tmp_path, path / IMAGES_FILENAME, np.uint8, (n_images, *image_shape))
+
+    if labels is not None:
+        labels = np.asarray(labels)
+        if len(labels) != n_images:
+            raise ValueError(f"{len(labels)} labels for {n_images} images")
+        np.save(path / LABELS_FILENAME, labels)
+    count = n_images * image_shape[1] * image_shape[2]
+    mean = sums / count
+    std = np.sqrt(np.maximum(squares / count - mean**2, 0.0))
+    meta = {
+        "n_images": n_images,
+        "image_shape": list(image_shape),
+        "mean": mean.tolist(),
+        "std": np.where(std > 0, std, 1.0).tolist(),
+        "has_labels": labels is not None,
+    }
+    (path / META_FILENAME).write_text(json.dumps(meta), encoding="utf-8")
+    return ImageStore.open(path)
+
+
+def _random_windows(
+    batch: FloatArray, size: tuple[int, int], rng: np.random.Generator
+) -> FloatArray:
+    """One random (h, w) window per image, gathered in one indexing step."""
+    h, w = size
+    windows = sliding_window_view(
+        batch, (h, w), axis=(2, 3)  # type: ignore[call-overload]
+    )
+    n = len(batch)
+    dy = rng.integers(0, windows.shape[2], n)
+    dx = rng.integers(0, windows.shape[3], n)
+    # (n, C, h, w): the advanced indices broadcast to the leading axis
+    out: FloatArray = windows[np.arange(n), :, dy, dx]
+    return out
+
+
+class BatchAugment:
+    """
+    Random augmentations applied to a whole (N, C, H, W) float32 batch.
+
+    Each image gets its own random flip, offset and noise, but every step
+    is one vectorized operation over the batch.
+
+    Args:
+        hflip: Probability of a horizontal flip
+        vflip: Probability of a vertical flip
+        max_shift: Maximum translation in pixels (zero-filled borders)
+        crop: Output (height, width) of a random crop (None: no crop)
+        noise_std: Standard deviation of Gaussian noise, on the [0, 1] scale
+    """
+
+    def __init__(
+        self,
+        hflip: float = 0.0,
+        vflip: float = 0.0,
+        max_shift: int = 0,
+        crop: tuple[int, int] | None = None,
+        noise_std: float = 0.0,
+    ) -> None:
+        self.hflip = hflip
+        self.vflip = vflip
+        self.max_shift = max_shift
+        self.crop = crop
+        self.noise_std = noise_std
+
+    def __call__(self, batch: FloatArray, rng: np.random.Generator) -> FloatArray:
+        """Augmented copy of ``batch`` (pixels in [0, 1])."""
+        n = len(batch)
+        if self.hflip > 0:
+            flip = rng.random(n) < self.hflip
+            batch[flip] = batch[flip, :, :, ::-1]
+        if self.vflip > 0:
+            flip = rng.random(n) < self.vflip
+            batch[flip] = batch[flip, :, ::-1, :]
+        if self.max_shift > 0:
+            s = self.max_shift
+            padded = np.pad(batch, ((0, 0), (0, 0), (s, s), (s, s)))
+            batch = _random_windows(padded, (batch.shape[2], batch.shape[3]), rng)
+        if self.crop is not None:
+            batch = _random_windows(batch, self.crop, rng)
+        if self.noise_std > 0:
+            batch = batch + rng.normal(0.0, self.noise_std, batch.shape).astype(
+                np.float32
+            )
+            np.clip(batch, 0.0, 1.0, out=batch)
+        return np.ascontiguousarray(batch)
+
+
+class ImageBatchDataset(Dataset[tuple[torch.Tensor, torch.Tensor]]):
+    """
+    Batches of float32 images read from an image store.
+
+    Indexing takes a list of indices and returns a whole batch: images as
+    float32 tensors, normalized per channel with the store's mean/std, and
+    the labels as int64. Use ``image_loader`` to iterate with workers.
+
+    Args:
+        store: ImageStore or the path of one
+        augment: Optional BatchAugment (apply it only to the training set)
+        normalize: Subtract the mean and divide by the std of each channel
+
+    Example:
+        >>> store = write_image_store(".cache/mnist", X, y, shape=(1, 28, 28))
+        >>> train = ImageBatchDataset(store, augment=BatchAugment(max_shift=2))
+        >>> for X_batch, y_batch in image_loader(train, 128, shuffle=True):
+        ...     ...
+    """
+
+    def __init__(
+        self,
+        store: ImageStore | Path | str,
+        augment: BatchAugment | None = None,
+        normalize: bool = True,
+    ) -> None:
+        self.store = store if isinstance(store, ImageStore) else ImageStore.open(store)
+        self.augment = augment
+        self.normalize = normalize
+        self._images: np.ndarray[Any, Any] | None = None
+        self._labels: np.ndarray[Any, Any] | None = None
+        self._rng: np.random.Generator | None = None
+
+    def __len__(self) -> int:
+        return self.store.n_images
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Workers open the memory map themselves instead of receiving a copy
+        return {**self.__dict__, "_images": None, "_labels": None, "_rng": None}
+
+    def _open(self) -> tuple[np.ndarray[Any, Any], np.ndarray[Any, Any] | None]:
+        if self._images is None:
+            self._images = self.store.images()
+            self._labels = self.store.labels()
+        return self._images, self._labels
+
+    def _generator(self) -> np.random.Generator:
+        if self._rng is None:
+            # The DataLoader gives each worker (and each epoch with
+            # non-persistent workers) its own torch seed
+            info = get_worker_info()
+            seed = info.seed if info is not None else torch.initial_seed()
+            self._rng = np.random.default_rng(seed)
+        return self._rng
+
+    def __getitem__(self, indices: Any) -> tuple[torch.Tensor, torch.Tensor]:
+        images, labels = self._open()
+        index = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        # Sorted reads are sequential in the memory map
+        order = np.argsort(index, kind="stable")
+        batch = np.empty((len(index), *images.shape[1:]), dtype=np.float32)
+        batch[order] = images[index[order]]
+        batch *= np.float32(1 / 255)
+        if self.augment is not None:
+            batch = self.augment(batch, self._generator())
+        if self.normalize:
+            mean = np.asarray(self.store.mean, dtype=np.float32)[:, None, None]
+            std = np.asarray(self.store.std, dtype=np.float32)[:, None, None]
+            batch -= mean
+            batch /= std
+        targets = (
+            torch.from_numpy(labels[index].astype(np.int64))
+            if labels is not None
+            else torch.empty(0, dtype=torch.int64)
+        )
+        return torch.from_numpy(batch), targets
+
+
+def image_loader(
+    dataset: ImageBatchDataset,
+    batch_size: int = 128,
+    shuffle: bool = False,
+    num_workers: int = 2,
+    drop_last: bool = False,
+    prefetch_factor: int = 2,
+    seed: int | None = None,
+) -> DataLoader[Any]:
+    """
+    DataLoader whose workers build whole batches of ``dataset``.
+
+    Args:
+        dataset: ImageBatchDataset
+        batch_size: Images per batch
+        shuffle: Reshuffle every epoch
+        num_workers: Worker processes (0: load in the main process)
+        drop_last: Drop the last incomplete batch
+        prefetch_factor: Batches prepared in advance per worker
+        seed: Seed of the shuffling order and of the augmentation (in the
+            workers, or in the main process with ``num_workers=0``)
+    """
+    generator = torch.Generator()
+    if seed is not None:
+        generator.manual_seed(seed)
+        if num_workers == 0:
+            # No worker seeds: the augmentation draws from the dataset's own
+            # generator, restarted here
+            dataset._rng = np.random.default_rng(seed)
+    sampler = (
+        RandomSampler(dataset, generator=generator)
+        if shuffle
+        else SequentialSampler(dataset)
+    )
+    kwargs: dict[str, Any] = {}
+    if num_workers > 0:
+        kwargs = {"prefetch_factor": prefetch_factor, "persistent_workers": True}
+    return DataLoader(
+        dataset,
+        batch_size=None,
+        sampler=BatchSampler(sampler, batch_size, drop_last),
+        num_workers=num_workers,
+        generator=generator,
+        **kwargs,
+    )
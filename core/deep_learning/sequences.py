@@ -0,0 +1,293 @@
+"""Character-level sequence datasets without materialized windows.
+
+A corpus is encoded once into a 1D array of character codes, uint8 when
+the vocabulary has at most 256 characters and uint16 otherwise. Training
+pairs are overlapping windows of that array: the input is
+``codes[i : i + L]`` and the target is the same window shifted by one.
+Instead of copying every window (L times the corpus size), windows are
+``sliding_window_view`` views, and only the rows of one batch are gathered
+when the batch is requested.
+
+Corpora larger than RAM are encoded in chunks straight into a ``.npy``
+file and opened with ``mmap_mode``, so only the pages of the batches in use
+are resident.
+"""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import torch
+from numpy.lib.stride_tricks import sliding_window_view
+from torch.utils.data import Dataset
+
+VOCAB_SUFFIX = ".vocab.json"
+
+CodeArray = np.ndarray[Any, np.dtype[np.unsignedinteger[Any]]]
+
+
+def _code_points(text: str) -> np.ndarray[Any, np.dtype[np.uint32]]:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+class CharVocabulary:
+    """
+    Sorted set of characters and its vectorized encoder/decoder.
+
+    Args:
+        chars: The characters of the vocabulary (sorted, duplicates removed)
+    """
+
+    def __init__(self, chars: str) -> None:
+        self.chars = "".join(sorted(set(chars)))
+        self._points = _code_points(self.chars)
+
+    @classmethod
+    def from_text(cls, text: str) -> "CharVocabulary":
+        """Vocabulary of the characters in ``text``."""
+        return cls("".join(set(text)))
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CharVocabulary) and self.chars == other.chars
+
+    @property
+    def dtype(self) -> np.dtype[Any]:
+        """Smallest unsigned type holding every code."""
+        return np.dtype(np.uint8 if len(self) <= 256 else np.uint16)
+
+    def encode(self, text: str) -> CodeArray:
+        """Codes of the characters of ``text``."""
+        points = _code_points(text)
+        codes = np.searchsorted(self._points, points)
+        codes = np.minimum(codes, len(self) - 1)
+        unknown = self._points[codes] != points
+        if unknown.any():
+            char = text[int(np.argmax(unknown))]
+            raise ValueError(f"Character {char!r} is not in the vocabulary")
+        return codes.astype(self.dtype)
+
+    def decode(self, codes: Any) -> str:
+        """Text of an array of codes."""
+        points = self._points[np.asarray(codes, dtype=np.intp)]
+        return points.astype("<u4").tobytes().decode("utf-32-le")
+
+    def save(self, path: Path | str) -> None:
+        """Write the vocabulary as JSON."""
+        Path(path).write_text(json.dumps({"chars": self.chars}), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path | str) -> "CharVocabulary":
+        """Read a vocabulary written by ``save``."""
+        return cls(json.loads(Path(path).read_text(encoding="utf-8"))["chars"])
+
+
+def encode_corpus(
+    text_path: Path | str,
+    output_path: Path | str,
+    vocab: CharVocabulary | None = None,
+    chunk_chars: int = 1 << 22,
+) -> tuple[np.memmap[Any, Any], CharVocabulary]:
+    """
+    Encode a UTF-8 text file into a memory-mapped ``.npy`` of codes.
+
+    The file is read in chunks of ``chunk_chars`` characters: once to
+    collect the vocabulary (unless given) and count the characters, and once
+    to write the codes, so the text never has to fit in memory. The
+    vocabulary is saved next to the output as ``<output>.vocab.json``.
+
+    Returns:
+        (memory-mapped codes, vocabulary), as returned by ``load_corpus``
+    """
+    text_path, output_path = Path(text_path), Path(output_path)
+    chars: set[str] = set()
+    n_chars = 0
+    with open(text_path, encoding="utf-8", newline="") as f:
+        while chunk := f.read(chunk_chars):
+            n_chars += len(chunk)
+            if vocab is None:
+                chars.update(chunk)
+    if vocab is None:
+        vocab = CharVocabulary("".join(chars))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    codes = np.lib.format.open_memmap(  # type: ignore[no-untyped-call]
+        output_path, mode="w+", dtype=vocab.dtype, shape=(n_chars,)
+    )
+    position = 0
+    with open(text_path, encoding="utf-8", newline="") as f:
+        while chunk := f.read(chunk_chars):
+            codes[position : position + len(chunk)] = vocab.encode(chunk)
+            position += len(chunk)
+    codes.flush()
+    del codes
+    vocab.save(output_path.with_name(output_path.name + VOCAB_SUFFIX))
+    return load_corpus(output_path)
+
+
+def load_corpus(path: Path | str) -> tuple[np.memmap[Any, Any], CharVocabulary]:
+    """
+    Open a corpus written by ``encode_corpus``, memory-mapped.
+
+    The map is copy-on-write: tensors can share its pages, and nothing is
+    ever written back to the file.
+    """
+    path = Path(path)
+    codes = np.load(path, mmap_mode="c")
+    vocab = CharVocabulary.load(path.with_name(path.name + VOCAB_SUFFIX))
+    return codes, vocab
+
+
+class SequenceDataset(Dataset[tuple[torch.Tensor, torch.Tensor]]):
+    """
+    (input, target) windows over an encoded corpus, as views.
+
+    Window ``i`` starts at ``i * stride``; its input has ``seq_length``
+    codes and its target is the input shifted one position to the right.
+
+    Args:
+        codes: 1D array of codes (in memory or memory-mapped)
+        seq_length: Length of each input sequence
+        stride: Offset between consecutive windows
+        vocab: Vocabulary of the codes (optional, for decoding)
+
+    Example:
+        >>> encode_corpus("shakespeare.txt", ".cache/shakespeare.npy")
+        >>> dataset = SequenceDataset.from_corpus(".cache/shakespeare.npy", 100)
+        >>> for X, y in dataset.batches(64, shuffle=True, seed=42):
+        ...     loss = loss_fn(model(X).transpose(1, 2), y)
+    """
+
+    def __init__(
+        self,
+        codes: Any,
+        seq_length: int,
+        stride: int = 1,
+        vocab: CharVocabulary | None = None,
+    ) -> None:
+        codes = codes if isinstance(codes, np.ndarray) else np.asarray(codes)
+        if codes.ndim != 1:
+            raise ValueError(f"codes must be 1D, got shape {codes.shape}")
+        if seq_length < 1 or stride < 1:
+            raise ValueError("seq_length and stride must be positive")
+        if len(codes) < seq_length + 1:
+            raise ValueError(
+                f"The corpus ({len(codes)} codes) is shorter than one window "
+                f"({seq_length + 1})"
+            )
+        self.codes = codes
+        self.seq_length = seq_length
+        self.stride = stride
+        self.vocab = vocab
+        self._path: Path | None = None
+
+    @classmethod
+    def from_text(
+        cls, text: str, seq_length: int, stride: int = 1
+    ) -> "SequenceDataset":
+        """Encode an in-memory text and wrap it."""
+        vocab = CharVocabulary.from_text(text)
+        return cls(vocab.encode(text), seq_length, stride, vocab)
+
+    @classmethod
+    def from_corpus(
+        cls, path: Path | str, seq_length: int, stride: int = 1
+    ) -> "SequenceDataset":
+        """Memory-map a corpus written by ``encode_corpus``."""
+        codes, vocab = load_corpus(path)
+        dataset = cls(codes, seq_length, stride, vocab)
+        dataset._path = Path(path)
+        return dataset
+
+    @property
+    def windows(self) -> np.ndarray[Any, Any]:
+        """(n_windows, seq_length + 1) view of the corpus; no data is copied."""
+        view: np.ndarray[Any, Any] = sliding_window_view(
+            self.codes, self.seq_length + 1
+        )[:: self.stride]
+        return view
+
+    def __len__(self) -> int:
+        return (len(self.codes) - self.seq_length - 1) // self.stride + 1
+
+    def __getitem__(self, index: int) -> tuple[torch.Tensor, torch.Tensor]:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        start = (index % len(self)) * self.stride
+        window = torch.from_numpy(
+            self.codes[start : start + self.seq_length + 1].astype(np.int64)
+        )
+        return window[:-1], window[1:]
+
+    def __getstate__(self) -> dict[str, Any]:
+        # A memory-mapped corpus goes to (spawned) DataLoader workers by
+        # file name, not by value
+        state = self.__dict__.copy()
+        if self._path is not None:
+            state["codes"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        if state["_path"] is not None:
+            state["codes"], _ = load_corpus(state["_path"])
+        self.__dict__.update(state)
+
+    def batches(
+        self,
+        batch_size: int,
+        shuffle: bool = False,
+        drop_last: bool = False,
+        seed: int | None = None,
+        dtype: torch.dtype | None = torch.long,
+    ) -> Iterator[tuple[torch.Tensor, torch.Tensor]]:
+        """
+        Yield (inputs, targets) batches of shape (batch, seq_length).
+
+        Only the rows of the current batch are gathered. Without shuffling
+        and with ``stride == seq_length`` consecutive windows are adjacent in
+        the corpus, and each batch is a reshaped view of it: with
+        ``dtype=None`` such batches share memory with a uint8 corpus.
+
+        Args:
+            batch_size: Windows per batch
+            shuffle: Visit the windows in random order
+            drop_last: Skip the last incomplete batch
+            seed: Seed of the shuffling order
+            dtype: Tensor dtype (``torch.long`` for ``nn.Embedding``; None
+                keeps uint8 codes and widens uint16 ones to int32, since
+                uint16 tensors need torch 2.3)
+        """
+        n = len(self)
+        # uint32 halves the index memory of very long corpora
+        order = np.arange(n, dtype=np.uint32 if n < 2**32 else np.int64)
+        if shuffle:
+            np.random.default_rng(seed).shuffle(order)
+        windows = self.windows
+        L = self.seq_length
+        for start in range(0, n, batch_size):
+            rows = order[start : start + batch_size]
+            if drop_last and len(rows) < batch_size:
+                break
+            if not shuffle and self.stride == L:
+                begin = int(rows[0]) * L
+                span = len(rows) * L
+                inputs = self.codes[begin : begin + span].reshape(len(rows), L)
+                targets = self.codes[begin + 1 : begin + 1 + span].reshape(len(rows), L)
+            else:
+                batch = windows[rows]
+                inputs, targets = batch[:, :-1], batch[:, 1:]
+            yield _to_tensor(inputs, dtype), _to_tensor(targets, dtype)
+
+
+def _to_tensor(array: np.ndarray[Any, Any], dtype: torch.dtype | None) -> torch.Tensor:
+    if dtype is not None:
+        return torch.from_numpy(np.ascontiguousarray(array, dtype=np.int64)).to(dtype)
+    if array.dtype != np.uint8:
+        return torch.from_numpy(array.astype(np.int32))
+    if not array.flags.writeable:
+        array = array.copy()  # torch tensors over read-only memory are unsafe
+    return torch.from_numpy(array)
@@ -0,0 +1,30 @@
+"""Model selection: hyperparameter search and cross-validation helpers."""
+
+from .cross_validation import (
+    cached_cross_val_score,
+    cached_cross_validate,
+    data_fingerprint,
+    estimator_fingerprint,
+)
+from .loo import LOOResult, loo_predict, loocv_score
+from .nested import NestedCVResult, nested_cross_validate
+from .sweep import SweepResult, iter_sweep, run_sweep
+from .tuning import HalvingSearchCV, HyperbandSearchCV, resource_levels
+
+__all__ = [
+    "cached_cross_val_score",
+    "cached_cross_validate",
+    "data_fingerprint",
+    "estimator_fingerprint",
+    "LOOResult",
+    "loo_predict",
+    "loocv_score",
+    "NestedCVResult",
+    "nested_cross_validate",
+    "SweepResult",
+    "iter_sweep",
+    "run_sweep",
+    "HalvingSearchCV",
+    "HyperbandSearchCV",
+    "resource_levels",
+]
@@ -0,0 +1,91 @@
+"""Process-pool helpers shared by the model-selection runners."""
+
+import os
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+# Data shared with the pool workers, set once per pool by the initializer.
+WORKER_DATA: dict[str, Any] = {}
+
+
+def init_worker(X: Any, y: Any) -> None:
+    """Pool initializer: keep the data in the worker for all its tasks."""
+    WORKER_DATA["X"], WORKER_DATA["y"] = X, y
+
+
+def share_arrays(
+    arrays: dict[str, Any],
+) -> tuple[list[SharedMemory], dict[str, tuple[str, tuple[int, ...], str]]]:
+    """
+    Copy arrays into shared memory, once, for all the workers of a pool.
+
+    Returns the segments (the caller closes and unlinks them) and picklable
+    ``{name: (segment, shape, dtype)}`` specs for ``attach_arrays``. None
+    values are skipped.
+    """
+    segments, specs = [], {}
+    for name, value in arrays.items():
+        if value is None:
+            continue
+        array = np.ascontiguousarray(value)
+        if array.dtype.hasobject:
+            raise ValueError(
+                f"'{name}' has dtype object, which cannot be placed in shared "
+                "memory; convert it to a numeric or string dtype"
+            )
+        segment = SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=segment.buf)[...] = array
+        segments.append(segment)
+        specs[name] = (segment.name, array.shape, array.dtype.str)
+    return segments, specs
+
+
+def attach_arrays(
+    specs: dict[str, tuple[str, tuple[int, ...], str]],
+) -> tuple[list[SharedMemory], dict[str, np.ndarray[Any, Any]]]:
+    """Read-only views of the arrays placed by ``share_arrays``."""
+    segments, arrays = [], {}
+    for name, (segment_name, shape, dtype) in specs.items():
+        segment = SharedMemory(name=segment_name)
+        array: np.ndarray[Any, Any] = np.ndarray(shape, dtype, buffer=segment.buf)
+        array.flags.writeable = False
+        segments.append(segment)
+        arrays[name] = array
+    return segments, arrays
+
+
+def init_shared_worker(
+    specs: dict[str, tuple[str, tuple[int, ...], str]], blas_threads: int
+) -> None:
+    """Pool initializer: attach the shared arrays and pin the BLAS threads."""
+    segments, arrays = attach_arrays(specs)
+    WORKER_DATA.update(arrays)
+    # Keep the segments (and the limiter) alive for the life of the worker
+    WORKER_DATA["_segments"] = segments
+    WORKER_DATA["_limits"] = threadpool_limits(limits=blas_threads)
+
+
+def worker_data(X: Any, y: Any) -> tuple[Any, Any]:
+    """Return (X, y), falling back to the data set by ``init_worker``."""
+    if X is None:
+        return WORKER_DATA["X"], WORKER_DATA["y"]
+    return X, y
+
+
+def take(data: Any, index: np.ndarray[Any, Any]) -> Any:
+    """Rows of a numpy array or pandas object (None stays None)."""
+    if data is None:
+        return None
+    return data.iloc[index] if hasattr(data, "iloc") else data[index]
+
+
+def n_workers(n_jobs: int | None) -> int:
+    """Number of processes for ``n_jobs`` (negative counts from the CPU count)."""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
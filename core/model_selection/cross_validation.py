@@ -0,0 +1,303 @@
+"""Cross-validation with fitted fold models and scores cached on disk.
+
+Every fold is identified by a hash of the estimator (class and parameters),
+the data and the fold's train/test indices. Its fitted model and the scores
+computed so far are stored under that hash, so re-running a notebook does
+not refit anything, and asking for a new metric only scores the stored
+models. Folds run in a process pool that receives the data once; workers
+write the models to disk and send back only scores, so memory stays
+bounded by one model per worker.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv
+
+from ._workers import init_worker, n_workers, take, worker_data
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "cv"
+
+MODEL_FILENAME = "model.joblib"
+SCORES_FILENAME = "scores.json"
+
+Scoring = str | Callable[..., float] | Iterable[str] | dict[str, Any] | None
+
+
+def _scorers(scoring: Scoring) -> dict[str, Any]:
+    """Map metric names to scorers (a string, callable, list or dict)."""
+    if scoring is None or isinstance(scoring, str) or callable(scoring):
+        return {"score": scoring}
+    if isinstance(scoring, dict):
+        return dict(scoring)
+    return {name: name for name in scoring}
+
+
+def _scorer_key(scorer: Any) -> str | None:
+    """
+    Cache key of a scorer, or None if it cannot be identified.
+
+    Callables are keyed by their content (``make_scorer`` arguments,
+    ``partial`` arguments, ...), not their name; those joblib cannot hash,
+    such as lambdas, are recomputed on every call.
+    """
+    if scorer is None or isinstance(scorer, str):
+        return str(scorer)
+    try:
+        key: str = joblib.hash(scorer)
+    except Exception:
+        return None
+    return f"callable:{key}"
+
+
+def estimator_fingerprint(estimator: Any) -> str:
+    """Hash of the estimator class and its (deep) parameters."""
+    cls = type(estimator)
+    key: str = joblib.hash(
+        (cls.__module__, cls.__qualname__, estimator.get_params(deep=True))
+    )
+    return key
+
+
+def data_fingerprint(X: Any, y: Any = None) -> str:
+    """Hash of the feature matrix and target (numpy or pandas)."""
+    key: str = joblib.hash((X, y))
+    return key
+
+
+def fold_key(
+    estimator_key: str,
+    data_key: str,
+    train: np.ndarray[Any, Any],
+    test: np.ndarray[Any, Any],
+) -> str:
+    """Cache key of one fold: estimator, data and the fold's indices."""
+    digest = hashlib.sha256(f"{estimator_key}:{data_key}".encode())
+    for index in (train, test):
+        digest.update(np.ascontiguousarray(index, dtype=np.int64).tobytes())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+@dataclass
+class _FoldTask:
+    directory: Path
+    estimator: Any
+    train: np.ndarray[Any, Any]
+    test: np.ndarray[Any, Any]
+    test_metrics: dict[str, Any]
+    train_metrics: dict[str, Any]
+    stored: dict[str, Any] = field(default_factory=dict)
+    uncached: set[str] = field(default_factory=set)
+
+
+def _write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _run_fold(task: _FoldTask, X: Any = None, y: Any = None) -> dict[str, Any]:
+    """Fit (or load) the fold model, compute the missing scores, store both."""
+    X, y = worker_data(X, y)
+    task.directory.mkdir(parents=True, exist_ok=True)
+    model_path = task.directory / MODEL_FILENAME
+    record = dict(task.stored) or {"fit_time": None, "test": {}, "train": {}}
+
+    if record["fit_time"] is None or not model_path.exists():
+        estimator = clone(task.estimator)
+        start = time.perf_counter()
+        estimator.fit(take(X, task.train), take(y, task.train))
+        record["fit_time"] = time.perf_counter() - start
+        tmp_path = model_path.with_name(f".{MODEL_FILENAME}.{os.getpid()}.tmp")
+        joblib.dump(estimator, tmp_path)
+        os.replace(tmp_path, model_path)
+    else:
+        estimator = joblib.load(model_path)
+
+    start = time.perf_counter()
+    for split, metrics, index in (
+        ("test", task.test_metrics, task.test),
+        ("train", task.train_metrics, task.train),
+    ):
+        for key, scorer in metrics.items():
+            scorer_fn = check_scoring(estimator, scoring=scorer)
+            record[split][key] = float(
+                scorer_fn(estimator, take(X, index), take(y, index))
+            )
+    record["score_time"] = time.perf_counter() - start
+    stored = {
+        **record,
+        **{
+            split: {k: v for k, v in record[split].items() if k not in task.uncached}
+            for split in ("test", "train")
+        },
+    }
+    _write_json_atomic(task.directory / SCORES_FILENAME, stored)
+    return record
+
+
+def _read_record(directory: Path) -> dict[str, Any]:
+    try:
+        with open(directory / SCORES_FILENAME, encoding="utf-8") as f:
+            record: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not (directory / MODEL_FILENAME).exists():
+        return {}
+    return record
+
+
+def cached_cross_validate(
+    estimator: Any,
+    X: Any,
+    y: Any = None,
+    cv: Any = 5,
+    scoring: Scoring = None,
+    return_train_score: bool = False,
+    return_estimator: bool = False,
+    cache_dir: Path | str | None = None,
+    n_jobs: int | None = 1,
+) -> dict[str, Any]:
+    """
+    Drop-in ``cross_validate`` that caches fold models and scores on disk.
+
+    Args:
+        estimator: Estimator to evaluate
+        X: Features
+        y: Target
+        cv: Folds, as in scikit-learn (an int, a splitter or a list of splits)
+        scoring: Metric name, callable scorer, list of names or dict
+        return_train_score: Also score each fold model on its training data
+        return_estimator: Return the fitted fold models (loaded from disk)
+        cache_dir: Cache directory (default: ``<repo>/.cache/cv``)
+        n_jobs: Worker processes for the folds to fit or score (-1: all
+            cores); ignored when a scorer cannot be pickled, such as a lambda
+
+    Returns:
+        Dict like scikit-learn's: ``test_<metric>`` (``test_score`` for a
+        single metric), ``train_<metric>``, ``fit_time``, ``score_time``,
+        optionally ``estimator``, plus ``cached`` (folds that were not refit)
+    """
+    cache_path = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    splitter = check_cv(cv, y, classifier=is_classifier(estimator))
+    folds = list(splitter.split(X, y))
+    scorers = _scorers(scoring)
+    keys: dict[str, str] = {}
+    uncached: set[str] = set()
+    for name, scorer in scorers.items():
+        key = _scorer_key(scorer)
+        if key is None:
+            # Scored on every call and never stored
+            key = f"uncached:{name}"
+            uncached.add(key)
+        keys[name] = key
+
+    estimator_key = estimator_fingerprint(estimator)
+    data_key = data_fingerprint(X, y)
+    directories = [
+        cache_path / fold_key(estimator_key, data_key, train, test)
+        for train, test in folds
+    ]
+
+    records: list[dict[str, Any]] = []
+    tasks: list[tuple[int, _FoldTask]] = []
+    for i, ((train, test), directory) in enumerate(
+        zip(folds, directories, strict=True)
+    ):
+        stored = _read_record(directory)
+        records.append(stored)
+        test_missing = {
+            keys[name]: scorer
+            for name, scorer in scorers.items()
+            if keys[name] in uncached or keys[name] not in stored.get("test", {})
+        }
+        train_missing = {
+            keys[name]: scorer
+            for name, scorer in scorers.items()
+            if return_train_score
+            and (keys[name] in uncached or keys[name] not in stored.get("train", {}))
+        }
+        if not stored or test_missing or train_missing:
+            task = _FoldTask(
+                directory,
+                estimator,
+                train,
+                test,
+                test_missing,
+                train_missing,
+                stored,
+                uncached,
+            )
+            tasks.append((i, task))
+
+    cached = np.array([bool(record) for record in records])
+    # Scorers joblib cannot hash cannot be pickled to a worker either
+    # (lambdas, closures), so those folds are evaluated in this process
+    workers = 1 if uncached else min(n_workers(n_jobs), len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(X, y)
+        ) as pool:
+            updated = list(pool.map(_run_fold, [task for _, task in tasks]))
+    else:
+        updated = [_run_fold(task, X, y) for _, task in tasks]
+    for (i, _), record in zip(tasks, updated, strict=True):
+        records[i] = record
+
+    results: dict[str, Any] = {
+        "fit_time": np.array([record["fit_time"] for record in records]),
+        "score_time": np.array([record.get("score_time", 0.0) for record in records]),
+    }
+    single = len(scorers) == 1 and not isinstance(scoring, list | tuple | set | dict)
+    for name in scorers:
+        label = "score" if single else name
+        results[f"test_{label}"] = np.array(
+            [record["test"][keys[name]] for record in records]
+        )
+        if return_train_score:
+            results[f"train_{label}"] = np.array(
+                [record["train"][keys[name]] for record in records]
+            )
+    if return_estimator:
+        results["estimator"] = [
+            joblib.load(directory / MODEL_FILENAME) for directory in directories
+        ]
+    results["cached"] = cached
+    return results
+
+
+def cached_cross_val_score(
+    estimator: Any,
+    X: Any,
+    y: Any = None,
+    cv: Any = 5,
+    scoring: str | Callable[..., float] | None = None,
+    cache_dir: Path | str | None = None,
+    n_jobs: int | None = 1,
+) -> np.ndarray[Any, np.dtype[np.float64]]:
+    """
+    Drop-in ``cross_val_score`` backed by ``cached_cross_validate``.
+
+    Example:
+        >>> for k in [3, 5, 7, 10, 15, 20]:
+        ...     kfold = StratifiedKFold(n_splits=k, shuffle=True, random_state=42)
+        ...     scores = cached_cross_val_score(clf, X, y, cv=kfold, n_jobs=-1)
+    """
+    results = cached_cross_validate(
+        estimator, X, y, cv=cv, scoring=scoring, cache_dir=cache_dir, n_jobs=n_jobs
+    )
+    scores: np.ndarray[Any, np.dtype[np.float64]] = results["test_score"]
+    return scores
@@ -0,0 +1,273 @@
+"""Leave-one-out cross-validation without n refits where possible.
+
+Exact shortcuts are used for models whose leave-one-out prediction can be
+derived from a single fit:
+
+* ``LinearRegression`` / ``Ridge`` (unconstrained, scalar ``alpha``): the
+  hat-matrix identity ``y_i - y_loo_i = e_i / (1 - h_ii)``, with the
+  intercept unpenalized as in scikit-learn;
+* ``KNeighborsClassifier`` / ``KNeighborsRegressor`` / ``BlockedKNNClassifier``:
+  one search for ``k + 1`` neighbors, dropping each point from its own list;
+* ``GaussianNB``: per-class counts, means and variances, with each sample's
+  contribution removed from its class before it is scored.
+
+Any other estimator (pipelines included) falls back to refitting it n times,
+in chunks spread over a process pool.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sklearn.base import clone, is_classifier
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+
+from ..models.knn import (
+    BlockedKNNClassifier,
+    _vote_weights,
+    kneighbors,
+    sweep_predictions,
+)
+from ._workers import init_worker, n_workers, take, worker_data
+
+FloatArray = np.ndarray[Any, np.dtype[np.float64]]
+
+_SCORERS: dict[str, Callable[[Any, Any], FloatArray]] = {
+    "accuracy": lambda y, p: (np.asarray(y) == np.asarray(p)).astype(np.float64),
+    "neg_mean_squared_error": lambda y, p: -((np.asarray(y) - p) ** 2),
+    "neg_mean_absolute_error": lambda y, p: -np.abs(np.asarray(y) - p),
+}
+
+# Samples per task of the refit fallback.
+_REFIT_CHUNK = 64
+
+
+@dataclass
+class LOOResult:
+    """Leave-one-out predictions and per-sample scores."""
+
+    predictions: np.ndarray[Any, Any]
+    scores: FloatArray
+    method: str
+
+    @property
+    def mean(self) -> float:
+        """Mean score, equal to ``cross_val_score(..., cv=LeaveOneOut()).mean()``."""
+        return float(self.scores.mean())
+
+    @property
+    def std(self) -> float:
+        """Standard deviation of the per-sample scores."""
+        return float(self.scores.std())
+
+
+def _has_hat_matrix(estimator: Any) -> bool:
+    """Whether the hat-matrix identity gives this model's exact LOO fit."""
+    if type(estimator) not in (LinearRegression, Ridge):
+        return False
+    # positive=True is a constrained fit, without a closed form
+    return not estimator.positive and np.ndim(getattr(estimator, "alpha", 0.0)) == 0
+
+
+def _loo_linear(estimator: Any, X: FloatArray, y: FloatArray) -> FloatArray:
+    """Hat-matrix LOO predictions of LinearRegression or Ridge."""
+    alpha = float(getattr(estimator, "alpha", 0.0))
+    n, d = X.shape
+    if estimator.fit_intercept:
+        X = np.hstack([X, np.ones((n, 1))])
+    gram = X.T @ X
+    gram[np.arange(d), np.arange(d)] += alpha  # the intercept stays unpenalized
+    # pinv also covers the rank-deficient OLS case, like lstsq in LinearRegression
+    inverse = np.linalg.pinv(gram, hermitian=True)
+    coef = inverse @ (X.T @ y)
+    residuals = y - X @ coef
+    leverage = np.einsum("ij,jk,ik->i", X, inverse, X)
+    loo: FloatArray = y - residuals / (1.0 - leverage)
+    return loo
+
+
+def _knn_metric(estimator: Any) -> str | None:
+    """Metric name for ``kneighbors``, or None if the shortcut does not apply."""
+    metric = estimator.metric
+    if metric == "minkowski":
+        metric = {1: "manhattan", 2: "euclidean"}.get(estimator.p, "")
+    if metric not in ("euclidean", "manhattan", "chebyshev") or callable(
+        estimator.weights
+    ):
+        return None
+    return str(metric)
+
+
+def _loo_knn(
+    estimator: Any, X: FloatArray, y: np.ndarray[Any, Any], metric: str
+) -> Any:
+    """LOO predictions of a KNN model from one (k + 1)-neighbor search."""
+    k = estimator.n_neighbors
+    n = len(X)
+    block_size = getattr(estimator, "block_size", None)
+    distances, indices = kneighbors(X, X, k + 1, metric=metric, block_size=block_size)
+    keep = indices != np.arange(n)[:, None]
+    # With duplicates a point may not be in its own list; drop the farthest
+    keep[keep.all(axis=1), -1] = False
+    distances = distances[keep].reshape(n, k)
+    indices = indices[keep].reshape(n, k)
+
+    if is_classifier(estimator):
+        classes, codes = np.unique(y, return_inverse=True)
+        predicted = sweep_predictions(
+            codes[indices], distances, [k], len(classes), weights=estimator.weights
+        )[0]
+        return classes[predicted]
+    values = np.asarray(y, dtype=np.float64)[indices]
+    weights = _vote_weights(distances, estimator.weights)
+    return (weights * values).sum(axis=1) / weights.sum(axis=1)
+
+
+def _loo_gaussian_nb(estimator: Any, X: FloatArray, y: np.ndarray[Any, Any]) -> Any:
+    """LOO predictions of GaussianNB from downdated class statistics."""
+    classes, codes = np.unique(y, return_inverse=True)
+    n, _ = X.shape
+    n_classes = len(classes)
+
+    # Feature variance without sample i, for the var_smoothing epsilon
+    mean_all = X.mean(axis=0)
+    m2_all = ((X - mean_all) ** 2).sum(axis=0)
+    mean_wo = (n * mean_all - X) / (n - 1)
+    var_wo = (m2_all - (X - mean_all) * (X - mean_wo)) / (n - 1)
+    epsilon = estimator.var_smoothing * var_wo.max(axis=1)
+
+    log_joint = np.full((n, n_classes), -np.inf)
+    for c in range(n_classes):
+        in_class = codes == c
+        n_c = int(in_class.sum())
+        X_c = X[in_class]
+        mean_c = X_c.mean(axis=0)
+        m2_c = ((X_c - mean_c) ** 2).sum(axis=0)
+
+        count = np.full(n, float(n_c))
+        mean = np.broadcast_to(mean_c, X.shape).copy()
+        var = np.broadcast_to(m2_c / n_c, X.shape).copy()
+        if n_c > 1:
+            # Welford downdate: remove each member of the class from its stats
+            x = X[in_class]
+            mean_down = (n_c * mean_c - x) / (n_c - 1)
+            var[in_class] = (m2_c - (x - mean_c) * (x - mean_down)) / (n_c - 1)
+            mean[in_class] = mean_down
+        count[in_class] -= 1
+        var += epsilon[:, None]
+
+        if estimator.priors is not None:
+            log_prior = np.log(np.asarray(estimator.priors)[c])
+        else:
+            with np.errstate(divide="ignore"):
+                log_prior = np.log(count / (n - 1))
+        log_likelihood = -0.5 * (
+            np.log(2.0 * np.pi * var).sum(axis=1) + ((X - mean) ** 2 / var).sum(axis=1)
+        )
+        # A class whose only sample is left out does not exist for that fit
+        log_joint[:, c] = np.where(count > 0, log_prior + log_likelihood, -np.inf)
+    return classes[log_joint.argmax(axis=1)]
+
+
+def _refit_chunk(
+    args: tuple[Any, np.ndarray[Any, np.dtype[np.intp]]],
+    X: Any = None,
+    y: Any = None,
+) -> list[Any]:
+    estimator, indices = args
+    X, y = worker_data(X, y)
+    mask = np.ones(len(X), dtype=bool)
+    predictions = []
+    for i in indices:
+        mask[i] = False
+        model = clone(estimator).fit(take(X, mask), take(y, mask))
+        predictions.append(model.predict(take(X, np.array([i])))[0])
+        mask[i] = True
+    return predictions
+
+
+def loo_predict(
+    estimator: Any, X: Any, y: Any, n_jobs: int | None = 1
+) -> tuple[np.ndarray[Any, Any], str]:
+    """
+    Leave-one-out prediction of every sample.
+
+    Args:
+        estimator: Unfitted estimator
+        X: Features
+        y: Target
+        n_jobs: Worker processes for the refit fallback (-1: all cores)
+
+    Returns:
+        (predictions, method), method being "hat_matrix", "knn_exclusion",
+        "gaussian_nb" or "refit"
+    """
+    y = np.asarray(y)
+    # X is only converted on the shortcut paths: the refit fallback passes it
+    # unchanged, so pipelines can take DataFrames or non-numeric columns
+    if _has_hat_matrix(estimator) and y.ndim == 1:
+        X_float = np.asarray(X, dtype=np.float64)
+        return _loo_linear(estimator, X_float, y.astype(np.float64)), "hat_matrix"
+    if isinstance(estimator, GaussianNB):
+        X_float = np.asarray(X, dtype=np.float64)
+        return _loo_gaussian_nb(estimator, X_float, y), "gaussian_nb"
+    if isinstance(
+        estimator, KNeighborsClassifier | KNeighborsRegressor | BlockedKNNClassifier
+    ):
+        metric = _knn_metric(estimator)
+        if metric is not None:
+            X_float = np.asarray(X, dtype=np.float64)
+            return _loo_knn(estimator, X_float, y, metric), "knn_exclusion"
+
+    chunks = [
+        (estimator, chunk)
+        for chunk in np.array_split(np.arange(len(X)), max(1, len(X) // _REFIT_CHUNK))
+    ]
+    workers = min(n_workers(n_jobs), len(chunks))
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(X, y)
+        ) as pool:
+            parts = list(pool.map(_refit_chunk, chunks))
+    else:
+        parts = [_refit_chunk(chunk, X, y) for chunk in chunks]
+    return np.array([p for part in parts for p in part]), "refit"
+
+
+def loocv_score(
+    estimator: Any,
+    X: Any,
+    y: Any,
+    scoring: str | Callable[[Any, Any], FloatArray] | None = None,
+    n_jobs: int | None = 1,
+) -> LOOResult:
+    """
+    Leave-one-out CV, using an exact shortcut when the model has one.
+
+    Args:
+        estimator: Unfitted estimator
+        X: Features
+        y: Target
+        scoring: "accuracy", "neg_mean_squared_error",
+            "neg_mean_absolute_error" or a function ``(y, pred) -> per-sample
+            scores`` (default: accuracy for classifiers, negative MSE else)
+        n_jobs: Worker processes for the refit fallback (-1: all cores)
+
+    Returns:
+        LOOResult whose ``scores`` match
+        ``cross_val_score(estimator, X, y, cv=LeaveOneOut(), scoring=...)``
+
+    Example:
+        >>> result = loocv_score(KNeighborsClassifier(5), X, y)
+        >>> print(f"LOOCV: {result.mean:.4f} ({result.method})")
+    """
+    if scoring is None:
+        scoring = "accuracy" if is_classifier(estimator) else "neg_mean_squared_error"
+    scorer = _SCORERS[scoring] if isinstance(scoring, str) else scoring
+    predictions, method = loo_predict(estimator, X, y, n_jobs=n_jobs)
+    scores = np.asarray(scorer(y, predictions), dtype=np.float64)
+    return LOOResult(predictions, scores, method)
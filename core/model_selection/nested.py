@@ -0,0 +1,291 @@
+"""Nested cross-validation as one flat, resumable task graph.
+
+Instead of looping over the outer folds and running a grid search inside
+each one, every (outer fold, candidate, inner fold) fit is submitted to the
+same process pool up front. As soon as all inner fits of an outer fold are
+done, its best candidate is refit on the outer training data and scored on
+the outer test fold, while the other outer folds keep the workers busy.
+
+With a ``checkpoint_dir``, every finished task is appended to a JSON-lines
+file named after a hash of the estimator, grid, data, folds and scoring; a
+run that was interrupted picks up from the tasks already in the file.
+"""
+
+import hashlib
+import json
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+from sklearn.base import clone, is_classifier
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import ParameterGrid, check_cv
+
+from ._workers import init_worker, n_workers, take, worker_data
+from .cross_validation import _scorer_key
+
+
+@dataclass
+class _Task:
+    key: str
+    estimator: Any
+    params: dict[str, Any]
+    train: np.ndarray[Any, Any]
+    test: np.ndarray[Any, Any]
+    scoring: Any
+
+
+@dataclass
+class NestedCVResult:
+    """Outcome of ``nested_cross_validate``."""
+
+    scores: np.ndarray[Any, np.dtype[np.float64]]
+    best_params: list[dict[str, Any]]
+    candidates: list[dict[str, Any]]
+    inner_scores: np.ndarray[Any, np.dtype[np.float64]]
+    resumed_tasks: int
+
+    @property
+    def mean(self) -> float:
+        """Mean outer-fold score (the nested CV estimate)."""
+        return float(self.scores.mean())
+
+    @property
+    def std(self) -> float:
+        """Standard deviation of the outer-fold scores."""
+        return float(self.scores.std())
+
+    def folds(self) -> list[dict[str, Any]]:
+        """One row per outer fold: fold number, best params and score."""
+        return [
+            {"fold": i + 1, "best_params": params, "score": float(score)}
+            for i, (params, score) in enumerate(
+                zip(self.best_params, self.scores, strict=True)
+            )
+        ]
+
+
+def _run_task(task: _Task, X: Any = None, y: Any = None) -> tuple[str, float, float]:
+    X, y = worker_data(X, y)
+    estimator = clone(task.estimator).set_params(**task.params)
+    start = time.perf_counter()
+    estimator.fit(take(X, task.train), take(y, task.train))
+    scorer = check_scoring(estimator, scoring=task.scoring)
+    score = float(scorer(estimator, take(X, task.test), take(y, task.test)))
+    return task.key, score, time.perf_counter() - start
+
+
+class _Checkpoint:
+    """Append-only JSON-lines log of finished tasks."""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.done: dict[str, float] = {}
+        if path is None or not path.exists():
+            return
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        valid = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by the interruption
+            self.done[entry["task"]] = entry["score"]
+            valid.append(line if line.endswith("\n") else line + "\n")
+        if valid != lines:
+            # Drop the partial line so new entries start on a line of their own
+            path.write_text("".join(valid), encoding="utf-8")
+
+    def add(self, key: str, score: float, seconds: float) -> None:
+        self.done[key] = score
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            entry = {"task": key, "score": score, "seconds": round(seconds, 4)}
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+
+
+def _run_key(
+    estimator: Any,
+    candidates: list[dict[str, Any]],
+    X: Any,
+    y: Any,
+    splits: Sequence[Any],
+    scoring: Any,
+) -> str:
+    scoring_key = _scorer_key(scoring)
+    if scoring_key is None:
+        # A key that changes between runs would silently restart the log
+        raise ValueError(
+            "checkpoint_dir needs a scoring that can be hashed (a name, "
+            "make_scorer or a module-level function), not a lambda or closure"
+        )
+    digest = hashlib.sha256()
+    cls = type(estimator)
+    for part in (
+        (cls.__module__, cls.__qualname__, estimator.get_params(deep=True)),
+        candidates,
+        (X, y),
+        splits,
+        scoring_key,
+    ):
+        digest.update(joblib.hash(part).encode())
+    return digest.hexdigest()[:32]
+
+
+def nested_cross_validate(
+    estimator: Any,
+    param_grid: Mapping[str, Iterable[Any]] | Sequence[Mapping[str, Any]],
+    X: Any,
+    y: Any = None,
+    outer_cv: Any = 5,
+    inner_cv: Any = 3,
+    scoring: Any = None,
+    n_jobs: int | None = 1,
+    checkpoint_dir: Path | str | None = None,
+) -> NestedCVResult:
+    """
+    Nested CV: grid search on inner folds, evaluation on outer folds.
+
+    Gives the same result as fitting ``GridSearchCV(estimator, param_grid,
+    cv=inner_cv, scoring=scoring)`` on each outer training split and
+    scoring its best estimator on the outer test split.
+
+    Args:
+        estimator: Estimator to tune and evaluate
+        param_grid: Parameter grid, as in ``GridSearchCV``
+        X: Features
+        y: Target
+        outer_cv: Outer folds (int, splitter or list of splits)
+        inner_cv: Inner folds, applied to each outer training split
+        scoring: Scoring, as in scikit-learn
+        n_jobs: Worker processes (-1: all cores)
+        checkpoint_dir: Directory of the resumable task log (None: no log);
+            callable scorings are keyed by their content, so they must be
+            hashable by joblib
+
+    Returns:
+        NestedCVResult with outer scores, best params per outer fold and
+        the mean inner score of every candidate per outer fold
+
+    Example:
+        >>> result = nested_cross_validate(
+        ...     RandomForestClassifier(random_state=42), simple_param_grid, X, y,
+        ...     outer_cv=outer_cv, inner_cv=inner_cv, scoring="accuracy",
+        ...     n_jobs=-1, checkpoint_dir=".cache/nested",
+        ... )
+        >>> print(f"Nested CV Score: {result.mean:.3f} ± {result.std:.3f}")
+    """
+    classifier = is_classifier(estimator)
+    candidates = list(ParameterGrid(param_grid))
+    outer = check_cv(outer_cv, y, classifier=classifier)
+    outer_splits = list(outer.split(X, y))
+    inner_splits = []
+    for train, _ in outer_splits:
+        y_train = take(y, train)
+        inner = check_cv(inner_cv, y_train, classifier=classifier)
+        inner_splits.append(
+            [(train[a], train[b]) for a, b in inner.split(take(X, train), y_train)]
+        )
+
+    checkpoint_path = None
+    if checkpoint_dir is not None:
+        run_key = _run_key(
+            estimator, candidates, X, y, (outer_splits, inner_splits), scoring
+        )
+        checkpoint_path = Path(checkpoint_dir) / f"nested-{run_key}.jsonl"
+    checkpoint = _Checkpoint(checkpoint_path)
+    resumed = len(checkpoint.done)
+
+    def inner_task(o: int, c: int, i: int) -> _Task:
+        train, test = inner_splits[o][i]
+        return _Task(
+            f"inner/{o}/{c}/{i}", estimator, candidates[c], train, test, scoring
+        )
+
+    def inner_means(o: int) -> np.ndarray[Any, np.dtype[np.float64]]:
+        n_inner = len(inner_splits[o])
+        return np.array(
+            [
+                np.mean([checkpoint.done[f"inner/{o}/{c}/{i}"] for i in range(n_inner)])
+                for c in range(len(candidates))
+            ]
+        )
+
+    def outer_task(o: int) -> _Task:
+        # Same choice as GridSearchCV: best mean, first candidate on ties
+        best = int(np.argmax(inner_means(o)))
+        train, test = outer_splits[o]
+        return _Task(f"outer/{o}", estimator, candidates[best], train, test, scoring)
+
+    pending_inner = {
+        o: {
+            f"inner/{o}/{c}/{i}"
+            for c in range(len(candidates))
+            for i in range(len(inner_splits[o]))
+        }
+        - set(checkpoint.done)
+        for o in range(len(outer_splits))
+    }
+    first_tasks = [
+        inner_task(o, c, i)
+        for o in range(len(outer_splits))
+        for c in range(len(candidates))
+        for i in range(len(inner_splits[o]))
+        if f"inner/{o}/{c}/{i}" not in checkpoint.done
+    ]
+    first_tasks += [
+        outer_task(o)
+        for o, pending in pending_inner.items()
+        if not pending and f"outer/{o}" not in checkpoint.done
+    ]
+
+    def finished(key: str) -> list[_Task]:
+        """Record a result; return the outer task it unlocks, if any."""
+        kind, o_str, *_ = key.split("/")
+        o = int(o_str)
+        if kind != "inner":
+            return []
+        pending_inner[o].discard(key)
+        if pending_inner[o] or f"outer/{o}" in checkpoint.done:
+            return []
+        return [outer_task(o)]
+
+    workers = n_workers(n_jobs)
+    if workers <= 1:
+        queue = list(first_tasks)
+        while queue:
+            key, score, seconds = _run_task(queue.pop(0), X, y)
+            checkpoint.add(key, score, seconds)
+            queue.extend(finished(key))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=(X, y)
+        ) as pool:
+            running: set[Future[tuple[str, float, float]]] = {
+                pool.submit(_run_task, task) for task in first_tasks
+            }
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, score, seconds = future.result()
+                    checkpoint.add(key, score, seconds)
+                    running |= {pool.submit(_run_task, t) for t in finished(key)}
+
+    inner_scores = np.array([inner_means(o) for o in range(len(outer_splits))])
+    return NestedCVResult(
+        scores=np.array(
+            [checkpoint.done[f"outer/{o}"] for o in range(len(outer_splits))]
+        ),
+        best_params=[candidates[int(np.argmax(row))] for row in inner_scores],
+        candidates=candidates,
+        inner_scores=inner_scores,
+        resumed_tasks=resumed,
+    )
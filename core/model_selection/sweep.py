@@ -0,0 +1,169 @@
+"""Parallel sweeps over model configurations on shared-memory data.
+
+The training (and optional test) arrays are copied once into
+``multiprocessing.shared_memory``; every worker maps the same pages as
+read-only NumPy views instead of receiving its own pickled copy, so memory
+does not grow with the number of workers. Each worker also limits its BLAS
+thread pool, so ``n_workers * blas_threads`` stays within the CPU count
+instead of every process spawning one BLAS thread per core.
+
+Results (scores, fit time and the loss curve of estimators that record
+one, such as ``MLPClassifier``) are yielded as soon as each configuration
+finishes.
+"""
+
+import os
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from sklearn.base import clone
+
+from ._workers import WORKER_DATA, init_shared_worker, n_workers, share_arrays
+
+
+@dataclass
+class SweepResult:
+    """Outcome of one configuration of a sweep."""
+
+    index: int
+    params: dict[str, Any]
+    train_score: float
+    test_score: float | None
+    fit_time: float
+    loss_curve: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Flat row for a DataFrame (params first, loss curve excluded)."""
+        return {
+            **self.params,
+            "train_score": self.train_score,
+            "test_score": self.test_score,
+            "fit_time": self.fit_time,
+            "n_iter": len(self.loss_curve),
+        }
+
+
+def _fit_config(
+    index: int,
+    estimator: Any,
+    params: dict[str, Any],
+    data: dict[str, Any] | None = None,
+) -> SweepResult:
+    if data is None:
+        data = WORKER_DATA
+    model = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    model.fit(data["X_train"], data["y_train"])
+    fit_time = time.perf_counter() - start
+    test_score = None
+    if "X_test" in data:
+        test_score = float(model.score(data["X_test"], data["y_test"]))
+    return SweepResult(
+        index=index,
+        params=params,
+        train_score=float(model.score(data["X_train"], data["y_train"])),
+        test_score=test_score,
+        fit_time=fit_time,
+        loss_curve=[float(v) for v in getattr(model, "loss_curve_", [])],
+    )
+
+
+def iter_sweep(
+    estimator: Any,
+    configs: Iterable[Mapping[str, Any]],
+    X_train: Any,
+    y_train: Any,
+    X_test: Any = None,
+    y_test: Any = None,
+    n_jobs: int | None = -1,
+    blas_threads: int | None = None,
+) -> Iterator[SweepResult]:
+    """
+    Train one clone of ``estimator`` per configuration, yielding as they finish.
+
+    Args:
+        estimator: Base estimator; each config is applied with ``set_params``
+        configs: Parameter dicts (e.g. a list, or ``ParameterGrid(grid)``)
+        X_train: Training features (converted to a NumPy array)
+        y_train: Training target
+        X_test: Optional test features, scored after each fit
+        y_test: Optional test target
+        n_jobs: Worker processes (-1: all cores; 1: run in this process)
+        blas_threads: BLAS threads per worker (default: CPU count // workers)
+
+    Yields:
+        SweepResult, in completion order (``index`` is the config position)
+    """
+    params_list = [dict(params) for params in configs]
+    arrays = {"X_train": X_train, "y_train": y_train}
+    if X_test is not None:
+        arrays.update(X_test=X_test, y_test=y_test)
+    workers = min(n_workers(n_jobs), len(params_list))
+    if workers <= 1:
+        for index, params in enumerate(params_list):
+            yield _fit_config(index, estimator, params, arrays)
+        return
+
+    if blas_threads is None:
+        blas_threads = max(1, (os.cpu_count() or 1) // workers)
+    segments, specs = share_arrays(arrays)
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_shared_worker,
+        initargs=(specs, blas_threads),
+    )
+    try:
+        running: set[Future[SweepResult]] = {
+            pool.submit(_fit_config, index, estimator, params)
+            for index, params in enumerate(params_list)
+        }
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # Also reached when the caller stops iterating early
+        pool.shutdown(cancel_futures=True)
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+def run_sweep(
+    estimator: Any,
+    configs: Iterable[Mapping[str, Any]],
+    X_train: Any,
+    y_train: Any,
+    X_test: Any = None,
+    y_test: Any = None,
+    n_jobs: int | None = -1,
+    blas_threads: int | None = None,
+    callback: Callable[[SweepResult], None] | None = None,
+) -> list[SweepResult]:
+    """
+    Run ``iter_sweep`` to the end; results are returned in config order.
+
+    ``callback`` is called with each result as soon as it is available
+    (e.g. to print progress or update a live plot of the loss curves).
+
+    Example:
+        >>> architectures = [(5,), (10,), (20,), (10, 10), (20, 10), (50, 25, 10)]
+        >>> results = run_sweep(
+        ...     MLPClassifier(activation="relu", max_iter=1000, random_state=42),
+        ...     [{"hidden_layer_sizes": arch} for arch in architectures],
+        ...     X_train_scaled, y_train, X_test_scaled, y_test,
+        ...     callback=lambda r: print(r.params, f"{r.test_score:.4f}"),
+        ... )
+        >>> pd.DataFrame([r.to_dict() for r in results])
+    """
+    results = []
+    for result in iter_sweep(
+        estimator, configs, X_train, y_train, X_test, y_test, n_jobs, blas_threads
+    ):
+        if callback is not None:
+            callback(result)
+        results.append(result)
+    return sorted(results, key=lambda result: result.index)
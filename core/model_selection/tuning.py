@@ -0,0 +1,441 @@
+"""Successive-halving and hyperband hyperparameter search.
+
+Candidates are first evaluated with a small budget of a *resource* (trees of
+a forest, iterations of a solver, or training samples); only the best
+``1 / factor`` of them move on to the next, ``factor`` times larger budget.
+When the resource is a parameter such as ``n_estimators`` and the estimator
+supports ``warm_start``, the fold models of the surviving candidates are
+grown from where they stopped instead of being refit from scratch.
+
+All (candidate, fold) fits of a rung run in one process pool that receives
+the data once. Results use the same layout as scikit-learn's ``cv_results_``
+(``params``, ``param_<name>``, ``split<k>_test_score``, ``mean_test_score``,
+``rank_test_score``...), plus ``iter`` and ``n_resources`` columns.
+"""
+
+import math
+import time
+from abc import ABCMeta, abstractmethod
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sklearn.base import BaseEstimator, clone, is_classifier
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import ParameterGrid, ParameterSampler, check_cv
+
+from ._workers import init_worker, n_workers, take, worker_data
+
+N_SAMPLES = "n_samples"
+
+
+@dataclass
+class _FitTask:
+    candidate: int
+    fold: int
+    estimator: Any
+    params: dict[str, Any]
+    train: np.ndarray[Any, np.dtype[np.intp]]
+    test: np.ndarray[Any, np.dtype[np.intp]]
+    scoring: Any
+    keep_model: bool
+
+
+@dataclass
+class _FitResult:
+    candidate: int
+    fold: int
+    score: float
+    fit_time: float
+    score_time: float
+    model: Any
+
+
+def _fit_and_score(task: _FitTask, X: Any = None, y: Any = None) -> _FitResult:
+    X, y = worker_data(X, y)
+    estimator = task.estimator.set_params(**task.params)
+    start = time.perf_counter()
+    estimator.fit(take(X, task.train), take(y, task.train))
+    fit_time = time.perf_counter() - start
+    scorer = check_scoring(estimator, scoring=task.scoring)
+    start = time.perf_counter()
+    score = float(scorer(estimator, take(X, task.test), take(y, task.test)))
+    score_time = time.perf_counter() - start
+    model = estimator if task.keep_model else None
+    return _FitResult(task.candidate, task.fold, score, fit_time, score_time, model)
+
+
+def resource_levels(min_resource: int, max_resource: int, factor: float) -> list[int]:
+    """
+    Budgets of consecutive rungs, ``factor`` apart and ending at the max.
+
+    Args:
+        min_resource: Smallest budget allowed for the first rung
+        max_resource: Budget of the last rung
+        factor: Growth of the budget (and shrink of the candidates) per rung
+
+    Returns:
+        Increasing list of integer budgets ``max_resource / factor**i``
+    """
+    if not 1 <= min_resource <= max_resource or factor <= 1:
+        raise ValueError("need 1 <= min_resource <= max_resource and factor > 1")
+    n_rungs = int(math.log(max_resource / min_resource, factor) + 1e-9) + 1
+    levels = [
+        max(1, round(max_resource / factor**i)) for i in range(n_rungs - 1, -1, -1)
+    ]
+    return sorted(set(levels))
+
+
+class _BaseHalvingSearch(BaseEstimator, metaclass=ABCMeta):  # type: ignore[misc]
+    """Shared machinery of HalvingSearchCV and HyperbandSearchCV."""
+
+    def __init__(
+        self,
+        estimator: Any,
+        resource: str = "n_estimators",
+        max_resource: int | None = None,
+        min_resource: int | None = None,
+        factor: float = 3,
+        cv: Any = 5,
+        scoring: Any = None,
+        n_jobs: int | None = 1,
+        refit: bool = True,
+        random_state: int | None = None,
+    ) -> None:
+        self.estimator = estimator
+        self.resource = resource
+        self.max_resource = max_resource
+        self.min_resource = min_resource
+        self.factor = factor
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.refit = refit
+        self.random_state = random_state
+
+    @abstractmethod
+    def _brackets(self, max_resource: int) -> list[tuple[list[dict[str, Any]], int]]:
+        """Return the (candidate params, first budget) of each bracket."""
+
+    def _max_resource(self, n_train: int) -> int:
+        if self.max_resource is not None:
+            return int(self.max_resource)
+        if self.resource == N_SAMPLES:
+            return n_train
+        default = self.estimator.get_params().get(self.resource)
+        if not isinstance(default, int):
+            raise ValueError(f"max_resource is required for resource '{self.resource}'")
+        return default
+
+    def _warm_start(self) -> bool:
+        return (
+            self.resource != N_SAMPLES and "warm_start" in self.estimator.get_params()
+        )
+
+    def fit(self, X: Any, y: Any = None) -> "_BaseHalvingSearch":
+        """Run the search; sets ``cv_results_``, ``best_params_``, etc."""
+        cv = check_cv(self.cv, y, classifier=is_classifier(self.estimator))
+        self.n_splits_ = cv.get_n_splits(X, y)
+        folds = list(cv.split(X, y))
+        max_resource = self._max_resource(min(len(train) for train, _ in folds))
+        if self.resource == N_SAMPLES:
+            # Budget r trains on the first r rows of a fixed shuffle of each fold
+            rng = np.random.default_rng(self.random_state)
+            folds = [(rng.permutation(train), test) for train, test in folds]
+
+        self._rows: list[dict[str, Any]] = []
+        workers = n_workers(self.n_jobs)
+        if workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker, initargs=(X, y)
+            ) as pool:
+                self._search(pool, X, y, folds, max_resource)
+        else:
+            self._search(None, X, y, folds, max_resource)
+
+        self.cv_results_ = self._results_table()
+        best = int(np.argmin(self.cv_results_["rank_test_score"]))
+        self.best_index_ = best
+        self.best_params_ = self.cv_results_["params"][best]
+        self.best_score_ = float(self.cv_results_["mean_test_score"][best])
+        self.n_candidates_ = [len(c) for c in self._rung_sizes]
+        self.n_resources_ = list(self._rung_resources)
+        if self.refit:
+            params = dict(self.best_params_)
+            if self.resource != N_SAMPLES:
+                params[self.resource] = max_resource
+            self.best_estimator_ = clone(self.estimator).set_params(**params)
+            start = time.perf_counter()
+            self.best_estimator_.fit(X, y)
+            self.refit_time_ = time.perf_counter() - start
+        return self
+
+    def _search(
+        self,
+        pool: Executor | None,
+        X: Any,
+        y: Any,
+        folds: list[tuple[np.ndarray[Any, Any], np.ndarray[Any, Any]]],
+        max_resource: int,
+    ) -> None:
+        self._rung_sizes: list[list[int]] = []
+        self._rung_resources: list[int] = []
+        warm = self._warm_start()
+        n_iter = 0
+        for bracket, (candidates, first_budget) in enumerate(
+            self._brackets(max_resource)
+        ):
+            alive = list(range(len(candidates)))
+            models: dict[tuple[int, int], Any] = {}
+            levels = resource_levels(first_budget, max_resource, self.factor)
+            for rung, budget in enumerate(levels):
+                last_rung = rung == len(levels) - 1
+                tasks = []
+                for c in alive:
+                    params = dict(candidates[c])
+                    if self.resource != N_SAMPLES:
+                        params[self.resource] = budget
+                        if warm:
+                            params["warm_start"] = True
+                    for f, (train, test) in enumerate(folds):
+                        estimator = models.pop((c, f), None)
+                        if estimator is None:
+                            estimator = clone(self.estimator)
+                        if self.resource == N_SAMPLES:
+                            train = train[:budget]
+                        tasks.append(
+                            _FitTask(
+                                c,
+                                f,
+                                estimator,
+                                params,
+                                train,
+                                test,
+                                self.scoring,
+                                keep_model=warm and not last_rung,
+                            )
+                        )
+                if pool is None:
+                    results = [_fit_and_score(task, X, y) for task in tasks]
+                else:
+                    results = list(pool.map(_fit_and_score, tasks))
+
+                scores: dict[int, list[_FitResult]] = {c: [] for c in alive}
+                for result in results:
+                    scores[result.candidate].append(result)
+                    if result.model is not None:
+                        models[(result.candidate, result.fold)] = result.model
+                for c in alive:
+                    self._add_row(candidates[c], scores[c], n_iter, bracket, budget)
+                self._rung_sizes.append(alive)
+                self._rung_resources.append(budget)
+                n_iter += 1
+
+                # Early discarding: only the best 1/factor go to the next rung
+                keep = max(1, math.ceil(len(alive) / self.factor))
+                means = [np.mean([r.score for r in scores[c]]) for c in alive]
+                order = np.argsort(-np.asarray(means), kind="stable")
+                alive = sorted(alive[i] for i in order[:keep])
+                models = {key: m for key, m in models.items() if key[0] in alive}
+
+    def _add_row(
+        self,
+        params: Mapping[str, Any],
+        results: Sequence[_FitResult],
+        n_iter: int,
+        bracket: int,
+        budget: int,
+    ) -> None:
+        results = sorted(results, key=lambda r: r.fold)
+        params = dict(params)
+        if self.resource != N_SAMPLES:
+            params[self.resource] = budget
+        self._rows.append(
+            {
+                "params": params,
+                "scores": [r.score for r in results],
+                "fit_times": [r.fit_time for r in results],
+                "score_times": [r.score_time for r in results],
+                "iter": n_iter,
+                "bracket": bracket,
+                "n_resources": budget,
+            }
+        )
+
+    def _results_table(self) -> dict[str, Any]:
+        rows = self._rows
+        results: dict[str, Any] = {}
+        names = sorted({name for row in rows for name in row["params"]})
+        for name in names:
+            column = np.ma.masked_all(len(rows), dtype=object)  # type: ignore[no-untyped-call]
+            for i, row in enumerate(rows):
+                if name in row["params"]:
+                    column[i] = row["params"][name]
+            results[f"param_{name}"] = column
+        results["params"] = [row["params"] for row in rows]
+
+        scores = np.array([row["scores"] for row in rows])
+        for k in range(scores.shape[1]):
+            results[f"split{k}_test_score"] = scores[:, k]
+        results["mean_test_score"] = scores.mean(axis=1)
+        results["std_test_score"] = scores.std(axis=1)
+        for key, name in (("fit_times", "fit_time"), ("score_times", "score_time")):
+            times = np.array([row[key] for row in rows])
+            results[f"mean_{name}"] = times.mean(axis=1)
+            results[f"std_{name}"] = times.std(axis=1)
+
+        # Rows with more budget rank first; within a budget, higher scores do
+        n_resources = np.array([row["n_resources"] for row in rows])
+        order = np.lexsort((-results["mean_test_score"], -n_resources))
+        rank = np.empty(len(rows), dtype=np.int32)
+        rank[order] = np.arange(1, len(rows) + 1)
+        results["rank_test_score"] = rank
+        results["iter"] = np.array([row["iter"] for row in rows])
+        results["bracket"] = np.array([row["bracket"] for row in rows])
+        results["n_resources"] = n_resources
+        return results
+
+    def predict(self, X: Any) -> Any:
+        """Predict with the refit best estimator."""
+        return self.best_estimator_.predict(X)
+
+    def score(self, X: Any, y: Any) -> float:
+        """Score of the refit best estimator with the search's scoring."""
+        scorer = check_scoring(self.best_estimator_, scoring=self.scoring)
+        return float(scorer(self.best_estimator_, X, y))
+
+
+class HalvingSearchCV(_BaseHalvingSearch):
+    """
+    Successive halving over a parameter grid.
+
+    Example (the lesson's RandomForest grid, growing ``n_estimators``):
+        >>> search = HalvingSearchCV(
+        ...     RandomForestClassifier(random_state=42),
+        ...     {"max_depth": [3, 5, 10, 15], "min_samples_split": [2, 5, 10, 20]},
+        ...     resource="n_estimators", max_resource=200, cv=5,
+        ...     scoring="accuracy", n_jobs=2,
+        ... ).fit(X_train, y_train)
+        >>> pd.DataFrame(search.cv_results_).groupby("param_n_estimators")
+
+    Args:
+        estimator: Estimator to tune
+        param_grid: Dict (or list of dicts) of parameter values
+        resource: Parameter that receives the budget, or "n_samples"
+        max_resource: Budget of the last rung (default: the estimator's
+            current value of ``resource``, or the smallest training fold)
+        min_resource: Budget of the first rung (default: chosen so the
+            candidates shrink to about one at ``max_resource``)
+        factor: Budget growth and candidate reduction per rung
+        cv: Folds, as in scikit-learn
+        scoring: Scoring, as in scikit-learn
+        n_jobs: Worker processes for the fold fits (-1: all cores)
+        refit: Refit the best parameters on all data at ``max_resource``
+        random_state: Seed of the sample order when resource="n_samples"
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        param_grid: Mapping[str, Iterable[Any]] | Sequence[Mapping[str, Any]],
+        resource: str = "n_estimators",
+        max_resource: int | None = None,
+        min_resource: int | None = None,
+        factor: float = 3,
+        cv: Any = 5,
+        scoring: Any = None,
+        n_jobs: int | None = 1,
+        refit: bool = True,
+        random_state: int | None = None,
+    ) -> None:
+        super().__init__(
+            estimator,
+            resource=resource,
+            max_resource=max_resource,
+            min_resource=min_resource,
+            factor=factor,
+            cv=cv,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            refit=refit,
+            random_state=random_state,
+        )
+        self.param_grid = param_grid
+
+    def _brackets(self, max_resource: int) -> list[tuple[list[dict[str, Any]], int]]:
+        candidates = list(ParameterGrid(self.param_grid))
+        if self.min_resource is not None:
+            return [(candidates, int(self.min_resource))]
+        n_rungs = max(1, math.ceil(math.log(len(candidates), self.factor)) + 1)
+        min_resource = max(1, int(max_resource / self.factor ** (n_rungs - 1)))
+        return [(candidates, min_resource)]
+
+
+class HyperbandSearchCV(_BaseHalvingSearch):
+    """
+    Hyperband: several successive-halving brackets with different trade-offs.
+
+    Aggressive brackets start many sampled candidates on a tiny budget;
+    conservative ones start few candidates close to ``max_resource``. The
+    best row over all brackets at the largest budget wins.
+
+    Args:
+        estimator: Estimator to tune
+        param_distributions: Dict of lists or scipy distributions (as in
+            ``RandomizedSearchCV``)
+        resource: Parameter that receives the budget, or "n_samples"
+        max_resource: Budget of the last rung
+        min_resource: Smallest budget of the most aggressive bracket
+        factor: Budget growth and candidate reduction per rung
+        cv: Folds, as in scikit-learn
+        scoring: Scoring, as in scikit-learn
+        n_jobs: Worker processes for the fold fits (-1: all cores)
+        refit: Refit the best parameters on all data at ``max_resource``
+        random_state: Seed of the candidate sampling
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        param_distributions: Mapping[str, Any] | Sequence[Mapping[str, Any]],
+        resource: str = "n_estimators",
+        max_resource: int | None = None,
+        min_resource: int | None = None,
+        factor: float = 3,
+        cv: Any = 5,
+        scoring: Any = None,
+        n_jobs: int | None = 1,
+        refit: bool = True,
+        random_state: int | None = None,
+    ) -> None:
+        super().__init__(
+            estimator,
+            resource=resource,
+            max_resource=max_resource,
+            min_resource=min_resource,
+            factor=factor,
+            cv=cv,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            refit=refit,
+            random_state=random_state,
+        )
+        self.param_distributions = param_distributions
+
+    def _brackets(self, max_resource: int) -> list[tuple[list[dict[str, Any]], int]]:
+        min_resource = int(self.min_resource or max(1, max_resource // 27))
+        s_max = int(math.log(max_resource / min_resource, self.factor) + 1e-9)
+        rng = np.random.RandomState(self.random_state)
+        brackets = []
+        for s in range(s_max, -1, -1):
+            n_candidates = math.ceil((s_max + 1) / (s + 1) * self.factor**s)
+            sampler = ParameterSampler(
+                self.param_distributions,
+                n_iter=n_candidates,
+                random_state=rng.randint(np.iinfo(np.int32).max),
+            )
+            budget = max(min_resource, int(max_resource / self.factor**s))
+            brackets.append((list(sampler), budget))
+        return brackets
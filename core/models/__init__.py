@@ -0,0 +1,35 @@
+"""From-scratch models used in the lessons."""
+
+from .conv import (
+    avg_pool2d,
+    avg_pool2d_backward,
+    col2im,
+    conv2d,
+    conv2d_backward,
+    conv2d_naive,
+    im2col,
+    max_pool2d,
+    max_pool2d_backward,
+)
+from .knn import BlockedKNNClassifier, KSweepResult, kneighbors, knn_k_sweep
+from .mlp import SGD, Adam, NumpyMLPClassifier, Optimizer
+
+__all__ = [
+    "BlockedKNNClassifier",
+    "KSweepResult",
+    "kneighbors",
+    "knn_k_sweep",
+    "Adam",
+    "NumpyMLPClassifier",
+    "Optimizer",
+    "SGD",
+    "avg_pool2d",
+    "avg_pool2d_backward",
+    "col2im",
+    "conv2d",
+    "conv2d_backward",
+    "conv2d_naive",
+    "im2col",
+    "max_pool2d",
+    "max_pool2d_backward",
+]
@@ -0,0 +1,339 @@
+"""NumPy 2D convolution and pooling with im2col, forward and backward.
+
+A convolution is rewritten as one matrix product: every receptive field of
+the (padded) input becomes a row of a "column" matrix of shape
+(batch * out_h * out_w, channels * kh * kw), and the kernels become a
+(channels * kh * kw, filters) matrix. The fields are read through
+``sliding_window_view``, a strided view, so the only copy is the one that
+lays the column matrix out for the GEMM.
+
+The column matrix is ``kh * kw`` times larger than the input, so batches
+are processed in chunks whose column matrix fits in ``max_memory_mb``.
+Arrays follow PyTorch's layout: inputs (N, C, H, W) and weights
+(F, C, kh, kw), so results can be checked against
+``torch.nn.functional.conv2d``.
+
+``conv2d_naive`` is the loop version used in the lessons to explain the
+operation; it is only practical on tiny inputs.
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+Array = np.ndarray[Any, Any]
+
+DEFAULT_MAX_MEMORY_MB = 256
+
+
+def _pair(value: int | tuple[int, int]) -> tuple[int, int]:
+    return (value, value) if isinstance(value, int) else (value[0], value[1])
+
+
+def _check_input(x: Any) -> Array:
+    array: Array = np.asarray(x)
+    if array.ndim != 4:
+        raise ValueError(f"Expected a (N, C, H, W) input, got shape {array.shape}")
+    return array
+
+
+def _float_dtype(*arrays: Any) -> np.dtype[Any]:
+    """Common floating dtype; integer inputs (e.g. uint8 images) use float32."""
+    return np.result_type(*(np.asarray(a).dtype for a in arrays), np.float32)
+
+
+def output_shape(
+    height: int,
+    width: int,
+    kernel_size: int | tuple[int, int],
+    stride: int = 1,
+    padding: int = 0,
+) -> tuple[int, int]:
+    """(out_h, out_w) of a convolution or pooling window."""
+    kh, kw = _pair(kernel_size)
+    out_h = (height + 2 * padding - kh) // stride + 1
+    out_w = (width + 2 * padding - kw) // stride + 1
+    if out_h < 1 or out_w < 1:
+        raise ValueError(
+            f"Kernel {kh}x{kw} does not fit a {height}x{width} input "
+            f"with padding {padding}"
+        )
+    return out_h, out_w
+
+
+def _windows(
+    x: Array, kernel_size: tuple[int, int], stride: int | tuple[int, int], padding: int
+) -> Array:
+    """(N, C, out_h, out_w, kh, kw) strided view of the receptive fields."""
+    sh, sw = _pair(stride)
+    if padding:
+        x = np.pad(x, ((0, 0), (0, 0), (padding, padding), (padding, padding)))
+    view: Array = sliding_window_view(
+        x, kernel_size, axis=(2, 3)  # type: ignore[call-overload]
+    )
+    return view[:, :, ::sh, ::sw]
+
+
+def im2col(
+    x: Any, kernel_size: int | tuple[int, int], stride: int = 1, padding: int = 0
+) -> Array:
+    """
+    Column matrix of the receptive fields of ``x``.
+
+    Returns:
+        (N * out_h * out_w, C * kh * kw) array; row ``(n, i, j)`` holds the
+        field under output pixel (i, j) of image n, in (C, kh, kw) order
+    """
+    x = _check_input(x)
+    windows = _windows(x, _pair(kernel_size), stride, padding)
+    n, c, out_h, out_w, kh, kw = windows.shape
+    # The only copy: (N, out_h, out_w) rows of contiguous (C, kh, kw) fields
+    return windows.transpose(0, 2, 3, 1, 4, 5).reshape(n * out_h * out_w, -1)
+
+
+def col2im(
+    cols: Any,
+    input_shape: tuple[int, int, int, int],
+    kernel_size: int | tuple[int, int],
+    stride: int = 1,
+    padding: int = 0,
+) -> Array:
+    """
+    Sum a column matrix back into an input-shaped array (adjoint of im2col).
+
+    Overlapping fields add up, which is the gradient of ``im2col``.
+    """
+    n, c, height, width = input_shape
+    kh, kw = _pair(kernel_size)
+    out_h, out_w = output_shape(height, width, (kh, kw), stride, padding)
+    cols = np.asarray(cols).reshape(n, out_h, out_w, c, kh, kw)
+    padded = np.zeros(
+        (n, c, height + 2 * padding, width + 2 * padding), dtype=cols.dtype
+    )
+    # One strided add per kernel offset instead of one per output pixel
+    for i in range(kh):
+        for j in range(kw):
+            padded[
+                :, :, i : i + stride * out_h : stride, j : j + stride * out_w : stride
+            ] += cols[:, :, :, :, i, j].transpose(0, 3, 1, 2)
+    if padding:
+        return padded[:, :, padding:-padding, padding:-padding]
+    return padded
+
+
+def _chunks(n: int, bytes_per_image: int, max_memory_mb: float) -> Iterator[slice]:
+    """Batch slices whose column matrix fits in ``max_memory_mb``."""
+    size = max(1, int(max_memory_mb * 2**20) // max(bytes_per_image, 1))
+    for start in range(0, n, size):
+        yield slice(start, min(start + size, n))
+
+
+def conv2d(
+    x: Any,
+    weight: Any,
+    bias: Any = None,
+    stride: int = 1,
+    padding: int = 0,
+    max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+) -> Array:
+    """
+    2D convolution (cross-correlation, as in PyTorch) with im2col + GEMM.
+
+    Args:
+        x: Input of shape (N, C, H, W)
+        weight: Kernels of shape (F, C, kh, kw)
+        bias: Optional (F,) bias
+        stride: Step between receptive fields
+        padding: Zeros added on each side of H and W
+        max_memory_mb: Budget of the column matrix; larger batches are
+            processed in chunks
+
+    Returns:
+        Output of shape (N, F, out_h, out_w), in the common floating dtype
+        of ``x``, ``weight`` and ``bias`` (float32 for integer images)
+
+    Example:
+        >>> x = np.random.rand(64, 3, 32, 32).astype(np.float32)
+        >>> w = np.random.randn(16, 3, 3, 3).astype(np.float32)
+        >>> conv2d(x, w, padding=1).shape
+        (64, 16, 32, 32)
+    """
+    x = _check_input(x)
+    dtype = _float_dtype(x, weight, *([] if bias is None else [bias]))
+    x = x.astype(dtype, copy=False)
+    weight = np.asarray(weight, dtype=dtype)
+    n_filters, channels, kh, kw = weight.shape
+    if channels != x.shape[1]:
+        raise ValueError(f"weight has {channels} input channels, x has {x.shape[1]}")
+    out_h, out_w = output_shape(x.shape[2], x.shape[3], (kh, kw), stride, padding)
+    kernels = weight.reshape(n_filters, -1).T  # (C * kh * kw, F)
+    out = np.empty((x.shape[0], out_h, out_w, n_filters), dtype=x.dtype)
+    bytes_per_image = out_h * out_w * kernels.shape[0] * x.itemsize
+    for batch in _chunks(len(x), bytes_per_image, max_memory_mb):
+        cols = im2col(x[batch], (kh, kw), stride, padding)
+        np.matmul(cols, kernels, out=out[batch].reshape(-1, n_filters))
+    if bias is not None:
+        out += np.asarray(bias, dtype=dtype)
+    # (N, out_h, out_w, F) is the GEMM's natural layout; expose it as NCHW
+    return out.transpose(0, 3, 1, 2)
+
+
+def conv2d_backward(
+    grad_output: Any,
+    x: Any,
+    weight: Any,
+    stride: int = 1,
+    padding: int = 0,
+    max_memory_mb: float = DEFAULT_MAX_MEMORY_MB,
+) -> tuple[Array, Array, Array]:
+    """
+    Gradients of ``conv2d`` with respect to its input, weight and bias.
+
+    With ``cols = im2col(x)`` and ``out = cols @ W``: ``dW = cols.T @ dout``,
+    ``db = sum(dout)`` and ``dx = col2im(dout @ W.T)``. The column matrix is
+    recomputed per chunk instead of being kept from the forward pass.
+
+    Args:
+        grad_output: Gradient of the loss w.r.t. the output, (N, F, out_h, out_w)
+        x: Input of the forward pass
+        weight: Kernels of the forward pass
+        stride: Stride of the forward pass
+        padding: Padding of the forward pass
+        max_memory_mb: Budget of the column matrix
+
+    Returns:
+        (grad_x, grad_weight, grad_bias)
+    """
+    x = _check_input(x)
+    dtype = _float_dtype(x, weight, grad_output)
+    x = x.astype(dtype, copy=False)
+    weight = np.asarray(weight, dtype=dtype)
+    n_filters, _, kh, kw = weight.shape
+    # (N, out_h, out_w, F), matching the row order of the column matrix
+    dout = np.asarray(grad_output, dtype=dtype).transpose(0, 2, 3, 1)
+    out_h, out_w = dout.shape[1:3]
+    kernels = weight.reshape(n_filters, -1)  # (F, C * kh * kw)
+    grad_x = np.empty_like(x)
+    grad_kernels = np.zeros_like(kernels)
+    bytes_per_image = out_h * out_w * kernels.shape[1] * x.itemsize
+    for batch in _chunks(len(x), bytes_per_image, max_memory_mb):
+        cols = im2col(x[batch], (kh, kw), stride, padding)
+        dout_rows = dout[batch].reshape(-1, n_filters)
+        grad_kernels += dout_rows.T @ cols
+        grad_x[batch] = col2im(
+            dout_rows @ kernels, x[batch].shape, (kh, kw), stride, padding
+        )
+    grad_bias = dout.sum(axis=(0, 1, 2))
+    return grad_x, grad_kernels.reshape(weight.shape), grad_bias
+
+
+def conv2d_naive(
+    x: Any, weight: Any, bias: Any = None, stride: int = 1, padding: int = 0
+) -> Array:
+    """Loop-by-loop reference of ``conv2d`` (for teaching and testing)."""
+    x = _check_input(x)
+    weight = np.asarray(weight)
+    x = x.astype(_float_dtype(x, weight), copy=False)
+    n_filters, _, kh, kw = weight.shape
+    out_h, out_w = output_shape(x.shape[2], x.shape[3], (kh, kw), stride, padding)
+    if padding:
+        x = np.pad(x, ((0, 0), (0, 0), (padding, padding), (padding, padding)))
+    out = np.zeros((x.shape[0], n_filters, out_h, out_w), dtype=x.dtype)
+    for n in range(x.shape[0]):
+        for f in range(n_filters):
+            for i in range(out_h):
+                for j in range(out_w):
+                    field = x[
+                        n, :, i * stride : i * stride + kh, j * stride : j * stride + kw
+                    ]
+                    out[n, f, i, j] = np.sum(field * weight[f])
+            if bias is not None:
+                out[n, f] += bias[f]
+    return out
+
+
+def max_pool2d(
+    x: Any,
+    kernel_size: int | tuple[int, int] = 2,
+    stride: int | tuple[int, int] | None = None,
+) -> Array:
+    """
+    Max pooling over (kh, kw) windows, computed on a strided view.
+
+    Args:
+        x: Input of shape (N, C, H, W)
+        kernel_size: Window size
+        stride: Step between windows (default: the window size, so windows
+            do not overlap)
+    """
+    x = _check_input(x)
+    kernel = _pair(kernel_size)
+    windows = _windows(x, kernel, stride or kernel, 0)
+    pooled: Array = windows.max(axis=(4, 5))
+    return pooled
+
+
+def max_pool2d_backward(
+    grad_output: Any,
+    x: Any,
+    kernel_size: int | tuple[int, int] = 2,
+    stride: int | tuple[int, int] | None = None,
+) -> Array:
+    """
+    Gradient of ``max_pool2d`` w.r.t. its input.
+
+    Each output gradient goes to the position of its window's maximum (the
+    first one on ties, as in PyTorch).
+    """
+    x = _check_input(x)
+    kh, kw = _pair(kernel_size)
+    sh, sw = _pair(stride or (kh, kw))
+    windows = _windows(x, (kh, kw), (sh, sw), 0)
+    n, c, out_h, out_w = windows.shape[:4]
+    argmax = windows.reshape(n, c, out_h, out_w, kh * kw).argmax(axis=4)
+    dtype = _float_dtype(x, grad_output)
+    grad_output = np.asarray(grad_output, dtype=dtype)
+    grad_x: Array = np.zeros(x.shape, dtype=dtype)
+    for i in range(kh):
+        for j in range(kw):
+            grad_x[:, :, i : i + sh * out_h : sh, j : j + sw * out_w : sw] += np.where(
+                argmax == i * kw + j, grad_output, 0
+            )
+    return grad_x
+
+
+def avg_pool2d(
+    x: Any,
+    kernel_size: int | tuple[int, int] = 2,
+    stride: int | tuple[int, int] | None = None,
+) -> Array:
+    """Average pooling over (kh, kw) windows (see ``max_pool2d``)."""
+    x = _check_input(x)
+    kernel = _pair(kernel_size)
+    windows = _windows(x, kernel, stride or kernel, 0)
+    pooled: Array = windows.mean(axis=(4, 5), dtype=_float_dtype(x))
+    return pooled
+
+
+def avg_pool2d_backward(
+    grad_output: Any,
+    x: Any,
+    kernel_size: int | tuple[int, int] = 2,
+    stride: int | tuple[int, int] | None = None,
+) -> Array:
+    """Gradient of ``avg_pool2d``: each output spreads evenly over its window."""
+    x = _check_input(x)
+    kh, kw = _pair(kernel_size)
+    sh, sw = _pair(stride or (kh, kw))
+    dtype = _float_dtype(x, grad_output)
+    grad_output = np.asarray(grad_output, dtype=dtype) / (kh * kw)
+    out_h, out_w = grad_output.shape[2:]
+    grad_x: Array = np.zeros(x.shape, dtype=dtype)
+    for i in range(kh):
+        for j in range(kw):
+            grad_x[
+                :, :, i : i + sh * out_h : sh, j : j + sw * out_w : sw
+            ] += grad_output
+    return grad_x
@@ -0,0 +1,320 @@
+"""Blocked brute-force k-nearest neighbors with a one-search k sweep.
+
+Distances are computed for blocks of query rows at a time, so the working
+set stays cache-sized: euclidean distances use one BLAS matrix product per
+block (``|q|^2 - 2 q.x + |x|^2``), manhattan and chebyshev are reduced one
+feature at a time. Neighbors are ordered by (distance, training index), so
+equal distances always resolve to the lower training index, and vote ties
+go to the smallest class label (as in scikit-learn).
+
+Because the neighbor lists are sorted, a single search at the largest k
+gives the neighbors for every smaller k; ``knn_k_sweep`` scores a whole
+list of k values from that one search.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+METRICS = ("euclidean", "manhattan", "chebyshev")
+
+# Bytes of distance matrix per block. The BLAS path amortizes its call
+# overhead over larger blocks; the per-feature loops of the other metrics
+# make several passes over the block and are fastest when it fits in L2.
+_BLOCK_BYTES = {"euclidean": 1 << 21, "manhattan": 1 << 19, "chebyshev": 1 << 19}
+
+FloatArray = np.ndarray[Any, np.dtype[np.float64]]
+IntArray = np.ndarray[Any, np.dtype[np.intp]]
+
+
+def _block_rows(n_train: int, metric: str, block_size: int | None) -> int:
+    if block_size is not None:
+        return max(1, block_size)
+    return max(1, _BLOCK_BYTES[metric] // (8 * max(n_train, 1)))
+
+
+def _pairwise_block(
+    Q: FloatArray, XT: FloatArray, X_sq: FloatArray | None, metric: str
+) -> FloatArray:
+    """Distances between a block of queries and all training rows.
+
+    ``XT`` is the training data transposed to (n_features, n_train), so each
+    feature is contiguous. For euclidean the *squared* BLAS estimate is
+    returned; it only selects candidates, which are then measured exactly.
+    """
+    if metric == "euclidean":
+        d2: FloatArray = Q @ XT
+        d2 *= -2.0
+        d2 += np.einsum("ij,ij->i", Q, Q)[:, None]
+        if X_sq is not None:
+            d2 += X_sq[None, :]
+        np.maximum(d2, 0.0, out=d2)
+        return d2
+    dist = np.zeros((Q.shape[0], XT.shape[1]))
+    diff = np.empty_like(dist)
+    for j in range(Q.shape[1]):
+        np.subtract(Q[:, j, None], XT[j][None, :], out=diff)
+        np.abs(diff, out=diff)
+        if metric == "manhattan":
+            dist += diff
+        else:
+            np.maximum(dist, diff, out=dist)
+    return dist
+
+
+def _exact_distances(
+    Q: FloatArray, X: FloatArray, index: IntArray, metric: str
+) -> FloatArray:
+    """Distances from each query row to the training rows in ``index``."""
+    diff = np.abs(Q[:, None, :] - X[index])
+    dist: FloatArray
+    if metric == "euclidean":
+        dist = np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+    elif metric == "manhattan":
+        dist = diff.sum(axis=2)
+    else:
+        dist = diff.max(axis=2)
+    return dist
+
+
+def _sort_candidates(dist: FloatArray, index: IntArray) -> tuple[FloatArray, IntArray]:
+    """Sort each row by (distance, training index)."""
+    order = np.lexsort((index, dist), axis=-1)
+    rows = np.arange(dist.shape[0])[:, None]
+    return dist[rows, order], index[rows, order]
+
+
+def kneighbors(
+    X_train: Any,
+    X_query: Any,
+    n_neighbors: int,
+    metric: str = "euclidean",
+    block_size: int | None = None,
+) -> tuple[FloatArray, IntArray]:
+    """
+    Find the ``n_neighbors`` nearest training rows of every query row.
+
+    Args:
+        X_train: Training data (n_train, n_features)
+        X_query: Query data (n_query, n_features)
+        n_neighbors: Number of neighbors per query
+        metric: "euclidean", "manhattan" or "chebyshev"
+        block_size: Query rows per block (default: sized to the cache)
+
+    Returns:
+        (distances, indices), each (n_query, n_neighbors), sorted by
+        distance and then by training index
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got '{metric}'")
+    X = np.ascontiguousarray(X_train, dtype=np.float64)
+    Q = np.ascontiguousarray(X_query, dtype=np.float64)
+    if X.ndim != 2 or Q.ndim != 2 or X.shape[1] != Q.shape[1]:
+        raise ValueError("X_train and X_query must be 2D with the same n_features")
+    n_train = X.shape[0]
+    if not 1 <= n_neighbors <= n_train:
+        raise ValueError(f"n_neighbors must be in [1, {n_train}], got {n_neighbors}")
+
+    k = n_neighbors
+    XT = np.ascontiguousarray(X.T)
+    X_sq = np.einsum("ij,ij->i", X, X) if metric == "euclidean" else None
+    # Rounding bound of the BLAS expansion, so no true neighbor is lost
+    tolerance = 8 * X.shape[1] * np.finfo(np.float64).eps
+    x_sq_max = float(X_sq.max()) if X_sq is not None else 0.0
+    distances = np.empty((Q.shape[0], k))
+    indices = np.empty((Q.shape[0], k), dtype=np.intp)
+
+    step = _block_rows(n_train, metric, block_size)
+    for start in range(0, Q.shape[0], step):
+        block = Q[start : start + step]
+        dist = _pairwise_block(block, XT, X_sq, metric)
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        kth = np.take_along_axis(dist, nearest, axis=1).max(axis=1)
+        if metric == "euclidean":
+            scale = np.einsum("ij,ij->i", block, block) + x_sq_max + 1.0
+            kth = kth + tolerance * scale
+        mask = dist <= kth[:, None]
+
+        # Usually exactly k training rows are within the k-th distance and
+        # argpartition already found them; rows with more (ties at the k-th
+        # neighbor, or within BLAS rounding of it) are resolved one by one.
+        simple = mask.sum(axis=1) == k
+        rows = np.nonzero(simple)[0]
+        exact = _exact_distances(block[rows], X, nearest[rows], metric)
+        d, i = _sort_candidates(exact, nearest[rows])
+        distances[start + rows], indices[start + rows] = d, i
+        for row in np.nonzero(~simple)[0]:
+            cand = np.nonzero(mask[row])[0][None, :]
+            exact = _exact_distances(block[row, None], X, cand, metric)
+            d, i = _sort_candidates(exact, cand)
+            distances[start + row], indices[start + row] = d[0, :k], i[0, :k]
+    return distances, indices
+
+
+def _vote_weights(distances: FloatArray, weights: str) -> FloatArray:
+    if weights == "uniform":
+        return np.ones_like(distances)
+    if weights != "distance":
+        raise ValueError(f"weights must be 'uniform' or 'distance', got '{weights}'")
+    with np.errstate(divide="ignore"):
+        inverse = 1.0 / distances
+    # Exact matches take all the weight, as in scikit-learn
+    zero_rows = distances[:, 0] == 0
+    inverse[zero_rows] = (distances[zero_rows] == 0).astype(np.float64)
+    return inverse
+
+
+def sweep_predictions(
+    neighbor_codes: IntArray,
+    neighbor_distances: FloatArray,
+    k_values: Sequence[int],
+    n_classes: int,
+    weights: str = "uniform",
+) -> IntArray:
+    """
+    Majority vote for several k from one sorted neighbor list.
+
+    Args:
+        neighbor_codes: Class codes (0..n_classes-1) of the sorted neighbors
+        neighbor_distances: Matching distances
+        k_values: Numbers of neighbors to vote with
+        n_classes: Number of classes
+        weights: "uniform" or "distance"
+
+    Returns:
+        Predicted class codes, shape (len(k_values), n_query); ties go to
+        the smallest code
+    """
+    n_query, max_k = neighbor_codes.shape
+    if not k_values or min(k_values) < 1 or max(k_values) > max_k:
+        raise ValueError(f"k_values must be in [1, {max_k}]")
+    vote = _vote_weights(neighbor_distances, weights)
+    tally = np.zeros((n_query, n_classes))
+    rows = np.arange(n_query)
+    wanted = np.asarray(k_values)
+    predictions = np.empty((len(k_values), n_query), dtype=np.intp)
+    for k in range(1, int(wanted.max()) + 1):
+        tally[rows, neighbor_codes[:, k - 1]] += vote[:, k - 1]
+        if np.any(wanted == k):
+            predictions[wanted == k] = tally.argmax(axis=1)
+    return predictions
+
+
+@dataclass
+class KSweepResult:
+    """Train and test accuracy of KNN for each k."""
+
+    k_values: list[int]
+    train_accuracy: FloatArray
+    test_accuracy: FloatArray
+
+    @property
+    def best_k(self) -> int:
+        """k with the best test accuracy (the smallest k on ties)."""
+        return self.k_values[int(np.argmax(self.test_accuracy))]
+
+
+def knn_k_sweep(
+    X_train: Any,
+    y_train: Any,
+    X_test: Any,
+    y_test: Any,
+    k_values: Sequence[int] = (1, 3, 5, 7, 9, 15, 25, 35),
+    metric: str = "euclidean",
+    weights: str = "uniform",
+    block_size: int | None = None,
+) -> KSweepResult:
+    """
+    Score KNN for every k with one neighbor search per data split.
+
+    Gives the same accuracies as fitting ``KNeighborsClassifier`` once per
+    k and calling ``score`` on the train and test sets (the training score
+    counts each point as its own neighbor, like ``score(X_train, y_train)``).
+
+    Args:
+        X_train: Training features
+        y_train: Training labels
+        X_test: Test features
+        y_test: Test labels
+        k_values: Numbers of neighbors to evaluate
+        metric: "euclidean", "manhattan" or "chebyshev"
+        weights: "uniform" or "distance"
+        block_size: Query rows per distance block
+
+    Returns:
+        KSweepResult with one train and test accuracy per k
+    """
+    k_values = [int(k) for k in k_values]
+    classes, codes = np.unique(np.asarray(y_train), return_inverse=True)
+    accuracies = []
+    for X_query, y_query in ((X_train, y_train), (X_test, y_test)):
+        distances, indices = kneighbors(
+            X_train, X_query, max(k_values), metric=metric, block_size=block_size
+        )
+        predicted = sweep_predictions(
+            codes[indices], distances, k_values, len(classes), weights=weights
+        )
+        accuracies.append((classes[predicted] == np.asarray(y_query)).mean(axis=1))
+    return KSweepResult(k_values, accuracies[0], accuracies[1])
+
+
+class BlockedKNNClassifier(ClassifierMixin, BaseEstimator):  # type: ignore[misc]
+    """
+    KNN classifier on top of ``kneighbors``; scikit-learn compatible.
+
+    Args:
+        n_neighbors: Number of neighbors that vote
+        metric: "euclidean", "manhattan" or "chebyshev"
+        weights: "uniform" or "distance"
+        block_size: Query rows per distance block (None: sized automatically)
+    """
+
+    def __init__(
+        self,
+        n_neighbors: int = 5,
+        metric: str = "euclidean",
+        weights: str = "uniform",
+        block_size: int | None = None,
+    ) -> None:
+        self.n_neighbors = n_neighbors
+        self.metric = metric
+        self.weights = weights
+        self.block_size = block_size
+
+    def fit(self, X: Any, y: Any) -> "BlockedKNNClassifier":
+        """Store the training data."""
+        self._fit_X = np.ascontiguousarray(X, dtype=np.float64)
+        self.classes_, self._codes = np.unique(np.asarray(y), return_inverse=True)
+        self.n_features_in_ = self._fit_X.shape[1]
+        return self
+
+    def kneighbors(
+        self, X: Any, n_neighbors: int | None = None
+    ) -> tuple[FloatArray, IntArray]:
+        """Distances and indices of the nearest training rows."""
+        return kneighbors(
+            self._fit_X,
+            X,
+            n_neighbors or self.n_neighbors,
+            metric=self.metric,
+            block_size=self.block_size,
+        )
+
+    def predict_sweep(self, X: Any, k_values: Sequence[int]) -> np.ndarray[Any, Any]:
+        """Predictions for several k at once, shape (len(k_values), n_samples)."""
+        distances, indices = self.kneighbors(X, max(k_values))
+        codes = sweep_predictions(
+            self._codes[indices],
+            distances,
+            k_values,
+            len(self.classes_),
+            weights=self.weights,
+        )
+        return self.classes_[codes]  # type: ignore[no-any-return]
+
+    def predict(self, X: Any) -> np.ndarray[Any, Any]:
+        """Predicted class of each row."""
+        return self.predict_sweep(X, [self.n_neighbors])[0]  # type: ignore[no-any-return]
@@ -0,0 +1,389 @@
+"""Vectorized NumPy multilayer perceptron with preallocated work buffers.
+
+Each mini-batch runs forward and backward as one matrix product per layer.
+Every intermediate array (batch inputs, activations, deltas, gradients and
+optimizer state) is allocated once in ``fit`` and then written in place
+with ``out=`` arguments, so a training step allocates no new arrays. The
+last, smaller batch of an epoch uses leading-row views of the same buffers.
+
+Computation is float32 by default, which halves memory traffic compared to
+scikit-learn's float64 ``MLPClassifier``. Training mirrors its ``adam`` and
+``sgd`` solvers (Glorot initialization, L2 penalty ``alpha``, stopping when
+the training loss stops improving by ``tol`` for ``n_iter_no_change``
+epochs). Optimizers are small classes; any subclass of ``Optimizer`` can be
+passed as ``optimizer``.
+"""
+
+import copy
+from abc import ABC, abstractmethod
+from typing import Any
+
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+ACTIVATIONS = ("relu", "tanh", "logistic", "identity")
+
+Array = np.ndarray[Any, Any]
+
+
+def _activate(name: str, z: Array) -> None:
+    """Apply the activation function to ``z`` in place."""
+    if name == "relu":
+        np.maximum(z, 0, out=z)
+    elif name == "tanh":
+        np.tanh(z, out=z)
+    elif name == "logistic":
+        # 1 / (1 + exp(-z)), written in place
+        np.negative(z, out=z)
+        np.exp(z, out=z)
+        z += 1
+        np.reciprocal(z, out=z)
+
+
+def _activation_backward(name: str, a: Array, delta: Array, scratch: Array) -> None:
+    """Multiply ``delta`` in place by the derivative, given the output ``a``."""
+    if name == "relu":
+        np.greater(a, 0, out=scratch)
+    elif name == "tanh":
+        # 1 - a^2
+        np.multiply(a, a, out=scratch)
+        np.subtract(1, scratch, out=scratch)
+    elif name == "logistic":
+        # a * (1 - a)
+        np.subtract(1, a, out=scratch)
+        scratch *= a
+    else:
+        return
+    delta *= scratch
+
+
+def _softmax(z: Array, row: Array) -> None:
+    """Row-wise softmax of ``z`` in place; ``row`` is a (n, 1) work buffer."""
+    np.max(z, axis=1, keepdims=True, out=row)
+    z -= row
+    np.exp(z, out=z)
+    np.sum(z, axis=1, keepdims=True, out=row)
+    z /= row
+
+
+class Optimizer(ABC):
+    """
+    Base class of the optimizers; updates parameters in place.
+
+    ``init`` is called once per fit with the parameter arrays, and ``step``
+    once per mini-batch with gradients of the same shapes.
+    """
+
+    def init(self, params: list[Array]) -> None:  # noqa: B027 (optional hook)
+        """Allocate the state for ``params`` (nothing by default)."""
+
+    @abstractmethod
+    def step(self, params: list[Array], grads: list[Array]) -> None:
+        """Update ``params`` in place from ``grads``."""
+
+
+class SGD(Optimizer):
+    """
+    Stochastic gradient descent with (Nesterov) momentum.
+
+    Args:
+        learning_rate: Step size
+        momentum: Momentum factor (0: plain SGD)
+        nesterov: Use Nesterov's momentum
+    """
+
+    def __init__(
+        self, learning_rate: float = 0.001, momentum: float = 0.9, nesterov: bool = True
+    ) -> None:
+        self.learning_rate = learning_rate
+        self.momentum = momentum
+        self.nesterov = nesterov
+
+    def init(self, params: list[Array]) -> None:
+        self._velocities = [np.zeros_like(p) for p in params]
+        self._scratch = [np.empty_like(p) for p in params]
+
+    def step(self, params: list[Array], grads: list[Array]) -> None:
+        for p, g, v, tmp in zip(
+            params, grads, self._velocities, self._scratch, strict=True
+        ):
+            # v = momentum * v - lr * g
+            v *= self.momentum
+            np.multiply(g, self.learning_rate, out=tmp)
+            v -= tmp
+            if self.nesterov:
+                # p += momentum * v - lr * g
+                p -= tmp
+                np.multiply(v, self.momentum, out=tmp)
+                p += tmp
+            else:
+                p += v
+
+
+class Adam(Optimizer):
+    """
+    Adam, with the bias correction folded into the step size.
+
+    Args:
+        learning_rate: Step size
+        beta_1: Decay of the first moment
+        beta_2: Decay of the second moment
+        epsilon: Numerical stability term
+    """
+
+    def __init__(
+        self,
+        learning_rate: float = 0.001,
+        beta_1: float = 0.9,
+        beta_2: float = 0.999,
+        epsilon: float = 1e-8,
+    ) -> None:
+        self.learning_rate = learning_rate
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+
+    def init(self, params: list[Array]) -> None:
+        self._t = 0
+        self._m = [np.zeros_like(p) for p in params]
+        self._v = [np.zeros_like(p) for p in params]
+        self._scratch = [np.empty_like(p) for p in params]
+
+    def step(self, params: list[Array], grads: list[Array]) -> None:
+        self._t += 1
+        lr = (
+            self.learning_rate
+            * np.sqrt(1 - self.beta_2**self._t)
+            / (1 - self.beta_1**self._t)
+        )
+        for p, g, m, v, tmp in zip(
+            params, grads, self._m, self._v, self._scratch, strict=True
+        ):
+            # m = b1 * m + (1 - b1) * g
+            m *= self.beta_1
+            np.multiply(g, 1 - self.beta_1, out=tmp)
+            m += tmp
+            # v = b2 * v + (1 - b2) * g^2
+            v *= self.beta_2
+            np.multiply(g, g, out=tmp)
+            tmp *= 1 - self.beta_2
+            v += tmp
+            # p -= lr * m / (sqrt(v) + eps)
+            np.sqrt(v, out=tmp)
+            tmp += self.epsilon
+            np.divide(m, tmp, out=tmp)
+            tmp *= lr
+            p -= tmp
+
+
+_OPTIMIZERS: dict[str, type[Adam] | type[SGD]] = {"adam": Adam, "sgd": SGD}
+
+
+class NumpyMLPClassifier(ClassifierMixin, BaseEstimator):  # type: ignore[misc]
+    """
+    Multilayer perceptron classifier trained with mini-batches in NumPy.
+
+    Args:
+        hidden_layer_sizes: Neurons of each hidden layer
+        activation: "relu", "tanh", "logistic" or "identity"
+        optimizer: "adam", "sgd" or an ``Optimizer`` instance
+        learning_rate_init: Step size of "adam"/"sgd"
+        alpha: L2 penalty
+        batch_size: Mini-batch size ("auto": min(200, n_samples))
+        max_iter: Maximum number of epochs
+        tol: Minimum loss improvement that counts as progress
+        n_iter_no_change: Epochs without progress before stopping
+        shuffle: Shuffle the samples every epoch
+        random_state: Seed of initialization and shuffling
+        dtype: Floating point type of weights and buffers
+
+    Example:
+        >>> mlp = NumpyMLPClassifier(hidden_layer_sizes=(20, 10), max_iter=500)
+        >>> mlp.fit(X_train_scaled, y_train).score(X_test_scaled, y_test)
+    """
+
+    def __init__(
+        self,
+        hidden_layer_sizes: tuple[int, ...] = (100,),
+        activation: str = "relu",
+        optimizer: str | Optimizer = "adam",
+        learning_rate_init: float = 0.001,
+        alpha: float = 0.0001,
+        batch_size: int | str = "auto",
+        max_iter: int = 200,
+        tol: float = 1e-4,
+        n_iter_no_change: int = 10,
+        shuffle: bool = True,
+        random_state: int | None = None,
+        dtype: Any = np.float32,
+    ) -> None:
+        self.hidden_layer_sizes = hidden_layer_sizes
+        self.activation = activation
+        self.optimizer = optimizer
+        self.learning_rate_init = learning_rate_init
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.tol = tol
+        self.n_iter_no_change = n_iter_no_change
+        self.shuffle = shuffle
+        self.random_state = random_state
+        self.dtype = dtype
+
+    def _make_optimizer(self) -> Optimizer:
+        if isinstance(self.optimizer, Optimizer):
+            # The instance passed by the user keeps no training state
+            return copy.deepcopy(self.optimizer)
+        if self.optimizer not in _OPTIMIZERS:
+            raise ValueError(
+                f"optimizer must be one of {tuple(_OPTIMIZERS)} or an Optimizer, "
+                f"got '{self.optimizer}'"
+            )
+        return _OPTIMIZERS[self.optimizer](learning_rate=self.learning_rate_init)
+
+    def _init_params(self, layer_sizes: list[int], rng: np.random.Generator) -> None:
+        # Glorot uniform initialization, as in scikit-learn
+        factor = 2.0 if self.activation == "logistic" else 6.0
+        self.coefs_: list[Array] = []
+        self.intercepts_: list[Array] = []
+        for fan_in, fan_out in zip(layer_sizes[:-1], layer_sizes[1:], strict=True):
+            bound = np.sqrt(factor / (fan_in + fan_out))
+            self.coefs_.append(
+                rng.uniform(-bound, bound, (fan_in, fan_out)).astype(self.dtype)
+            )
+            self.intercepts_.append(
+                rng.uniform(-bound, bound, fan_out).astype(self.dtype)
+            )
+
+    def _forward(self, activations: list[Array], row: Array) -> None:
+        """Fill ``activations[1:]`` from ``activations[0]`` in place."""
+        last = len(self.coefs_) - 1
+        for i, (W, b) in enumerate(zip(self.coefs_, self.intercepts_, strict=True)):
+            out = activations[i + 1]
+            np.matmul(activations[i], W, out=out)
+            out += b
+            if i < last:
+                _activate(self.activation, out)
+            else:
+                _softmax(out, row[: len(out)])
+
+    def fit(self, X: Any, y: Any) -> "NumpyMLPClassifier":
+        """Train on ``X``, ``y`` with mini-batches."""
+        if self.activation not in ACTIVATIONS:
+            raise ValueError(
+                f"activation must be one of {ACTIVATIONS}, got '{self.activation}'"
+            )
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        self.classes_, codes = np.unique(np.asarray(y), return_inverse=True)
+        n_samples, self.n_features_in_ = X.shape
+        n_classes = len(self.classes_)
+        Y = np.zeros((n_samples, n_classes), dtype=self.dtype)
+        Y[np.arange(n_samples), codes] = 1
+
+        rng = np.random.default_rng(self.random_state)
+        layer_sizes = [self.n_features_in_, *self.hidden_layer_sizes, n_classes]
+        self._init_params(layer_sizes, rng)
+        params = [*self.coefs_, *self.intercepts_]
+        optimizer = self._make_optimizer()
+        optimizer.init(params)
+
+        batch = (
+            min(200, n_samples)
+            if self.batch_size == "auto"
+            else min(int(self.batch_size), n_samples)
+        )
+        # Work buffers, reused by every step of every epoch
+        activations = [
+            np.empty((batch, size), dtype=self.dtype) for size in layer_sizes
+        ]
+        deltas = [np.empty((batch, size), dtype=self.dtype) for size in layer_sizes[1:]]
+        derivatives = [np.empty_like(a) for a in activations[1:-1]]
+        row = np.empty((batch, 1), dtype=self.dtype)
+        Y_batch = np.empty((batch, n_classes), dtype=self.dtype)
+        scratch = np.empty((batch, n_classes), dtype=self.dtype)
+        coef_grads = [np.empty_like(W) for W in self.coefs_]
+        intercept_grads = [np.empty_like(b) for b in self.intercepts_]
+        grads = [*coef_grads, *intercept_grads]
+        penalty = [np.empty_like(W) for W in self.coefs_]
+        order = np.arange(n_samples)
+
+        self.loss_curve_: list[float] = []
+        best_loss = np.inf
+        no_improvement = 0
+        self.n_iter_ = 0
+        for _ in range(self.max_iter):
+            if self.shuffle:
+                rng.shuffle(order)
+            epoch_loss = 0.0
+            for start in range(0, n_samples, batch):
+                index = order[start : start + batch]
+                m = len(index)
+                acts = [a[:m] for a in activations]
+                np.take(X, index, axis=0, out=acts[0])
+                np.take(Y, index, axis=0, out=Y_batch[:m])
+                self._forward(acts, row)
+
+                # Cross-entropy of the batch, plus the L2 penalty
+                probs = acts[-1]
+                np.clip(probs, 1e-7, 1.0, out=scratch[:m])
+                np.log(scratch[:m], out=scratch[:m])
+                scratch[:m] *= Y_batch[:m]
+                loss = -float(scratch[:m].sum()) / m
+                loss += (
+                    0.5
+                    * self.alpha
+                    * sum(float(np.vdot(W, W)) for W in self.coefs_)
+                    / m
+                )
+                epoch_loss += loss * m
+
+                # Backward pass: the softmax + cross-entropy delta is P - Y
+                delta = deltas[-1][:m]
+                np.subtract(probs, Y_batch[:m], out=delta)
+                delta /= m
+                for i in range(len(self.coefs_) - 1, -1, -1):
+                    np.matmul(acts[i].T, delta, out=coef_grads[i])
+                    np.multiply(self.coefs_[i], self.alpha / m, out=penalty[i])
+                    coef_grads[i] += penalty[i]
+                    np.sum(delta, axis=0, out=intercept_grads[i])
+                    if i > 0:
+                        previous = deltas[i - 1][:m]
+                        np.matmul(delta, self.coefs_[i].T, out=previous)
+                        _activation_backward(
+                            self.activation, acts[i], previous, derivatives[i - 1][:m]
+                        )
+                        delta = previous
+                optimizer.step(params, grads)
+
+            epoch_loss /= n_samples
+            self.loss_curve_.append(epoch_loss)
+            self.n_iter_ += 1
+            if epoch_loss > best_loss - self.tol:
+                no_improvement += 1
+            else:
+                no_improvement = 0
+            best_loss = min(best_loss, epoch_loss)
+            if no_improvement > self.n_iter_no_change:
+                break
+        self.loss_ = self.loss_curve_[-1]
+        return self
+
+    def predict_proba(self, X: Any, batch_size: int = 4096) -> Array:
+        """Class probabilities, computed in batches of ``batch_size`` rows."""
+        X = np.asarray(X, dtype=self.dtype)
+        sizes = [self.n_features_in_, *(b.shape[0] for b in self.intercepts_)]
+        rows = min(batch_size, max(len(X), 1))
+        buffers = [np.empty((rows, size), dtype=self.dtype) for size in sizes]
+        row = np.empty((rows, 1), dtype=self.dtype)
+        proba = np.empty((len(X), sizes[-1]), dtype=self.dtype)
+        for start in range(0, len(X), rows):
+            chunk = X[start : start + rows]
+            acts = [b[: len(chunk)] for b in buffers]
+            acts[0][...] = chunk
+            self._forward(acts, row)
+            proba[start : start + len(chunk)] = acts[-1]
+        return proba
+
+    def predict(self, X: Any) -> Array:
+        """Predicted class of each row."""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]  # type: ignore[no-any-return]
@@ -1,20 +1,51 @@
 """Utils module."""
 
+from .datasets import iter_chunks, list_datasets, load_dataset, register_dataset
 from .io import load_json, load_yaml, save_json, save_yaml
+from .metrics import ConfusionMatrixAccumulator
+from .mirror import DatasetMirror
 from .plotting import (
+    FigureJob,
+    export_figures,
     plot_classification_results,
+    plot_confusion_matrix,
+    plot_decision_boundary,
     plot_regression_results,
     setup_plotting_style,
 )
-from .seeds import fix_random_seeds
+from .seeds import (
+    RNGStream,
+    fix_random_seeds,
+    map_with_streams,
+    preserve_random_state,
+    rng_stream,
+    spawn_generators,
+    spawn_streams,
+)
 
 __all__ = [
+    "iter_chunks",
+    "list_datasets",
+    "load_dataset",
+    "register_dataset",
     "load_json",
     "load_yaml",
     "save_json",
     "save_yaml",
+    "DatasetMirror",
+    "ConfusionMatrixAccumulator",
+    "FigureJob",
+    "export_figures",
     "plot_classification_results",
+    "plot_confusion_matrix",
+    "plot_decision_boundary",
     "plot_regression_results",
     "setup_plotting_style",
     "fix_random_seeds",
+    "RNGStream",
+    "map_with_streams",
+    "preserve_random_state",
+    "rng_stream",
+    "spawn_generators",
+    "spawn_streams",
 ]
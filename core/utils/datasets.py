@@ -0,0 +1,407 @@
+"""Dataset registry and cached loader for the ML course.
+
+CSV files are parsed once; the parsed columns are downcast to compact dtypes
+and stored as ``.npy`` sidecars next to a small JSON manifest. Later loads
+memory-map those sidecars, so a dataset opens without re-parsing any text.
+Sidecars are keyed by the SHA-256 of the source CSV and are rebuilt whenever
+the CSV changes.
+
+``iter_chunks`` reads tables that do not fit in memory as a stream of
+fixed-size NumPy blocks, for the out-of-core estimators.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+DATASETS_DIR = Path(__file__).resolve().parents[2] / "datasets"
+DEFAULT_CACHE_DIR = DATASETS_DIR / ".cache"
+
+_MANIFEST = "manifest.json"
+_CACHE_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Registry entry describing a CSV dataset."""
+
+    name: str
+    path: Path
+    target: str | None = None
+    description: str = ""
+
+    def resolve(self) -> Path:
+        """Return the absolute path of the source CSV."""
+        return self.path if self.path.is_absolute() else DATASETS_DIR / self.path
+
+
+_REGISTRY: dict[str, DatasetSpec] = {}
+
+
+def register_dataset(
+    name: str,
+    path: Path | str,
+    target: str | None = None,
+    description: str = "",
+    overwrite: bool = False,
+) -> DatasetSpec:
+    """
+    Register a CSV dataset under a short name.
+
+    Args:
+        name: Name used with ``load_dataset``
+        path: CSV path, absolute or relative to the ``datasets/`` folder
+        target: Name of the target column, if any
+        description: Human readable description
+        overwrite: Replace an existing entry with the same name
+
+    Returns:
+        The registered DatasetSpec
+
+    Raises:
+        ValueError: If the name is already registered and overwrite is False
+    """
+    if name in _REGISTRY and not overwrite:
+        raise ValueError(f"Dataset already registered: {name}")
+    spec = DatasetSpec(name, Path(path), target, description)
+    _REGISTRY[name] = spec
+    return spec
+
+
+def get_dataset_spec(name: str) -> DatasetSpec:
+    """Return the registry entry for ``name``."""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        available = ", ".join(sorted(_REGISTRY)) or "(none)"
+        raise KeyError(f"Unknown dataset '{name}'. Available: {available}") from None
+
+
+def list_datasets() -> list[str]:
+    """Return the names of all registered datasets."""
+    return sorted(_REGISTRY)
+
+
+register_dataset(
+    "regression",
+    "synthetic/regression_dataset.csv",
+    target="target",
+    description="Regressão (500 amostras, 5 features)",
+)
+register_dataset(
+    "classification",
+    "synthetic/classification_dataset.csv",
+    target="target",
+    description="Classificação (500 amostras, 8 features, 3 classes)",
+)
+register_dataset(
+    "clustering",
+    "synthetic/clustering_dataset.csv",
+    target="true_cluster",
+    description="Clustering (300 amostras, 2 features, 4 clusters)",
+)
+# Kaggle datasets are materialized into datasets/kaggle by core.utils.mirror.
+register_dataset(
+    "heart",
+    "kaggle/heart.csv",
+    target="HeartDisease",
+    description="Heart Failure Prediction (Kaggle)",
+)
+register_dataset(
+    "weather-aus",
+    "kaggle/weatherAUS.csv",
+    target="RainTomorrow",
+    description="Weather Dataset Australia (Kaggle)",
+)
+
+
+def file_checksum(path: Path | str, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def downcast_series(series: pd.Series) -> np.ndarray[Any, np.dtype[Any]]:
+    """
+    Convert a column to the most compact dtype that preserves its values.
+
+    float64 becomes float32 and integers shrink to the smallest signed type
+    holding their range. Other dtypes are returned unchanged.
+
+    Args:
+        series: Column to convert
+
+    Returns:
+        Numpy array with the compact dtype
+    """
+    values: np.ndarray[Any, np.dtype[Any]] = np.asarray(series.to_numpy())
+    if values.dtype == np.float64:
+        return values.astype(np.float32)
+    if np.issubdtype(values.dtype, np.signedinteger) or np.issubdtype(
+        values.dtype, np.unsignedinteger
+    ):
+        if values.size == 0:
+            return values.astype(np.int8)
+        lo, hi = int(values.min()), int(values.max())
+        compact: tuple[type[np.signedinteger[Any]], ...] = (np.int8, np.int16, np.int32)
+        for dtype in compact:
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return values.astype(dtype)
+    return values
+
+
+def _sidecar_dir(spec: DatasetSpec, cache_dir: Path, checksum: str) -> Path:
+    return cache_dir / f"{spec.name}-{checksum[:16]}"
+
+
+def _write_sidecar(
+    df: pd.DataFrame, target_dir: Path, meta: dict[str, Any]
+) -> dict[str, Any]:
+    """Write one ``.npy`` per column plus the manifest, atomically."""
+    target_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=target_dir.parent, prefix=".tmp-"))
+    columns: list[dict[str, Any]] = []
+    try:
+        for i, column in enumerate(df.columns):
+            series = df[column]
+            entry: dict[str, Any] = {"name": str(column), "file": f"{i:04d}.npy"}
+            if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(
+                series
+            ):
+                values = (
+                    downcast_series(series) if meta["downcast"] else series.to_numpy()
+                )
+            else:
+                # Text columns cannot be memory-mapped; store category codes.
+                categorical = series.astype("category")
+                entry["categories"] = [str(c) for c in categorical.cat.categories]
+                values = downcast_series(pd.Series(categorical.cat.codes))
+            np.save(tmp_dir / entry["file"], np.ascontiguousarray(values))
+            columns.append(entry)
+        manifest = {**meta, "columns": columns}
+        with open(tmp_dir / _MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        if target_dir.exists():
+            shutil.rmtree(target_dir)
+        os.replace(tmp_dir, target_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return manifest
+
+
+def _read_sidecar(target_dir: Path, manifest: dict[str, Any]) -> pd.DataFrame:
+    """Open the sidecar columns as copy-on-write memory maps."""
+    data: dict[str, Any] = {}
+    for entry in manifest["columns"]:
+        values = np.load(target_dir / entry["file"], mmap_mode="c")
+        if "categories" in entry:
+            data[entry["name"]] = pd.Categorical.from_codes(
+                values, categories=entry["categories"]
+            )
+        else:
+            data[entry["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def _load_manifest(target_dir: Path) -> dict[str, Any] | None:
+    try:
+        with open(target_dir / _MANIFEST, encoding="utf-8") as f:
+            manifest: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != _CACHE_FORMAT:
+        return None
+    return manifest
+
+
+def _find_cached(
+    spec: DatasetSpec, cache_dir: Path, source: Path, downcast: bool
+) -> tuple[Path, dict[str, Any]] | None:
+    """Return a sidecar whose recorded size/mtime still match the source."""
+    stat = source.stat()
+    for candidate in cache_dir.glob(f"{spec.name}-*"):
+        manifest = _load_manifest(candidate)
+        if (
+            manifest is not None
+            and manifest["name"] == spec.name
+            and manifest["downcast"] == downcast
+            and manifest["source_size"] == stat.st_size
+            and manifest["source_mtime_ns"] == stat.st_mtime_ns
+        ):
+            return candidate, manifest
+    return None
+
+
+def _prune_stale(spec: DatasetSpec, cache_dir: Path, keep: Path) -> None:
+    for candidate in cache_dir.glob(f"{spec.name}-*"):
+        manifest = _load_manifest(candidate)
+        if candidate != keep and manifest is not None and manifest["name"] == spec.name:
+            shutil.rmtree(candidate, ignore_errors=True)
+
+
+def load_dataset(
+    name: str,
+    cache_dir: Path | str | None = None,
+    downcast: bool = True,
+    return_X_y: bool = False,
+) -> pd.DataFrame | tuple[pd.DataFrame, pd.Series]:
+    """
+    Load a registered dataset, using a memory-mapped sidecar cache.
+
+    The first call parses the CSV and writes the sidecar; later calls only
+    memory-map it. If the CSV size or mtime changed, its checksum is
+    recomputed and the sidecar is rebuilt when the content differs.
+
+    Args:
+        name: Registered dataset name (see ``list_datasets``)
+        cache_dir: Directory for sidecars (defaults to ``datasets/.cache``)
+        downcast: Store float64 as float32 and integers in the smallest type
+        return_X_y: Return ``(X, y)`` split on the registered target column
+
+    Returns:
+        DataFrame with all columns, or ``(X, y)`` if return_X_y is True
+
+    Raises:
+        KeyError: If the dataset is not registered
+        FileNotFoundError: If the source CSV does not exist
+        ValueError: If return_X_y is requested for a dataset without target
+    """
+    spec = get_dataset_spec(name)
+    source = spec.resolve()
+    if not source.exists():
+        raise FileNotFoundError(f"Dataset file not found: {source}")
+    cache_path = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+
+    cached = None
+    if cache_path.exists():
+        cached = _find_cached(spec, cache_path, source, downcast)
+    if cached is None:
+        checksum = file_checksum(source)
+        target_dir = _sidecar_dir(spec, cache_path, checksum)
+        manifest = _load_manifest(target_dir)
+        stat = source.stat()
+        if manifest is None or manifest["downcast"] != downcast:
+            manifest = _write_sidecar(
+                pd.read_csv(source),
+                target_dir,
+                {
+                    "format": _CACHE_FORMAT,
+                    "name": spec.name,
+                    "checksum": checksum,
+                    "downcast": downcast,
+                    "source_size": stat.st_size,
+                    "source_mtime_ns": stat.st_mtime_ns,
+                },
+            )
+        else:
+            # Same content, only touched: refresh the recorded stat.
+            manifest.update(source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+            with open(target_dir / _MANIFEST, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+        _prune_stale(spec, cache_path, target_dir)
+        cached = (target_dir, manifest)
+
+    df = _read_sidecar(*cached)
+    if not return_X_y:
+        return df
+    if spec.target is None:
+        raise ValueError(f"Dataset '{name}' has no target column registered")
+    return df.drop(columns=spec.target), df[spec.target]
+
+
+ChunkSource = Any  # array, DataFrame, .npy/.csv path, dataset name or factory
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def _as_block(
+    chunk: Any, columns: Sequence[str] | None, dtype: Any
+) -> np.ndarray[Any, Any]:
+    if isinstance(chunk, pd.DataFrame):
+        if columns is not None:
+            chunk = chunk[list(columns)]
+        values: np.ndarray[Any, Any] = chunk.to_numpy(dtype=dtype)
+        return values
+    block = np.asarray(chunk, dtype=dtype)
+    return block.reshape(-1, 1) if block.ndim == 1 else block
+
+
+def iter_chunks(
+    source: ChunkSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: Sequence[str] | None = None,
+    dtype: Any = np.float32,
+) -> Iterator[np.ndarray[Any, Any]]:
+    """
+    Read a table as consecutive (rows, features) blocks.
+
+    Only one block is converted at a time, so a memory-mapped array or a
+    CSV larger than RAM can be streamed. Every call starts a new pass over
+    the data.
+
+    Args:
+        source: One of
+            - a NumPy array (or memmap) or a DataFrame;
+            - a path to a ``.npy`` file (memory-mapped) or a CSV file (read
+              with ``pd.read_csv(chunksize=...)``);
+            - the name of a registered dataset (its target column is
+              dropped unless ``columns`` is given);
+            - a callable returning a fresh iterable of arrays or DataFrames
+              (e.g. a generator function over a database cursor).
+        chunk_size: Rows per block (for arrays, DataFrames and CSV files)
+        columns: Columns to keep (DataFrames, CSV files and datasets)
+        dtype: Type of the yielded blocks
+
+    Yields:
+        2D arrays of ``dtype``
+
+    Raises:
+        TypeError: For an iterator or generator object, which could only
+            be read once
+    """
+    if isinstance(source, Iterator):
+        raise TypeError(
+            "Iterators can only be read once; pass a function returning one"
+        )
+    if callable(source) and not isinstance(source, pd.DataFrame):
+        factory: Callable[[], Iterable[Any]] = source
+        for chunk in factory():
+            yield _as_block(chunk, columns, dtype)
+        return
+    if isinstance(source, str | Path):
+        path = Path(source)
+        if path.suffix == ".npy":
+            source = np.load(path, mmap_mode="r")
+        else:
+            if not path.exists() and str(source) in _REGISTRY:
+                spec = _REGISTRY[str(source)]
+                path = spec.resolve()
+                if columns is None and spec.target is not None:
+                    header = pd.read_csv(path, nrows=0).columns
+                    columns = [c for c in header if c != spec.target]
+            reader = pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+            with reader:
+                for frame in reader:
+                    yield _as_block(frame, columns, dtype)
+            return
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_size):
+            yield _as_block(source.iloc[start : start + chunk_size], columns, dtype)
+        return
+    if not hasattr(source, "__len__"):
+        raise TypeError(f"Unsupported data source: {type(source).__name__}")
+    for start in range(0, len(source), chunk_size):
+        yield _as_block(source[start : start + chunk_size], None, dtype)
@@ -6,11 +6,14 @@
 
 import yaml
 
+# libyaml-backed loader is several times faster; fall back to pure Python.
+YAML_LOADER: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_yaml(file_path: Path | str) -> dict[str, Any]:
     """Load YAML file."""
     with open(file_path, encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=YAML_LOADER)
         if isinstance(data, dict):
             return data
         return {}
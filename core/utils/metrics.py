@@ -0,0 +1,238 @@
+"""Streaming metrics for the ML course."""
+
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+_PAIR_SHIFT = np.int64(32)
+_COMPACT_SIZE = 1 << 20
+
+
+class ConfusionMatrixAccumulator:
+    """
+    Confusion matrix updated batch by batch.
+
+    Each batch is turned into combined ``true * n + pred`` indices and
+    counted with ``np.bincount``. With many classes the counts are kept as
+    sparse ``(true, pred) -> count`` pairs instead of a dense n x n array.
+    Accumulators from different workers can be combined with ``merge``.
+
+    Example:
+        >>> acc = ConfusionMatrixAccumulator(n_classes=3)
+        >>> for X_batch, y_batch in batches:
+        ...     acc.update(y_batch, model.predict(X_batch))
+        >>> cm = acc.to_dense()
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[Any] | np.ndarray[Any, np.dtype[Any]] | None = None,
+        n_classes: int | None = None,
+        sparse: bool | None = None,
+        sparse_threshold: int = 512,
+    ) -> None:
+        """
+        Create an empty accumulator.
+
+        Args:
+            labels: Class labels in matrix order; if None, labels must be
+                integers ``0..n_classes-1``
+            n_classes: Number of classes; grows with the data if None
+            sparse: Force (True) or disable (False) the sparse representation;
+                None switches to sparse above ``sparse_threshold`` classes
+            sparse_threshold: Class count above which sparse storage is used
+        """
+        self.labels = None if labels is None else np.asarray(labels)
+        if self.labels is not None:
+            self._sorter = np.argsort(self.labels, kind="stable")
+            self._sorted_labels = self.labels[self._sorter]
+            n_classes = len(self.labels)
+        self.n_classes = n_classes or 0
+        self._fixed_size = n_classes is not None
+        self._auto_sparse = sparse is None
+        self.sparse_threshold = sparse_threshold
+        self.sparse = bool(sparse) or (
+            sparse is None and self.n_classes > sparse_threshold
+        )
+        self.n_samples = 0
+        self._dense = np.zeros(
+            (0, 0) if self.sparse else (self.n_classes,) * 2, dtype=np.int64
+        )
+        self._keys = np.empty(0, dtype=np.int64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._pending: list[tuple[np.ndarray[Any, Any], np.ndarray[Any, Any]]] = []
+        self._pending_size = 0
+
+    def _encode(self, y: Any) -> np.ndarray[Any, np.dtype[np.int64]]:
+        values = np.ravel(np.asarray(y))
+        if self.labels is not None:
+            pos = np.searchsorted(self._sorted_labels, values)
+            pos = np.clip(pos, 0, len(self._sorted_labels) - 1)
+            unknown = self._sorted_labels[pos] != values
+            if np.any(unknown):
+                raise ValueError(f"Unknown labels: {np.unique(values[unknown])[:10]}")
+            return self._sorter[pos].astype(np.int64)
+        if values.size and not np.issubdtype(values.dtype, np.integer):
+            raise ValueError("Labels must be integers when `labels` is not given")
+        codes = values.astype(np.int64)
+        if codes.size and (
+            codes.min() < 0 or (self._fixed_size and codes.max() >= self.n_classes)
+        ):
+            raise ValueError(f"Labels must be in [0, {self.n_classes})")
+        return codes
+
+    def update(self, y_true: Any, y_pred: Any) -> "ConfusionMatrixAccumulator":
+        """
+        Add a batch of true and predicted labels.
+
+        Args:
+            y_true: True labels of the batch
+            y_pred: Predicted labels of the batch
+
+        Returns:
+            The accumulator itself, for chaining
+        """
+        t = self._encode(y_true)
+        p = self._encode(y_pred)
+        if t.shape != p.shape:
+            raise ValueError("y_true and y_pred must have the same length")
+        if t.size == 0:
+            return self
+        self.n_samples += int(t.size)
+
+        observed = int(max(t.max(), p.max())) + 1
+        if observed > self.n_classes:
+            self._grow(observed)
+
+        if self.sparse:
+            keys = (t << _PAIR_SHIFT) | p
+            unique, counts = np.unique(keys, return_counts=True)
+            self._pending.append((unique, counts.astype(np.int64)))
+            self._pending_size += unique.size
+            if self._pending_size > _COMPACT_SIZE:
+                self._compact()
+        else:
+            n = self.n_classes
+            self._dense += np.bincount(t * n + p, minlength=n * n).reshape(n, n)
+        return self
+
+    def _grow(self, n_classes: int) -> None:
+        old = self.n_classes
+        self.n_classes = n_classes
+        if self._auto_sparse and not self.sparse and n_classes > self.sparse_threshold:
+            self._to_sparse_storage()
+        elif not self.sparse:
+            grown = np.zeros((n_classes, n_classes), dtype=np.int64)
+            grown[:old, :old] = self._dense
+            self._dense = grown
+
+    def _to_sparse_storage(self) -> None:
+        rows, cols = np.nonzero(self._dense)
+        self._keys = (rows.astype(np.int64) << _PAIR_SHIFT) | cols
+        self._counts = self._dense[rows, cols]
+        self._dense = np.zeros((0, 0), dtype=np.int64)
+        self.sparse = True
+
+    def _compact(self) -> None:
+        if not self._pending:
+            return
+        keys = np.concatenate([self._keys, *(k for k, _ in self._pending)])
+        counts = np.concatenate([self._counts, *(c for _, c in self._pending)])
+        self._keys, inverse = np.unique(keys, return_inverse=True)
+        self._counts = np.bincount(inverse, weights=counts).astype(np.int64)
+        self._pending.clear()
+        self._pending_size = 0
+
+    def merge(
+        self, other: "ConfusionMatrixAccumulator"
+    ) -> "ConfusionMatrixAccumulator":
+        """Add the counts of another accumulator with the same labels."""
+        rows, cols, counts = other.pairs()
+        if counts.size:
+            if other.n_classes > self.n_classes:
+                self._grow(other.n_classes)
+            if self.sparse:
+                self._pending.append(((rows << _PAIR_SHIFT) | cols, counts))
+                self._pending_size += counts.size
+                self._compact()
+            else:
+                np.add.at(self._dense, (rows, cols), counts)
+        self.n_samples += other.n_samples
+        return self
+
+    def pairs(
+        self,
+    ) -> tuple[
+        np.ndarray[Any, np.dtype[np.int64]],
+        np.ndarray[Any, np.dtype[np.int64]],
+        np.ndarray[Any, np.dtype[np.int64]],
+    ]:
+        """Return the non-zero cells as ``(rows, cols, counts)`` arrays."""
+        if self.sparse:
+            self._compact()
+            mask = np.int64((1 << 32) - 1)
+            return self._keys >> _PAIR_SHIFT, self._keys & mask, self._counts
+        rows, cols = np.nonzero(self._dense)
+        return rows.astype(np.int64), cols.astype(np.int64), self._dense[rows, cols]
+
+    def to_dense(self) -> np.ndarray[Any, np.dtype[np.int64]]:
+        """Return the full ``n_classes x n_classes`` matrix."""
+        if not self.sparse:
+            return self._dense.copy()
+        dense = np.zeros((self.n_classes, self.n_classes), dtype=np.int64)
+        rows, cols, counts = self.pairs()
+        dense[rows, cols] = counts
+        return dense
+
+    def to_sparse(self) -> Any:
+        """Return the matrix as a ``scipy.sparse.csr_matrix``."""
+        from scipy import sparse
+
+        rows, cols, counts = self.pairs()
+        shape = (self.n_classes, self.n_classes)
+        return sparse.csr_matrix((counts, (rows, cols)), shape=shape)
+
+    def accuracy(self) -> float:
+        """Fraction of samples on the diagonal."""
+        rows, cols, counts = self.pairs()
+        return (
+            float(counts[rows == cols].sum() / self.n_samples)
+            if self.n_samples
+            else 0.0
+        )
+
+    def confusion_mass(self) -> np.ndarray[Any, np.dtype[np.int64]]:
+        """Misclassified samples per class, counted as true or as predicted."""
+        rows, cols, counts = self.pairs()
+        off = rows != cols
+        n = self.n_classes
+        mass = np.bincount(rows[off], weights=counts[off], minlength=n)
+        mass += np.bincount(cols[off], weights=counts[off], minlength=n)
+        return mass.astype(np.int64)
+
+    def top_confused(self, k: int) -> np.ndarray[Any, np.dtype[np.intp]]:
+        """Indices of the ``k`` classes involved in most errors, in class order."""
+        mass = self.confusion_mass()
+        k = min(k, self.n_classes)
+        top = np.argsort(-mass, kind="stable")[:k]
+        return np.sort(top)
+
+    def submatrix(
+        self, indices: Sequence[int] | np.ndarray[Any, np.dtype[Any]]
+    ) -> np.ndarray[Any, np.dtype[np.int64]]:
+        """Dense confusion matrix restricted to the given classes."""
+        indices = np.asarray(indices, dtype=np.int64)
+        position = np.full(self.n_classes, -1, dtype=np.int64)
+        position[indices] = np.arange(indices.size)
+        rows, cols, counts = self.pairs()
+        keep = (position[rows] >= 0) & (position[cols] >= 0)
+        sub = np.zeros((indices.size, indices.size), dtype=np.int64)
+        sub[position[rows[keep]], position[cols[keep]]] = counts[keep]
+        return sub
+
+    def class_labels(self) -> np.ndarray[Any, np.dtype[Any]]:
+        """Labels in matrix order (``0..n_classes-1`` if none were given)."""
+        if self.labels is not None:
+            return self.labels
+        return np.arange(self.n_classes)
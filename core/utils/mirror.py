@@ -0,0 +1,376 @@
+"""Offline, content-addressed mirror for external (Kaggle) datasets.
+
+Files are stored once under ``objects/`` named by their SHA-256 digest, and
+each dataset handle (``owner/dataset``) has a JSON manifest under ``refs/``
+listing its files and digests. A shared mirror directory can provision any
+number of machines: datasets are imported once from an archive on disk and
+then materialized into ``datasets/kaggle`` as hardlinks (or copies when the
+mirror lives on another filesystem), with no network access.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tarfile
+import tempfile
+import zipfile
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import IO, Any
+
+from .datasets import DATASETS_DIR, file_checksum
+
+MIRROR_ENV_VAR = "ML_CURSO_MIRROR"
+DEFAULT_MIRROR_DIR = Path.home() / ".cache" / "ml-curso" / "mirror"
+KAGGLE_DIR = DATASETS_DIR / "kaggle"
+
+# Kaggle datasets used by the course exercises and the files each one needs.
+KAGGLE_DATASETS: dict[str, list[str]] = {
+    "fedesoriano/heart-failure-prediction": ["heart.csv"],
+    "jsphyg/weather-dataset-rattle-package": ["weatherAUS.csv"],
+}
+
+_CHUNK_SIZE = 1 << 20
+
+
+class MirrorError(RuntimeError):
+    """Raised when the mirror is missing data or its content is corrupted."""
+
+
+@dataclass
+class MirrorEntry:
+    """Manifest of one dataset handle stored in the mirror."""
+
+    handle: str
+    files: dict[str, str] = field(default_factory=dict)
+    sizes: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary format."""
+        return {
+            "handle": self.handle,
+            "files": {
+                name: {"sha256": digest, "size": self.sizes[name]}
+                for name, digest in sorted(self.files.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MirrorEntry":
+        """Build an entry from its dictionary format."""
+        files = data.get("files", {})
+        return cls(
+            handle=data["handle"],
+            files={name: info["sha256"] for name, info in files.items()},
+            sizes={name: int(info["size"]) for name, info in files.items()},
+        )
+
+
+def default_mirror_dir() -> Path:
+    """Return the mirror directory from ``ML_CURSO_MIRROR`` or the default."""
+    env_dir = os.environ.get(MIRROR_ENV_VAR)
+    return Path(env_dir) if env_dir else DEFAULT_MIRROR_DIR
+
+
+def _check_handle(handle: str) -> None:
+    parts = handle.split("/")
+    if len(parts) != 2 or not all(parts) or any(p in (".", "..") for p in parts):
+        raise ValueError(f"Invalid dataset handle (expected 'owner/dataset'): {handle}")
+
+
+def _safe_member_name(name: str) -> str:
+    """Normalize an archive member name and reject path traversal."""
+    path = PurePosixPath(name.replace("\\", "/"))
+    if path.is_absolute() or ".." in path.parts:
+        raise MirrorError(f"Unsafe path in archive: {name}")
+    return path.as_posix()
+
+
+class DatasetMirror:
+    """Content-addressed local store of dataset files."""
+
+    def __init__(self, root: Path | str | None = None) -> None:
+        """
+        Open (or lazily create) a mirror.
+
+        Args:
+            root: Mirror directory; defaults to ``default_mirror_dir()``
+        """
+        self.root = Path(root) if root is not None else default_mirror_dir()
+        self.objects_dir = self.root / "objects"
+        self.refs_dir = self.root / "refs"
+
+    def object_path(self, digest: str) -> Path:
+        """Return the storage path of the object with the given SHA-256."""
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _ref_path(self, handle: str) -> Path:
+        _check_handle(handle)
+        return self.refs_dir / f"{handle}.json"
+
+    def has(self, handle: str) -> bool:
+        """Return True if the handle has been imported."""
+        return self._ref_path(handle).exists()
+
+    def handles(self) -> list[str]:
+        """Return all imported dataset handles."""
+        if not self.refs_dir.exists():
+            return []
+        return sorted(
+            p.relative_to(self.refs_dir).with_suffix("").as_posix()
+            for p in self.refs_dir.glob("*/*.json")
+        )
+
+    def entry(self, handle: str) -> MirrorEntry:
+        """
+        Return the manifest of an imported dataset.
+
+        Raises:
+            MirrorError: If the handle is not in the mirror
+        """
+        ref_path = self._ref_path(handle)
+        if not ref_path.exists():
+            raise MirrorError(
+                f"Dataset '{handle}' not found in mirror {self.root}. "
+                "Import it first with scripts/mirror_datasets.py import."
+            )
+        with open(ref_path, encoding="utf-8") as f:
+            return MirrorEntry.from_dict(json.load(f))
+
+    def _stage_stream(self, stream: IO[bytes]) -> tuple[str, int, str]:
+        """Hash a stream while copying it to a temporary file in the store."""
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        return digest.hexdigest(), size, tmp_name
+
+    def _commit_object(self, tmp_name: str, digest: str) -> None:
+        """Move a staged file to its object path (dropping it if present)."""
+        target = self.object_path(digest)
+        if target.exists():
+            os.unlink(tmp_name)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Objects are shared through hardlinks: keep them read-only.
+        os.chmod(tmp_name, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp_name, target)
+
+    def import_archive(
+        self,
+        handle: str,
+        source: Path | str,
+        expected: dict[str, str] | None = None,
+    ) -> MirrorEntry:
+        """
+        Import a dataset from a zip/tar archive or a directory on disk.
+
+        Args:
+            handle: Dataset handle, e.g. ``"fedesoriano/heart-failure-prediction"``
+            source: Archive file (``.zip``, ``.tar``, ``.tar.gz``...) or directory
+            expected: Optional mapping of file name to expected SHA-256
+
+        Returns:
+            The manifest written for the handle
+
+        Raises:
+            FileNotFoundError: If the source does not exist
+            MirrorError: If a checksum does not match or an expected file is missing
+        """
+        _check_handle(handle)
+        source_path = Path(source)
+        if not source_path.exists():
+            raise FileNotFoundError(f"Archive not found: {source_path}")
+
+        # Files are staged and only enter the store once every checksum
+        # matches, so a rejected archive leaves no orphan objects behind
+        entry = MirrorEntry(handle)
+        staged: list[tuple[str, str]] = []
+        try:
+            for name, stream in _iter_source(source_path):
+                digest, size, tmp_name = self._stage_stream(stream)
+                staged.append((tmp_name, digest))
+                entry.files[name] = digest
+                entry.sizes[name] = size
+
+            for name, digest in (expected or {}).items():
+                if name not in entry.files:
+                    raise MirrorError(f"File '{name}' missing from {source_path}")
+                if entry.files[name] != digest:
+                    raise MirrorError(
+                        f"Checksum mismatch for '{name}': "
+                        f"expected {digest}, got {entry.files[name]}"
+                    )
+        except BaseException:
+            for tmp_name, _ in staged:
+                os.unlink(tmp_name)
+            raise
+        for tmp_name, digest in staged:
+            self._commit_object(tmp_name, digest)
+
+        ref_path = self._ref_path(handle)
+        ref_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_ref = ref_path.with_suffix(".json.tmp")
+        with open(tmp_ref, "w", encoding="utf-8") as f:
+            json.dump(entry.to_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_ref, ref_path)
+        return entry
+
+    def import_from_kagglehub(self, handle: str) -> MirrorEntry:
+        """
+        Download a dataset once with ``kagglehub`` and import it.
+
+        Only needed on the machine that seeds the shared mirror.
+        """
+        import kagglehub
+
+        return self.import_archive(handle, kagglehub.dataset_download(handle))
+
+    def verify(self, handle: str | None = None) -> list[str]:
+        """
+        Re-hash stored objects and report missing or corrupted files.
+
+        Args:
+            handle: Dataset to verify; all datasets if None
+
+        Returns:
+            List of problems as ``"handle:file"`` strings (empty if all good)
+        """
+        problems = []
+        for current in [handle] if handle else self.handles():
+            entry = self.entry(current)
+            for name, digest in sorted(entry.files.items()):
+                path = self.object_path(digest)
+                if not path.exists() or file_checksum(path) != digest:
+                    problems.append(f"{current}:{name}")
+        return problems
+
+    def materialize(
+        self,
+        handle: str,
+        dest: Path | str | None = None,
+        files: list[str] | None = None,
+        verify: bool = True,
+    ) -> list[Path]:
+        """
+        Place dataset files into ``dest`` as hardlinks to the object store.
+
+        Falls back to copying when hardlinks are not possible (another
+        filesystem, or a filesystem without link support). Files already in
+        place with the right content are left untouched.
+
+        Args:
+            handle: Dataset handle
+            dest: Destination directory (defaults to ``datasets/kaggle``)
+            files: Subset of files to materialize; all files if None
+            verify: Check object checksums before linking
+
+        Returns:
+            Paths of the materialized files
+
+        Raises:
+            MirrorError: If the dataset, a file or an object is missing or corrupted
+        """
+        entry = self.entry(handle)
+        dest_dir = Path(dest) if dest is not None else KAGGLE_DIR
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+        names = files if files is not None else sorted(entry.files)
+        paths = []
+        for name in names:
+            if name not in entry.files:
+                raise MirrorError(f"File '{name}' not in mirrored dataset '{handle}'")
+            digest = entry.files[name]
+            obj = self.object_path(digest)
+            if not obj.exists():
+                raise MirrorError(f"Object for '{handle}:{name}' missing from mirror")
+            if verify and file_checksum(obj) != digest:
+                raise MirrorError(f"Object for '{handle}:{name}' is corrupted")
+
+            target = dest_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if not _is_same_content(target, obj, digest):
+                _link_or_copy(obj, target)
+            paths.append(target)
+        return paths
+
+
+def _is_same_content(target: Path, obj: Path, digest: str) -> bool:
+    if not target.exists():
+        return False
+    if os.path.samefile(target, obj):
+        return True
+    return (
+        target.stat().st_size == obj.stat().st_size and file_checksum(target) == digest
+    )
+
+
+def _link_or_copy(obj: Path, target: Path) -> None:
+    """Atomically replace ``target`` with a hardlink (or copy) of ``obj``."""
+    tmp_target = target.with_name(f".{target.name}.tmp")
+    if tmp_target.exists():
+        tmp_target.unlink()
+    try:
+        os.link(obj, tmp_target)
+    except OSError:
+        shutil.copyfile(obj, tmp_target)
+    os.replace(tmp_target, target)
+
+
+def _iter_source(source: Path) -> Iterator[tuple[str, IO[bytes]]]:
+    """Yield ``(relative name, binary stream)`` for every file in the source."""
+    if source.is_dir():
+        for path in sorted(p for p in source.rglob("*") if p.is_file()):
+            with open(path, "rb") as stream:
+                yield path.relative_to(source).as_posix(), stream
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                with archive.open(info) as stream:
+                    yield _safe_member_name(info.filename), stream
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                extracted = archive.extractfile(member)
+                if extracted is None:
+                    continue
+                with extracted as stream:
+                    yield _safe_member_name(member.name), stream
+    else:
+        raise MirrorError(f"Unsupported archive format: {source}")
+
+
+def ensure_kaggle_datasets(
+    mirror: DatasetMirror | None = None, dest: Path | str | None = None
+) -> list[Path]:
+    """
+    Materialize every Kaggle dataset used by the course from the mirror.
+
+    Args:
+        mirror: Mirror to read from (defaults to ``DatasetMirror()``)
+        dest: Destination directory (defaults to ``datasets/kaggle``)
+
+    Returns:
+        Paths of the materialized files
+    """
+    mirror = mirror if mirror is not None else DatasetMirror()
+    paths = []
+    for handle, files in KAGGLE_DATASETS.items():
+        paths.extend(mirror.materialize(handle, dest=dest, files=files))
+    return paths
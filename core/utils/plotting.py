@@ -1,12 +1,26 @@
 """Plotting utilities for the ML course."""
 
+import io
+import os
+import weakref
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
+from matplotlib.colors import LogNorm
 from matplotlib.figure import Figure
 
+from .metrics import ConfusionMatrixAccumulator
+
+# Points processed at a time by the large-N code paths.
+_CHUNK_SIZE = 1 << 18
+
 
 def setup_plotting_style() -> None:
     """Set up consistent plotting style."""
@@ -25,38 +39,306 @@ def setup_plotting_style() -> None:
     )
 
 
+@dataclass(frozen=True)
+class ResidualSummary:
+    """Summary statistics of regression predictions and residuals."""
+
+    n: int
+    true_min: float
+    true_max: float
+    pred_min: float
+    pred_max: float
+    residual_min: float
+    residual_max: float
+    residual_mean: float
+    residual_std: float
+    mae: float
+    rmse: float
+
+
+def summarize_residuals(
+    y_true: np.ndarray[Any, np.dtype[Any]],
+    y_pred: np.ndarray[Any, np.dtype[Any]],
+    chunk_size: int = _CHUNK_SIZE,
+) -> ResidualSummary:
+    """
+    Compute ranges and residual statistics in a single chunked pass.
+
+    Chunk moments are merged with Chan's parallel update, so no full-size
+    residual array is materialized and the variance stays numerically stable.
+
+    Args:
+        y_true: True values
+        y_pred: Predicted values
+        chunk_size: Number of points processed at a time
+
+    Returns:
+        ResidualSummary for the predictions
+    """
+    y_true = np.ravel(y_true)
+    y_pred = np.ravel(y_pred)
+    if y_true.shape != y_pred.shape:
+        raise ValueError("y_true and y_pred must have the same length")
+    if y_true.size == 0:
+        raise ValueError("Cannot summarize empty predictions")
+
+    n = 0
+    mean = m2 = abs_sum = sq_sum = 0.0
+    t_min = p_min = r_min = np.inf
+    t_max = p_max = r_max = -np.inf
+    for start in range(0, y_true.size, chunk_size):
+        t = np.asarray(y_true[start : start + chunk_size], dtype=np.float64)
+        p = np.asarray(y_pred[start : start + chunk_size], dtype=np.float64)
+        r = t - p
+        n_b = r.size
+        mean_b = float(r.mean())
+        m2_b = float(np.square(r - mean_b).sum())
+        delta = mean_b - mean
+        total = n + n_b
+        mean += delta * n_b / total
+        m2 += m2_b + delta * delta * n * n_b / total
+        n = total
+        abs_sum += float(np.abs(r).sum())
+        sq_sum += float(np.square(r).sum())
+        t_min, t_max = min(t_min, float(t.min())), max(t_max, float(t.max()))
+        p_min, p_max = min(p_min, float(p.min())), max(p_max, float(p.max()))
+        r_min, r_max = min(r_min, float(r.min())), max(r_max, float(r.max()))
+
+    return ResidualSummary(
+        n=n,
+        true_min=t_min,
+        true_max=t_max,
+        pred_min=p_min,
+        pred_max=p_max,
+        residual_min=r_min,
+        residual_max=r_max,
+        residual_mean=mean,
+        residual_std=float(np.sqrt(m2 / n)),
+        mae=abs_sum / n,
+        rmse=float(np.sqrt(sq_sum / n)),
+    )
+
+
+def stratified_subsample(
+    y_pred: np.ndarray[Any, np.dtype[Any]],
+    residuals: np.ndarray[Any, np.dtype[Any]],
+    size: int,
+    n_strata: int = 20,
+    outlier_z: float = 3.0,
+    random_state: int = 42,
+) -> np.ndarray[Any, np.dtype[np.intp]]:
+    """
+    Pick point indices for plotting, stratified by prediction and keeping outliers.
+
+    Points whose residual lies more than ``outlier_z`` standard deviations
+    from the mean are always kept (the most extreme ones if there are more
+    than a fifth of ``size``). The remaining budget is spread over quantile
+    strata of ``y_pred`` proportionally to their size.
+
+    Args:
+        y_pred: Predicted values
+        residuals: Residuals (``y_true - y_pred``)
+        size: Maximum number of indices to return
+        n_strata: Number of quantile strata of ``y_pred``
+        outlier_z: Outlier threshold in residual standard deviations
+        random_state: Seed for the sampling
+
+    Returns:
+        Sorted array of selected indices
+    """
+    y_pred = np.ravel(y_pred)
+    residuals = np.ravel(residuals)
+    n = y_pred.size
+    if n <= size:
+        return np.arange(n)
+    rng = np.random.default_rng(random_state)
+
+    z = np.abs(residuals - residuals.mean()) / (residuals.std() or 1.0)
+    outliers = np.flatnonzero(z > outlier_z)
+    max_outliers = size // 5
+    if outliers.size > max_outliers:
+        top = np.argpartition(z[outliers], -max_outliers)[-max_outliers:]
+        outliers = outliers[top]
+
+    budget = size - outliers.size
+    inliers = np.ones(n, dtype=bool)
+    inliers[outliers] = False
+    edges = np.quantile(y_pred, np.linspace(0, 1, n_strata + 1)[1:-1])
+    strata = np.searchsorted(edges, y_pred, side="right")
+    strata[~inliers] = -1
+    counts = np.bincount(strata[inliers], minlength=n_strata)
+    quotas = np.floor(counts * budget / counts.sum()).astype(np.intp)
+
+    order = np.argsort(strata, kind="stable")
+    starts = np.searchsorted(strata[order], np.arange(n_strata))
+    selected = [outliers]
+    for stratum in range(n_strata):
+        if quotas[stratum] == 0:
+            continue
+        members = order[starts[stratum] : starts[stratum] + counts[stratum]]
+        selected.append(rng.choice(members, size=quotas[stratum], replace=False))
+    return np.sort(np.concatenate(selected))
+
+
+def _density_image(
+    ax: Any,
+    x: np.ndarray[Any, np.dtype[Any]],
+    y: np.ndarray[Any, np.dtype[Any]],
+    x_range: tuple[float, float],
+    y_range: tuple[float, float],
+    bins: int,
+    y_minus_x: bool = False,
+) -> Any:
+    """
+    Draw a log-scaled 2D histogram accumulated chunk by chunk.
+
+    With ``y_minus_x`` the vertical coordinate is ``y - x`` computed per
+    chunk, so residuals are never materialized in full.
+    """
+    (x_lo, x_hi), (y_lo, y_hi) = _padded(x_range), _padded(y_range)
+    x_scale, y_scale = bins / (x_hi - x_lo), bins / (y_hi - y_lo)
+    flat = np.zeros(bins * bins, dtype=np.float64)
+    for start in range(0, x.size, _CHUNK_SIZE):
+        xc = np.asarray(x[start : start + _CHUNK_SIZE], dtype=np.float64)
+        yc = np.asarray(y[start : start + _CHUNK_SIZE], dtype=np.float64)
+        if y_minus_x:
+            yc = yc - xc
+        # Uniform bins: the bin index is a multiply, no searchsorted needed.
+        ix = np.clip(((xc - x_lo) * x_scale).astype(np.intp), 0, bins - 1)
+        iy = np.clip(((yc - y_lo) * y_scale).astype(np.intp), 0, bins - 1)
+        flat += np.bincount(ix * bins + iy, minlength=bins * bins)
+    counts = flat.reshape(bins, bins)
+
+    # Empty bins become NaN so they are left blank like in a scatter plot.
+    counts[counts == 0] = np.nan
+    return ax.imshow(
+        counts.T,
+        origin="lower",
+        extent=(x_lo, x_hi, y_lo, y_hi),
+        aspect="auto",
+        interpolation="nearest",
+        cmap="viridis",
+        norm=LogNorm(vmin=1, vmax=max(float(np.nanmax(counts)), 1.0)),
+    )
+
+
+def _padded(value_range: tuple[float, float]) -> tuple[float, float]:
+    lo, hi = value_range
+    if hi <= lo:
+        return lo - 0.5, hi + 0.5
+    pad = (hi - lo) * 0.01
+    return lo - pad, hi + pad
+
+
 def plot_regression_results(
     y_true: np.ndarray[Any, np.dtype[Any]],
     y_pred: np.ndarray[Any, np.dtype[Any]],
     title: str | None = None,
+    mode: str = "auto",
+    density_threshold: int = 100_000,
+    subsample: int | None = None,
+    bins: int = 200,
+    random_state: int = 42,
 ) -> Figure:
     """
     Plot regression results (actual vs predicted).
 
+    Small inputs are drawn as scatter plots. Above ``density_threshold``
+    points the ``"auto"`` mode switches to density mode: both panels become
+    log-scaled 2D histograms accumulated in chunks, so rendering time and
+    figure memory no longer grow with the number of points.
+
     Args:
         y_true: True values
         y_pred: Predicted values
         title: Plot title
+        mode: ``"auto"``, ``"scatter"``, ``"density"`` or ``"sample"``
+            (scatter of a stratified subsample that keeps outliers)
+        density_threshold: Point count above which ``"auto"`` uses density mode
+        subsample: In density mode, overlay a stratified subsample of this
+            size (outliers included); the size used by ``"sample"`` mode
+        bins: Number of histogram bins per axis in density mode
+        random_state: Seed for the subsampling
 
     Returns:
         matplotlib Figure object
     """
+    if mode not in ("auto", "scatter", "density", "sample"):
+        raise ValueError(f"Unknown mode: {mode}")
+    y_true = np.ravel(y_true)
+    y_pred = np.ravel(y_pred)
+    summary = summarize_residuals(y_true, y_pred)
+    if mode == "auto":
+        mode = "scatter" if summary.n <= density_threshold else "density"
+
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
 
+    if mode == "density":
+        image = _density_image(
+            ax1,
+            y_true,
+            y_pred,
+            (summary.true_min, summary.true_max),
+            (summary.pred_min, summary.pred_max),
+            bins,
+        )
+        fig.colorbar(image, ax=ax1, label="Pontos")
+        image = _density_image(
+            ax2,
+            y_pred,
+            y_true,
+            (summary.pred_min, summary.pred_max),
+            (summary.residual_min, summary.residual_max),
+            bins,
+            y_minus_x=True,
+        )
+        fig.colorbar(image, ax=ax2, label="Pontos")
+
+    if mode == "sample" or (mode == "density" and subsample):
+        size = subsample or density_threshold
+        idx = stratified_subsample(
+            y_pred, y_true - y_pred, size, random_state=random_state
+        )
+        y_true_plot, y_pred_plot = y_true[idx], y_pred[idx]
+    else:
+        y_true_plot, y_pred_plot = y_true, y_pred
+
+    draw_points = mode != "density" or bool(subsample)
+    overlay = {"s": 4, "alpha": 0.3, "color": "k"} if mode == "density" else {}
+
     # Scatter plot
-    ax1.scatter(y_true, y_pred, alpha=0.6)
-    ax1.plot([y_true.min(), y_true.max()], [y_true.min(), y_true.max()], "r--", lw=2)
+    if draw_points:
+        ax1.scatter(y_true_plot, y_pred_plot, **({"alpha": 0.6} | overlay))
+    ax1.plot(
+        [summary.true_min, summary.true_max],
+        [summary.true_min, summary.true_max],
+        "r--",
+        lw=2,
+    )
     ax1.set_xlabel("Valores Reais")
     ax1.set_ylabel("Valores Preditos")
     ax1.set_title("Predito vs Real")
 
     # Residuals
-    residuals = y_true - y_pred
-    ax2.scatter(y_pred, residuals, alpha=0.6)
+    if draw_points:
+        residuals = y_true_plot - y_pred_plot
+        ax2.scatter(y_pred_plot, residuals, **({"alpha": 0.6} | overlay))
     ax2.axhline(y=0, color="r", linestyle="--")
     ax2.set_xlabel("Valores Preditos")
     ax2.set_ylabel("Resíduos")
     ax2.set_title("Resíduos vs Preditos")
+    ax2.text(
+        0.02,
+        0.98,
+        f"n = {summary.n:,}\n"
+        f"média = {summary.residual_mean:.3g}\n"
+        f"desvio = {summary.residual_std:.3g}\n"
+        f"RMSE = {summary.rmse:.3g}",
+        transform=ax2.transAxes,
+        va="top",
+        fontsize=9,
+        bbox={"boxstyle": "round", "facecolor": "white", "alpha": 0.8},
+    )
 
     if title:
         fig.suptitle(title, fontsize=16)
@@ -65,10 +347,65 @@ def plot_regression_results(
     return fig
 
 
+def plot_confusion_matrix(
+    accumulator: ConfusionMatrixAccumulator,
+    class_names: list[str] | None = None,
+    top_k: int = 30,
+    annotate_max: int = 20,
+) -> Figure:
+    """
+    Plot a (possibly streamed) confusion matrix.
+
+    With more than ``top_k`` classes only the ``top_k`` classes involved in
+    the most errors are drawn, and annotations are dropped once the drawn
+    matrix is larger than ``annotate_max`` classes.
+
+    Args:
+        accumulator: Accumulated confusion counts
+        class_names: Names of classes, in matrix order
+        top_k: Maximum number of classes to draw
+        annotate_max: Largest matrix size that still gets cell annotations
+
+    Returns:
+        matplotlib Figure object
+    """
+    n_classes = accumulator.n_classes
+    if n_classes <= top_k:
+        cm = accumulator.to_dense()
+        tick_labels: Any = class_names if class_names is not None else "auto"
+        title = "Matriz de Confusão"
+    else:
+        indices = accumulator.top_confused(top_k)
+        cm = accumulator.submatrix(indices)
+        names: Any = (
+            class_names if class_names is not None else accumulator.class_labels()
+        )
+        tick_labels = [str(names[i]) for i in indices]
+        title = f"Matriz de Confusão ({top_k} classes mais confundidas de {n_classes})"
+
+    annotate = len(cm) <= annotate_max
+    fig, ax = plt.subplots(figsize=(8, 6) if annotate else (12, 10))
+    sns.heatmap(
+        cm,
+        annot=annotate,
+        fmt="d",
+        cmap="Blues",
+        ax=ax,
+        xticklabels=tick_labels,
+        yticklabels=tick_labels,
+    )
+    ax.set_xlabel("Predito")
+    ax.set_ylabel("Real")
+    ax.set_title(title)
+
+    return fig
+
+
 def plot_classification_results(
     y_true: np.ndarray[Any, np.dtype[Any]],
     y_pred: np.ndarray[Any, np.dtype[Any]],
     class_names: list[str] | None = None,
+    top_k: int = 30,
 ) -> Figure:
     """
     Plot classification results (confusion matrix).
@@ -77,26 +414,387 @@ def plot_classification_results(
         y_true: True labels
         y_pred: Predicted labels
         class_names: Names of classes
+        top_k: Maximum number of classes to draw (see ``plot_confusion_matrix``)
 
     Returns:
         matplotlib Figure object
     """
-    from sklearn.metrics import confusion_matrix
+    labels = np.unique(np.concatenate([np.ravel(y_true), np.ravel(y_pred)]))
+    accumulator = ConfusionMatrixAccumulator(labels=labels).update(y_true, y_pred)
+    return plot_confusion_matrix(accumulator, class_names, top_k=top_k)
 
-    cm = confusion_matrix(y_true, y_pred)
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.heatmap(
-        cm,
-        annot=True,
-        fmt="d",
-        cmap="Blues",
-        ax=ax,
-        xticklabels=class_names,
-        yticklabels=class_names,
+@dataclass
+class DecisionBoundary:
+    """Predicted labels on a regular 2D lattice, as used for contour plots."""
+
+    xx: np.ndarray[Any, np.dtype[np.float64]]
+    yy: np.ndarray[Any, np.dtype[np.float64]]
+    labels: np.ndarray[Any, np.dtype[Any]]
+    n_predicted: int
+
+    @property
+    def codes(self) -> np.ndarray[Any, np.dtype[np.intp]]:
+        """Labels as integer codes ``0..n_classes-1`` (sorted label order)."""
+        _, inverse = np.unique(self.labels, return_inverse=True)
+        codes: np.ndarray[Any, np.dtype[np.intp]] = inverse.reshape(self.labels.shape)
+        return codes
+
+    @property
+    def n_points(self) -> int:
+        """Number of lattice points (what a full meshgrid would predict)."""
+        return int(self.labels.size)
+
+
+def _predict_batched(
+    model: Any, points: np.ndarray[Any, np.dtype[np.float64]], batch_size: int
+) -> np.ndarray[Any, np.dtype[Any]]:
+    return np.concatenate(
+        [
+            np.ravel(np.asarray(model.predict(points[start : start + batch_size])))
+            for start in range(0, len(points), batch_size)
+        ]
     )
-    ax.set_xlabel("Predito")
-    ax.set_ylabel("Real")
-    ax.set_title("Matriz de Confusão")
+
+
+def compute_decision_boundary(
+    model: Any,
+    x_range: tuple[float, float],
+    y_range: tuple[float, float],
+    coarse: int = 16,
+    levels: int = 5,
+    batch_size: int = 65_536,
+) -> DecisionBoundary:
+    """
+    Predict a 2D decision boundary with quadtree-style refinement.
+
+    The model is first evaluated on a ``coarse x coarse`` grid of cells. At
+    each of the ``levels`` refinement steps every cell is split in four, but
+    only cells whose corners disagree are evaluated again; cells whose four
+    corners share a label are filled without calling the model. The result
+    is the lattice a ``(coarse * 2**levels + 1)``-point meshgrid would give,
+    at a fraction of the predictions. Regions smaller than a coarse cell
+    that do not touch any coarse corner can be missed, so ``coarse`` should
+    not be too small.
+
+    Args:
+        model: Fitted model with a ``predict`` method taking (n, 2) arrays
+        x_range: (min, max) of the first feature
+        y_range: (min, max) of the second feature
+        coarse: Number of cells per axis of the initial grid
+        levels: Number of refinement steps
+        batch_size: Maximum number of points passed to ``predict`` at once
+
+    Returns:
+        DecisionBoundary with the lattice coordinates and predicted labels
+    """
+    if coarse < 1 or levels < 0:
+        raise ValueError("coarse must be >= 1 and levels >= 0")
+
+    def lattice(n_cells: int) -> tuple[np.ndarray[Any, Any], np.ndarray[Any, Any]]:
+        return (
+            np.linspace(x_range[0], x_range[1], n_cells + 1),
+            np.linspace(y_range[0], y_range[1], n_cells + 1),
+        )
+
+    xs, ys = lattice(coarse)
+    xx, yy = np.meshgrid(xs, ys)
+    labels = _predict_batched(model, np.c_[xx.ravel(), yy.ravel()], batch_size)
+    labels = labels.reshape(xx.shape)
+    n_predicted = labels.size
+
+    n_cells = coarse
+    for _ in range(levels):
+        uniform = (
+            (labels[:-1, :-1] == labels[1:, :-1])
+            & (labels[:-1, :-1] == labels[:-1, 1:])
+            & (labels[:-1, :-1] == labels[1:, 1:])
+        )
+        n_cells *= 2
+        # Every new point starts with the label of its lower-left old corner;
+        # this is exact inside uniform cells and on edges between them.
+        half = np.arange(n_cells + 1) // 2
+        refined = labels[np.ix_(half, half)]
+
+        rows, cols = np.nonzero(~uniform)
+        need = np.zeros(refined.shape, dtype=bool)
+        for di in range(3):
+            for dj in range(3):
+                need[2 * rows + di, 2 * cols + dj] = True
+        need[::2, ::2] = False
+
+        if need.any():
+            xs, ys = lattice(n_cells)
+            iy, ix = np.nonzero(need)
+            points = np.c_[xs[ix], ys[iy]]
+            predicted = _predict_batched(model, points, batch_size)
+            if not np.can_cast(predicted.dtype, refined.dtype, casting="same_kind"):
+                refined = refined.astype(np.result_type(refined, predicted))
+            refined[iy, ix] = predicted
+            n_predicted += len(points)
+        labels = refined
+
+    xs, ys = lattice(n_cells)
+    xx, yy = np.meshgrid(xs, ys)
+    return DecisionBoundary(xx, yy, labels, n_predicted)
+
+
+# Boundaries of recently plotted models, keyed by model and then by a hash of
+# the fitted model plus the grid settings; refitting invalidates the entries.
+_BOUNDARY_CACHE: weakref.WeakKeyDictionary[
+    Any, dict[tuple[Any, ...], DecisionBoundary]
+] = weakref.WeakKeyDictionary()
+_BOUNDARY_CACHE_SIZE = 8
+
+
+def _cached_boundary(
+    model: Any, key: tuple[Any, ...], compute: Callable[[], DecisionBoundary]
+) -> DecisionBoundary:
+    try:
+        import joblib
+
+        full_key = (joblib.hash(model), *key)
+        entries = _BOUNDARY_CACHE.setdefault(model, {})
+    except Exception:
+        # Unpicklable or non-weakrefable models are simply not cached
+        return compute()
+    if full_key not in entries:
+        if len(entries) >= _BOUNDARY_CACHE_SIZE:
+            entries.pop(next(iter(entries)))
+        entries[full_key] = compute()
+    return entries[full_key]
+
+
+def plot_decision_boundary(
+    model: Any,
+    X: np.ndarray[Any, np.dtype[Any]],
+    y: np.ndarray[Any, np.dtype[Any]] | None = None,
+    title: str | None = None,
+    ax: Any = None,
+    margin: float = 0.5,
+    coarse: int = 16,
+    levels: int = 5,
+    batch_size: int = 65_536,
+    cmap: str = "RdYlBu",
+    alpha: float = 0.3,
+    cache: bool = True,
+) -> Figure:
+    """
+    Plot the decision regions of a model trained on two features.
+
+    The regions are computed with ``compute_decision_boundary`` (coarse grid
+    refined only where the predicted class changes, predicted in batches).
+    With ``cache=True`` the predictions are reused while the model and the
+    grid settings stay the same, so changing ``title``, ``cmap``, ``alpha``
+    or the target axes does not call ``predict`` again.
+
+    Args:
+        model: Fitted model with a ``predict`` method
+        X: Data with exactly two features
+        y: Labels used to color the data points (optional)
+        title: Plot title
+        ax: Axes to draw on (a new figure is created if None)
+        margin: Space added around the data range
+        coarse: Number of cells per axis of the initial grid
+        levels: Number of refinement steps (final grid has
+            ``coarse * 2**levels`` cells per axis)
+        batch_size: Maximum number of points passed to ``predict`` at once
+        cmap: Colormap for regions and points
+        alpha: Opacity of the decision regions
+        cache: Reuse predictions from previous calls with the same model
+
+    Returns:
+        matplotlib Figure object
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim != 2 or X.shape[1] != 2:
+        raise ValueError("plot_decision_boundary needs X with exactly two features")
+    x_range = (float(X[:, 0].min()) - margin, float(X[:, 0].max()) + margin)
+    y_range = (float(X[:, 1].min()) - margin, float(X[:, 1].max()) + margin)
+
+    def compute() -> DecisionBoundary:
+        return compute_decision_boundary(
+            model, x_range, y_range, coarse=coarse, levels=levels, batch_size=batch_size
+        )
+
+    key = (x_range, y_range, coarse, levels)
+    boundary = _cached_boundary(model, key, compute) if cache else compute()
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 8))
+    else:
+        fig = ax.figure
+
+    codes = boundary.codes
+    n_regions = int(codes.max()) + 1
+    ax.contourf(
+        boundary.xx,
+        boundary.yy,
+        codes,
+        levels=np.arange(n_regions + 1) - 0.5,
+        alpha=alpha,
+        cmap=cmap,
+    )
+    if y is not None:
+        scatter = ax.scatter(
+            X[:, 0], X[:, 1], c=y, cmap=cmap, edgecolors="k", s=50, alpha=0.8
+        )
+        fig.colorbar(scatter, ax=ax)
+    else:
+        ax.scatter(X[:, 0], X[:, 1], color="k", s=20, alpha=0.6)
+    ax.set_xlabel("Feature 1")
+    ax.set_ylabel("Feature 2")
+    if title:
+        ax.set_title(title)
+    ax.grid(True, alpha=0.3)
 
     return fig
+
+
+@dataclass(frozen=True)
+class FigureJob:
+    """
+    One figure to export: ``func(*args, **kwargs)`` must return a Figure.
+
+    ``func`` has to be importable (a module-level function such as
+    ``plot_regression_results``) so the job can run in a worker process.
+    """
+
+    name: str
+    func: Callable[..., Figure]
+    args: tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ExportedFigure:
+    """Files written for one FigureJob."""
+
+    name: str
+    paths: list[Path]
+    cached: bool
+
+
+def _figure_key(job: FigureJob, fmt: str, dpi: int) -> str:
+    import joblib
+
+    func = (job.func.__module__, job.func.__qualname__)
+    key: str = joblib.hash(
+        (func, job.args, job.kwargs, fmt, dpi, matplotlib.__version__)
+    )
+    return key
+
+
+def _use_agg() -> None:
+    matplotlib.use("Agg", force=True)
+
+
+def _render_figure(job: FigureJob, formats: tuple[str, ...], dpi: int) -> list[bytes]:
+    fig = job.func(*job.args, **job.kwargs)
+    try:
+        rendered = []
+        for fmt in formats:
+            buffer = io.BytesIO()
+            # Drop the SVG date so identical inputs give identical files
+            metadata = {"Date": None} if fmt == "svg" else None
+            fig.savefig(
+                buffer, format=fmt, dpi=dpi, bbox_inches="tight", metadata=metadata
+            )
+            rendered.append(buffer.getvalue())
+        return rendered
+    finally:
+        plt.close(fig)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def export_figures(
+    jobs: Iterable[FigureJob],
+    output_dir: Path | str,
+    formats: Iterable[str] = ("png",),
+    cache_dir: Path | str | None = None,
+    dpi: int = 100,
+    n_jobs: int | None = None,
+    force: bool = False,
+) -> list[ExportedFigure]:
+    """
+    Render figures to files, in parallel and skipping unchanged ones.
+
+    Each figure is identified by a hash of its function, arguments (data
+    included), format, dpi and the matplotlib version. Figures whose hash is
+    already in ``cache_dir`` are copied from there; the others are rendered
+    with the Agg backend in a process pool and written to the cache and to
+    ``output_dir`` once all of them are done. Changes to the code of the
+    plotting function itself are not detected; use ``force=True`` then.
+
+    Args:
+        jobs: Figures to export
+        output_dir: Directory for ``<name>.<format>`` files
+        formats: File formats, e.g. ("png", "svg")
+        cache_dir: Rendered-figure cache (default: ``output_dir/.cache``)
+        dpi: Resolution of raster formats
+        n_jobs: Worker processes (default: CPU count; 1 renders in-process)
+        force: Render every figure even if it is cached
+
+    Returns:
+        One ExportedFigure per job, in input order
+
+    Example:
+        >>> jobs = [FigureJob(f"fold_{i}", plot_regression_results, (y, p))
+        ...         for i, (y, p) in enumerate(folds)]
+        >>> export_figures(jobs, "reports/figures", formats=("png", "svg"))
+    """
+    jobs = list(jobs)
+    formats = tuple(formats)
+    output_path = Path(output_dir)
+    cache_path = Path(cache_dir) if cache_dir else output_path / ".cache"
+    output_path.mkdir(parents=True, exist_ok=True)
+    cache_path.mkdir(parents=True, exist_ok=True)
+
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("FigureJob names must be unique")
+
+    cache_files = [
+        [cache_path / f"{_figure_key(job, fmt, dpi)}.{fmt}" for fmt in formats]
+        for job in jobs
+    ]
+    pending = [
+        i
+        for i, files in enumerate(cache_files)
+        if force or not all(path.exists() for path in files)
+    ]
+
+    workers = min(n_jobs or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        rendered = [_render_figure(jobs[i], formats, dpi) for i in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_use_agg) as pool:
+            rendered = list(
+                pool.map(
+                    _render_figure,
+                    [jobs[i] for i in pending],
+                    [formats] * len(pending),
+                    [dpi] * len(pending),
+                )
+            )
+    for i, outputs in zip(pending, rendered, strict=True):
+        for path, data in zip(cache_files[i], outputs, strict=True):
+            _write_atomic(path, data)
+
+    rendered_now = set(pending)
+    results = []
+    for i, (job, files) in enumerate(zip(jobs, cache_files, strict=True)):
+        paths = []
+        for fmt, cached_file in zip(formats, files, strict=True):
+            path = output_path / f"{job.name}.{fmt}"
+            data = cached_file.read_bytes()
+            if not path.exists() or path.read_bytes() != data:
+                _write_atomic(path, data)
+            paths.append(path)
+        results.append(ExportedFigure(job.name, paths, cached=i not in rendered_now))
+    return results
@@ -1,27 +1,220 @@
 """Utility functions for the ML course."""
 
 import random
+import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, TypeVar
 
 import numpy as np
 
+T = TypeVar("T")
+R = TypeVar("R")
 
-def fix_random_seeds(seed: int = 42) -> None:
+
+def _torch_module(torch: bool | None) -> ModuleType | None:
+    """
+    Return the torch module if it should be seeded.
+
+    With ``torch=None`` torch is only used when it has already been imported,
+    so seeding never pays its import cost in code that does not use it.
+    """
+    if torch is None:
+        return sys.modules.get("torch")
+    if not torch:
+        return None
+    import torch as torch_module
+
+    return torch_module
+
+
+def fix_random_seeds(seed: int = 42, torch: bool | None = None) -> None:
     """
     Fix random seeds for reproducibility.
 
+    PyTorch is seeded only if it is already imported, unless ``torch=True``
+    (import and seed it) or ``torch=False`` (never touch it) is given.
+
     Args:
         seed: Random seed value
+        torch: Seed PyTorch; None means "only if already imported"
     """
     random.seed(seed)
     np.random.seed(seed)
 
-    # Set PyTorch seeds if available
+    torch_module = _torch_module(torch)
+    if torch_module is not None:
+        torch_module.manual_seed(seed)
+        # manual_seed also seeds CUDA lazily; only touch it if already in use
+        if torch_module.cuda.is_initialized():
+            torch_module.cuda.manual_seed_all(seed)
+
+
+@contextmanager
+def preserve_random_state(
+    seed: int | None = None, torch: bool | None = None
+) -> Iterator[None]:
+    """
+    Capture the global RNG state and restore it when the block exits.
+
+    Covers ``random``, ``np.random`` and, when in use, PyTorch (CPU and any
+    initialized CUDA devices). Use it to seed a region of a lesson or a
+    grader test without changing the random numbers seen after the block.
+
+    Args:
+        seed: If given, seed all generators with it at the start of the block
+        torch: Include PyTorch; None means "only if already imported"
+
+    Example:
+        >>> with preserve_random_state(0):
+        ...     X = np.random.rand(3)
+    """
+    torch_module = _torch_module(torch)
+    python_state = random.getstate()
+    numpy_state = np.random.get_state()
+    torch_state = None
+    cuda_states = None
+    if torch_module is not None:
+        torch_state = torch_module.get_rng_state()
+        if torch_module.cuda.is_initialized():
+            cuda_states = torch_module.cuda.get_rng_state_all()
+
     try:
+        if seed is not None:
+            fix_random_seeds(seed, torch=torch_module is not None)
+        yield
+    finally:
+        random.setstate(python_state)
+        np.random.set_state(numpy_state)
+        if torch_module is not None:
+            torch_module.set_rng_state(torch_state)
+            if cuda_states is not None:
+                torch_module.cuda.set_rng_state_all(cuda_states)
+
+
+@dataclass(frozen=True)
+class RNGStream:
+    """
+    Independent, reproducible random stream for one task.
+
+    Streams are derived with ``numpy.random.SeedSequence`` and identified by
+    their spawn key, so a task gets the same numbers no matter which worker
+    runs it or in which order. Streams are picklable and can be sent to
+    process-pool workers.
+    """
+
+    seed_sequence: np.random.SeedSequence
+
+    @property
+    def key(self) -> tuple[int, ...]:
+        """Spawn key identifying this stream below the root seed."""
+        return tuple(self.seed_sequence.spawn_key)
+
+    def numpy(self) -> np.random.Generator:
+        """Return a new numpy Generator for this stream."""
+        return np.random.default_rng(self.seed_sequence)
+
+    def python(self) -> random.Random:
+        """Return a new ``random.Random`` instance for this stream."""
+        return random.Random(self.seed_int(bits=64))
+
+    def torch(self, device: str = "cpu") -> Any:
+        """Return a new ``torch.Generator`` for this stream."""
         import torch
 
-        torch.manual_seed(seed)
-        if torch.cuda.is_available():
-            torch.cuda.manual_seed(seed)
-            torch.cuda.manual_seed_all(seed)
-    except ImportError:
-        pass
+        generator = torch.Generator(device=device)
+        generator.manual_seed(self.seed_int(bits=63))
+        return generator
+
+    def seed_int(self, bits: int = 32) -> int:
+        """
+        Derive a plain integer seed, e.g. for sklearn ``random_state``.
+
+        Args:
+            bits: Number of bits of the seed (32 fits sklearn/numpy legacy APIs)
+        """
+        state = self.seed_sequence.generate_state(2, dtype=np.uint32)
+        value = (int(state[0]) << 32) | int(state[1])
+        return value & ((1 << bits) - 1)
+
+    def spawn(self, n: int) -> list["RNGStream"]:
+        """Return ``n`` child streams, e.g. one per chunk of this task."""
+        return [
+            RNGStream(
+                np.random.SeedSequence(
+                    self.seed_sequence.entropy,
+                    spawn_key=(*self.key, i),
+                    pool_size=self.seed_sequence.pool_size,
+                )
+            )
+            for i in range(n)
+        ]
+
+
+def rng_stream(seed: int = 42, key: int | Sequence[int] = ()) -> RNGStream:
+    """
+    Return the stream for a task identified by ``key`` under ``seed``.
+
+    ``rng_stream(seed, i)`` equals ``spawn_streams(seed, n)[i]`` for any
+    ``n > i``, so workers can build their own stream from the task index.
+
+    Args:
+        seed: Root seed of the experiment
+        key: Task index (or tuple of nested indices)
+
+    Returns:
+        RNGStream for the task
+    """
+    spawn_key = (key,) if isinstance(key, int) else tuple(key)
+    return RNGStream(np.random.SeedSequence(seed, spawn_key=spawn_key))
+
+
+def spawn_streams(seed: int = 42, n: int = 1) -> list[RNGStream]:
+    """
+    Split a root seed into ``n`` independent streams.
+
+    Args:
+        seed: Root seed of the experiment
+        n: Number of tasks (folds, chunks, configurations...)
+
+    Returns:
+        List of RNGStream, one per task
+    """
+    return rng_stream(seed).spawn(n)
+
+
+def spawn_generators(seed: int = 42, n: int = 1) -> list[np.random.Generator]:
+    """Return ``n`` independent numpy Generators derived from ``seed``."""
+    return [stream.numpy() for stream in spawn_streams(seed, n)]
+
+
+def map_with_streams(
+    func: Callable[[T, RNGStream], R],
+    items: Iterable[T],
+    seed: int = 42,
+    n_jobs: int = 1,
+) -> list[R]:
+    """
+    Apply ``func(item, stream)`` to every item with its own random stream.
+
+    Item ``i`` always receives ``rng_stream(seed, i)``, and results come back
+    in input order, so the output is identical for any ``n_jobs``.
+
+    Args:
+        func: Picklable function taking an item and its RNGStream
+        items: Work items (folds, chunks, configurations...)
+        seed: Root seed of the experiment
+        n_jobs: Number of worker processes (1 runs serially)
+
+    Returns:
+        List of results in input order
+    """
+    tasks = list(items)
+    streams = [rng_stream(seed, i) for i in range(len(tasks))]
+    if n_jobs <= 1 or len(tasks) <= 1:
+        return [func(task, stream) for task, stream in zip(tasks, streams, strict=True)]
+    with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+        return list(executor.map(func, tasks, streams))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Compara a convolução em loops, com im2col (core) e torch conv2d na CPU."""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Setup path before core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))  # noqa: E402
+
+from core.models.conv import conv2d, conv2d_backward, conv2d_naive  # noqa: E402
+
+# (batch, canais, lado, filtros, kernel): de MNIST a CIFAR e camadas internas
+CONFIGS = [
+    (16, 1, 14, 4, 3),
+    (64, 1, 28, 8, 3),
+    (64, 3, 32, 16, 3),
+    (64, 16, 32, 32, 3),
+    (32, 32, 16, 64, 3),
+    (16, 3, 64, 16, 5),
+]
+
+# Os loops aninhados só rodam até este número de multiplicações
+NAIVE_MAX_MACS = 2e7
+
+
+def best_time(fn: Callable[[], Any], repeat: int) -> float:
+    """Menor tempo entre ``repeat`` execuções (após um aquecimento)."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_im2col(
+    x: np.ndarray, w: np.ndarray, pad: int, max_memory_mb: float, backward: bool
+) -> None:
+    """Forward (e backward) com im2col + GEMM."""
+    out = conv2d(x, w, padding=pad, max_memory_mb=max_memory_mb)
+    if backward:
+        conv2d_backward(np.ones_like(out), x, w, 1, pad, max_memory_mb=max_memory_mb)
+
+
+def run_torch(tx: Any, tw: Any, pad: int, backward: bool) -> None:
+    """Forward (e backward) com torch.nn.functional.conv2d."""
+    import torch.nn.functional as F
+
+    out = F.conv2d(tx, tw, padding=pad)
+    if backward:
+        out.sum().backward()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da convolução em NumPy")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições")
+    parser.add_argument(
+        "--max-memory-mb", type=float, default=256, help="Orçamento do im2col (MB)"
+    )
+    parser.add_argument(
+        "--backward", action="store_true", help="Mede também o backward"
+    )
+    args = parser.parse_args()
+    try:
+        import torch
+        import torch.nn.functional as F
+    except ImportError:  # o benchmark roda só com NumPy
+        torch = None
+        print("⚠️  PyTorch não instalado; coluna torch omitida")
+
+    print(
+        f"{'Entrada (N,C,H,W)':20} | {'Filtros':>7} | {'k':>2} | {'loops (s)':>9} | "
+        f"{'im2col (s)':>10} | {'torch (s)':>9} | {'vs loops':>8} | {'erro máx':>8}"
+    )
+    print("-" * 95)
+    rng = np.random.default_rng(42)
+    for batch, channels, side, filters, k in CONFIGS:
+        x = rng.standard_normal((batch, channels, side, side), dtype=np.float32)
+        w = rng.standard_normal((filters, channels, k, k), dtype=np.float32)
+        pad = k // 2
+
+        im2col_time = best_time(
+            partial(run_im2col, x, w, pad, args.max_memory_mb, args.backward),
+            args.repeat,
+        )
+        out = conv2d(x, w, padding=pad)
+
+        macs = batch * filters * side * side * channels * k * k
+        naive_text = speedup = "-"
+        if macs <= NAIVE_MAX_MACS and not args.backward:
+            naive_time = best_time(partial(conv2d_naive, x, w, padding=pad), 1)
+            naive_text = f"{naive_time:9.3f}"
+            speedup = f"{naive_time / im2col_time:7.0f}x"
+
+        torch_text, error = "-", "-"
+        if torch is not None:
+            tx = torch.from_numpy(x).requires_grad_(args.backward)
+            tw = torch.from_numpy(w).requires_grad_(args.backward)
+            torch_time = best_time(
+                partial(run_torch, tx, tw, pad, args.backward), args.repeat
+            )
+            torch_text = f"{torch_time:9.4f}"
+            reference = F.conv2d(tx.detach(), tw.detach(), padding=pad).numpy()
+            error = f"{np.abs(out - reference).max():8.1e}"
+
+        print(
+            f"{str((batch, channels, side, side)):20} | {filters:7} | {k:2} | "
+            f"{naive_text:>9} | {im2col_time:10.4f} | {torch_text:>9} | "
+            f"{speedup:>8} | {error:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Compara o sweep de k do core com o KNeighborsClassifier do scikit-learn."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.model_selection import train_test_split
+from sklearn.neighbors import KNeighborsClassifier
+
+# Setup path before core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))  # noqa: E402
+
+from core.models.knn import knn_k_sweep  # noqa: E402
+
+K_VALUES = [1, 3, 5, 7, 9, 15, 25, 35]
+METRICS = ["euclidean", "manhattan", "chebyshev"]
+
+
+def sklearn_sweep(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    metric: str,
+) -> tuple[list[float], list[float]]:
+    """Reajusta o KNN para cada k, como na aula 02_knn."""
+    train_acc, test_acc = [], []
+    for k in K_VALUES:
+        knn = KNeighborsClassifier(n_neighbors=k, metric=metric).fit(X_train, y_train)
+        train_acc.append(knn.score(X_train, y_train))
+        test_acc.append(knn.score(X_test, y_test))
+    return train_acc, test_acc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do KNN em blocos")
+    parser.add_argument(
+        "--samples", type=int, default=10_000, help="Número de amostras"
+    )
+    parser.add_argument("--features", type=int, default=10, help="Número de features")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Repetições (melhor tempo)"
+    )
+    args = parser.parse_args()
+
+    X, y = make_classification(
+        n_samples=args.samples,
+        n_features=args.features,
+        n_informative=min(args.features, 5),
+        n_classes=3,
+        random_state=42,
+    )
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.3, random_state=42
+    )
+    print(f"📊 {len(X_train)} treino x {len(X_test)} teste, {args.features} features")
+    print(f"   k = {K_VALUES}\n")
+    print(
+        f"{'Métrica':12} | {'sklearn (s)':>11} | {'core (s)':>9} | {'Speedup':>7} | Igual"
+    )
+    print("-" * 58)
+
+    for metric in METRICS:
+        sk_time = core_time = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            sk_train, sk_test = sklearn_sweep(X_train, y_train, X_test, y_test, metric)
+            sk_time = min(sk_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            result = knn_k_sweep(
+                X_train, y_train, X_test, y_test, K_VALUES, metric=metric
+            )
+            core_time = min(core_time, time.perf_counter() - start)
+
+        same = np.allclose(result.train_accuracy, sk_train) and np.allclose(
+            result.test_accuracy, sk_test
+        )
+        print(
+            f"{metric:12} | {sk_time:11.3f} | {core_time:9.3f} | "
+            f"{sk_time / core_time:6.1f}x | {'✅' if same else '❌'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
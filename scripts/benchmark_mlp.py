@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Compara o MLP em NumPy do core com o MLPClassifier do scikit-learn."""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+from sklearn.datasets import fetch_openml, load_digits, make_moons
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.model_selection import train_test_split
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+# Setup path before core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))  # noqa: E402
+
+from core.models.mlp import NumpyMLPClassifier  # noqa: E402
+
+# (dataset, arquitetura, épocas), como nas aulas e exercícios do módulo 05
+CONFIGS = {
+    "moons": [((10,), 1000), ((20, 10), 500), ((50, 25, 10), 500)],
+    "mnist": [((100,), 20), ((128, 64), 20)],
+}
+
+
+def load(name: str) -> tuple[np.ndarray, np.ndarray]:
+    """Carrega os dados usados no curso."""
+    if name == "moons":
+        return make_moons(n_samples=500, noise=0.2, random_state=42)
+    try:
+        mnist = fetch_openml("mnist_784", version=1, parser="auto", as_frame=False)
+        return mnist.data / 255.0, mnist.target.astype(int)
+    except Exception as exc:  # sem rede e sem cache local do OpenML
+        print(f"⚠️  MNIST indisponível ({type(exc).__name__}); usando load_digits")
+        X, y = load_digits(return_X_y=True)
+        return X / 16.0, y
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do MLP em NumPy")
+    parser.add_argument(
+        "--dataset", choices=["moons", "mnist", "all"], default="all", help="Dados"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Repetições (melhor tempo)"
+    )
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", category=ConvergenceWarning)
+
+    names = list(CONFIGS) if args.dataset == "all" else [args.dataset]
+    print(
+        f"{'Dados':6} | {'Arquitetura':12} | {'sklearn (s)':>11} | {'core (s)':>9} | "
+        f"{'Speedup':>7} | {'Acc sklearn':>11} | {'Acc core':>8}"
+    )
+    print("-" * 82)
+    for name in names:
+        X, y = load(name)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
+        scaler = StandardScaler().fit(X_train)
+        X_train, X_test = scaler.transform(X_train), scaler.transform(X_test)
+
+        for hidden, epochs in CONFIGS[name]:
+            # Sem parada antecipada: as duas versões treinam o mesmo número de épocas
+            kwargs = {
+                "hidden_layer_sizes": hidden,
+                "max_iter": epochs,
+                "n_iter_no_change": epochs,
+                "random_state": 42,
+            }
+            sk_time = core_time = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                sk = MLPClassifier(**kwargs).fit(X_train, y_train)
+                sk_time = min(sk_time, time.perf_counter() - start)
+
+                start = time.perf_counter()
+                core = NumpyMLPClassifier(**kwargs).fit(X_train, y_train)
+                core_time = min(core_time, time.perf_counter() - start)
+
+            print(
+                f"{name:6} | {str(hidden):12} | {sk_time:11.2f} | {core_time:9.2f} | "
+                f"{sk_time / core_time:6.1f}x | {sk.score(X_test, y_test):11.4f} | "
+                f"{core.score(X_test, y_test):8.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,38 +6,30 @@
 Uso: uv run check-structure.py
 """
 
+import sys
 from pathlib import Path
 
-import yaml
+# Setup path before core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))  # noqa: E402
+
+from core.catalog import load_catalog  # noqa: E402
 
 
 def check_student_structure():
     """Verifica se os arquivos _aluno estão configurados corretamente"""
-    modules_dir = Path("modules")
+    catalog = load_catalog(Path.cwd(), strict=False)
     issues = []
     all_good = []
 
     print("🔍 Verificando estrutura do aluno...\n")
 
-    for module in modules_dir.iterdir():
-        if not module.is_dir():
-            continue
-
-        # Verificar se existe module.yaml
-        yaml_path = module / "module.yaml"
-        if not yaml_path.exists():
-            print(f"⚠️  {module.name}: sem module.yaml, pulando...")
-            continue
-
-        # Carregar configuração do módulo
-        try:
-            with open(yaml_path, encoding="utf-8") as f:
-                module_data = yaml.safe_load(f)
-        except Exception as e:
-            print(f"❌ Erro ao ler {yaml_path}: {e}")
-            continue
+    for module_dir in catalog.missing_yaml:
+        print(f"⚠️  {module_dir.name}: sem module.yaml, pulando...")
+    for yaml_path, error in catalog.errors.items():
+        print(f"❌ Erro ao ler {yaml_path}: {error}")
 
-        exercises_dir = module / "exercises"
+    for module in catalog.modules:
+        exercises_dir = module.directory / "exercises"
         if not exercises_dir.exists():
             continue
 
@@ -46,18 +38,11 @@ def check_student_structure():
         module_skipped = []
 
         # Obter lista de exercícios que devem ser criados
-        exercises = module_data.get("exercises", [])
-        exercises_to_create = {}
-
-        for exercise in exercises:
-            if isinstance(exercise, dict):
-                # Extrair nome do notebook do slug ou notebook field
-                notebook_name = exercise.get("notebook", f"{exercise['slug']}.ipynb")
-                if notebook_name.startswith("exercises/"):
-                    notebook_name = notebook_name.replace("exercises/", "")
-
-                if exercise.get("create", False):
-                    exercises_to_create[notebook_name] = exercise
+        exercises_to_create = {
+            exercise.notebook.name: exercise
+            for exercise in module.exercises
+            if exercise.create
+        }
 
         # Verificar templates e arquivos do aluno
         templates = list(exercises_dir.glob("*.ipynb"))
@@ -78,7 +63,7 @@ def check_student_structure():
                 module_issues.append(f"❌ Faltando: {aluno_file.name}")
 
         if module_issues or module_good or module_skipped:
-            print(f"📁 {module.name}:")
+            print(f"📁 {module.directory.name}:")
             for item in module_good:
                 print(f"   {item}")
             for item in module_issues:
@@ -2,15 +2,18 @@
 """Script para gerenciar status de teste de módulos."""
 
 import argparse
+import sys
 from pathlib import Path
 
-import yaml
+# Setup path before core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))  # noqa: E402
+
+from core.catalog import CatalogError, load_catalog  # noqa: E402
 
 
 def list_modules_status():
     """Lista o status de teste de todos os módulos."""
-    project_root = Path(__file__).parent.parent
-    modules_dir = project_root / "modules"
+    catalog = load_catalog(Path(__file__).parent.parent)
 
     print("📊 Status dos Módulos para Testes:")
     print("=" * 60)
@@ -18,24 +21,18 @@ def list_modules_status():
     enabled_count = 0
     disabled_count = 0
 
-    for module_dir in sorted(modules_dir.iterdir()):
-        if module_dir.is_dir():
-            yaml_path = module_dir / "module.yaml"
-            if yaml_path.exists():
-                with open(yaml_path, encoding="utf-8") as f:
-                    module_data = yaml.safe_load(f)
-
-                test_enabled = module_data.get("test_enabled", True)
-                if test_enabled:
-                    status = "✅ HABILITADO"
-                    enabled_count += 1
-                else:
-                    status = "❌ DESABILITADO"
-                    disabled_count += 1
-
-                print(f"{module_data['slug']:20} | {status:15} | {module_data['title']}")
-            else:
-                print(f"{module_dir.name:20} | ⚠️  SEM YAML     | (module.yaml não encontrado)")
+    for module in catalog.modules:
+        if module.test_enabled:
+            status = "✅ HABILITADO"
+            enabled_count += 1
+        else:
+            status = "❌ DESABILITADO"
+            disabled_count += 1
+
+        print(f"{module.slug:20} | {status:15} | {module.title}")
+
+    for module_dir in catalog.missing_yaml:
+        print(f"{module_dir.name:20} | ⚠️  SEM YAML     | (module.yaml não encontrado)")
 
     print("=" * 60)
     print(f"Total: {enabled_count} habilitados, {disabled_count} desabilitados")
@@ -43,21 +40,12 @@ def list_modules_status():
 
 def toggle_module(module_slug, enable):
     """Habilita ou desabilita testes para um módulo específico."""
-    project_root = Path(__file__).parent.parent
+    catalog = load_catalog(Path(__file__).parent.parent)
 
     # Encontrar o módulo
-    module_path = None
-    for module_dir in (project_root / "modules").iterdir():
-        if module_dir.is_dir():
-            yaml_path = module_dir / "module.yaml"
-            if yaml_path.exists():
-                with open(yaml_path, encoding="utf-8") as f:
-                    module_data = yaml.safe_load(f)
-                if module_data.get("slug") == module_slug:
-                    module_path = yaml_path
-                    break
-
-    if not module_path:
+    try:
+        module_path = catalog.module(module_slug).path
+    except CatalogError:
         print(f"❌ Módulo '{module_slug}' não encontrado!")
         return False
 
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Gerencia o espelho local (offline) dos datasets do Kaggle."""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Setup path before core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))  # noqa: E402
+
+from core.utils.mirror import (  # noqa: E402
+    KAGGLE_DATASETS,
+    DatasetMirror,
+    MirrorError,
+    ensure_kaggle_datasets,
+)
+
+
+def cmd_import(mirror: DatasetMirror, handle: str, source: str) -> None:
+    """Importa um arquivo (zip/tar) ou diretório para o espelho."""
+    entry = mirror.import_archive(handle, source)
+    print(f"✅ '{handle}' importado para {mirror.root}")
+    for name, digest in sorted(entry.files.items()):
+        print(f"   {name:30} {digest[:16]}  ({entry.sizes[name]} bytes)")
+
+
+def cmd_fetch(mirror: DatasetMirror, handles: list[str]) -> None:
+    """Baixa com kagglehub (uma única vez) e importa para o espelho."""
+    for handle in handles or list(KAGGLE_DATASETS):
+        print(f"⬇️  Baixando {handle}...")
+        mirror.import_from_kagglehub(handle)
+    print(f"✅ Espelho atualizado em {mirror.root}")
+
+
+def cmd_materialize(mirror: DatasetMirror, dest: str | None) -> None:
+    """Cria os arquivos de datasets/kaggle a partir do espelho."""
+    for path in ensure_kaggle_datasets(mirror, dest):
+        print(f"✓ {path}")
+    print("✅ Datasets do Kaggle prontos, sem downloads!")
+
+
+def cmd_verify(mirror: DatasetMirror) -> bool:
+    """Verifica os checksums de todos os arquivos do espelho."""
+    problems = mirror.verify()
+    if problems:
+        print("❌ Arquivos ausentes ou corrompidos:")
+        for problem in problems:
+            print(f"   {problem}")
+        return False
+    print(f"✅ {len(mirror.handles())} datasets verificados em {mirror.root}")
+    return True
+
+
+def cmd_list(mirror: DatasetMirror) -> None:
+    """Lista os datasets do curso e se estão no espelho."""
+    print(f"📦 Espelho: {mirror.root}")
+    for handle in sorted(set(KAGGLE_DATASETS) | set(mirror.handles())):
+        status = "✅ no espelho" if mirror.has(handle) else "❌ ausente"
+        print(f"{handle:45} | {status}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Espelho local de datasets do Kaggle",
+        epilog="Exemplos:\n"
+        "  uv run python scripts/mirror_datasets.py fetch\n"
+        "  uv run python scripts/mirror_datasets.py import "
+        "fedesoriano/heart-failure-prediction archive.zip\n"
+        "  ML_CURSO_MIRROR=/mnt/lab/mirror "
+        "uv run python scripts/mirror_datasets.py materialize",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--mirror",
+        help="Diretório do espelho (padrão: $ML_CURSO_MIRROR ou ~/.cache/ml-curso/mirror)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Comandos disponíveis")
+
+    import_parser = subparsers.add_parser("import", help="Importa zip/tar ou diretório")
+    import_parser.add_argument(
+        "handle", help="Dataset (ex: fedesoriano/heart-failure-prediction)"
+    )
+    import_parser.add_argument("source", help="Arquivo .zip/.tar ou diretório")
+
+    fetch_parser = subparsers.add_parser("fetch", help="Baixa com kagglehub e importa")
+    fetch_parser.add_argument(
+        "handles", nargs="*", help="Datasets (padrão: todos do curso)"
+    )
+
+    materialize_parser = subparsers.add_parser(
+        "materialize", help="Cria datasets/kaggle a partir do espelho"
+    )
+    materialize_parser.add_argument("--dest", help="Diretório de destino")
+
+    subparsers.add_parser("verify", help="Verifica checksums do espelho")
+    subparsers.add_parser("list", help="Lista datasets do espelho")
+
+    args = parser.parse_args()
+    mirror = DatasetMirror(args.mirror)
+
+    try:
+        if args.command == "import":
+            cmd_import(mirror, args.handle, args.source)
+        elif args.command == "fetch":
+            cmd_fetch(mirror, args.handles)
+        elif args.command == "materialize":
+            cmd_materialize(mirror, args.dest)
+        elif args.command == "verify":
+            if not cmd_verify(mirror):
+                sys.exit(1)
+        elif args.command == "list":
+            cmd_list(mirror)
+        else:
+            parser.print_help()
+    except (MirrorError, FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,10 @@
 import sys
 from pathlib import Path
 
-import yaml
+# Setup path before core imports
+sys.path.insert(0, str(Path(__file__).parent.parent))  # noqa: E402
+
+from core.catalog import load_catalog  # noqa: E402
 
 
 def run_command(cmd: list[str], cwd: Path | None = None, check: bool = True) -> subprocess.CompletedProcess[bytes]:
@@ -122,30 +125,23 @@ def test_status() -> None:
     print("📊 Status dos Módulos para Testes:")
     print("=" * 60)
 
-    project_root = Path.cwd()
-    modules_dir = project_root / "modules"
+    catalog = load_catalog(Path.cwd())
 
     enabled_count = 0
     disabled_count = 0
 
-    for module_dir in sorted(modules_dir.iterdir()):
-        if module_dir.is_dir():
-            yaml_path = module_dir / "module.yaml"
-            if yaml_path.exists():
-                with open(yaml_path, encoding="utf-8") as f:
-                    module_data = yaml.safe_load(f)
-
-                test_enabled = module_data.get("test_enabled", True)
-                if test_enabled:
-                    status = "✅ HABILITADO"
-                    enabled_count += 1
-                else:
-                    status = "❌ DESABILITADO"
-                    disabled_count += 1
-
-                print(f"{module_data['slug']:20} | {status:15} | {module_data['title']}")
-            else:
-                print(f"{module_dir.name:20} | ⚠️  SEM YAML     | (module.yaml não encontrado)")
+    for module in catalog.modules:
+        if module.test_enabled:
+            status = "✅ HABILITADO"
+            enabled_count += 1
+        else:
+            status = "❌ DESABILITADO"
+            disabled_count += 1
+
+        print(f"{module.slug:20} | {status:15} | {module.title}")
+
+    for module_dir in catalog.missing_yaml:
+        print(f"{module_dir.name:20} | ⚠️  SEM YAML     | (module.yaml não encontrado)")
 
     print("=" * 60)
     print(f"Total: {enabled_count} habilitados, {disabled_count} desabilitados")
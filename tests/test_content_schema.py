@@ -2,7 +2,7 @@
 
 from pathlib import Path
 
-import yaml
+from core.catalog import load_catalog
 
 
 def _is_module_test_enabled(module_data):
@@ -21,19 +21,13 @@ def _is_exercise_test_enabled(exercise_data):
 
 
 def _get_enabled_modules():
-    """Retorna lista de módulos habilitados para teste."""
-    project_root = Path(__file__).parent.parent
-    module_yamls = list(project_root.glob("modules/*/module.yaml"))
-    enabled_modules = []
-
-    for yaml_path in module_yamls:
-        with open(yaml_path, encoding="utf-8") as f:
-            module_data = yaml.safe_load(f)
-
-        if _is_module_test_enabled(module_data):
-            enabled_modules.append(yaml_path)
-
-    return enabled_modules
+    """Retorna lista de (caminho do module.yaml, dados) habilitados para teste."""
+    catalog = load_catalog(Path(__file__).parent.parent)
+    return [
+        (module.path, module.data)
+        for module in catalog.modules
+        if _is_module_test_enabled(module.data)
+    ]
 
 
 def test_module_yaml_files_exist():
@@ -45,11 +39,12 @@ def test_module_yaml_files_exist():
         "modules/01-fundamentos",
     ]
 
+    modules_by_path = {module.path: module for module in load_catalog(project_root)}
+
     for module_path in critical_modules:
         yaml_path = project_root / module_path / "module.yaml"
         if yaml_path.exists():
-            with open(yaml_path, encoding="utf-8") as f:
-                module_data = yaml.safe_load(f)
+            module_data = modules_by_path[yaml_path].data
 
             # Só testa se o módulo está habilitado
             if _is_module_test_enabled(module_data):
@@ -73,10 +68,7 @@ def test_module_yaml_schema():
         "exercises",
     ]
 
-    for yaml_path in enabled_modules:
-        with open(yaml_path, encoding="utf-8") as f:
-            module_data = yaml.safe_load(f)
-
+    for yaml_path, module_data in enabled_modules:
         # Verificar campos obrigatórios
         for field in required_fields:
             assert field in module_data, f"Campo '{field}' ausente em {yaml_path}"
@@ -98,10 +90,7 @@ def test_lesson_structure():
     # Só testa módulos habilitados
     enabled_modules = _get_enabled_modules()
 
-    for yaml_path in enabled_modules:
-        with open(yaml_path, encoding="utf-8") as f:
-            module_data = yaml.safe_load(f)
-
+    for yaml_path, module_data in enabled_modules:
         for lesson in module_data["lessons"]:
             # Só testa lições habilitadas
             if not _is_lesson_test_enabled(lesson):
@@ -124,10 +113,7 @@ def test_exercise_structure():
     # Só testa módulos habilitados
     enabled_modules = _get_enabled_modules()
 
-    for yaml_path in enabled_modules:
-        with open(yaml_path, encoding="utf-8") as f:
-            module_data = yaml.safe_load(f)
-
+    for yaml_path, module_data in enabled_modules:
         for exercise in module_data["exercises"]:
             # Só testa exercícios habilitados
             if not _is_exercise_test_enabled(exercise):
@@ -160,9 +146,7 @@ def test_module_order_consistency():
     enabled_modules = _get_enabled_modules()
     orders = []
 
-    for yaml_path in enabled_modules:
-        with open(yaml_path, encoding="utf-8") as f:
-            module_data = yaml.safe_load(f)
+    for _yaml_path, module_data in enabled_modules:
         orders.append(module_data["order"])
 
     # Verificar se não há ordens duplicadas entre módulos habilitados
@@ -181,20 +165,10 @@ def test_prerequisites_exist(self):
         project_root = Path(__file__).parent.parent
 
         # Considera todos os módulos para verificar pré-requisitos, não só os habilitados
-        module_yamls = list(project_root.glob("modules/*/module.yaml"))
-        module_slugs = set()
-
-        # Coletar todos os slugs
-        for yaml_path in module_yamls:
-            with open(yaml_path, encoding="utf-8") as f:
-                module_data = yaml.safe_load(f)
-            module_slugs.add(module_data["slug"])
+        module_slugs = load_catalog(project_root).slugs
 
         # Verificar se pré-requisitos existem apenas para módulos habilitados
         enabled_modules = _get_enabled_modules()
-        for yaml_path in enabled_modules:
-            with open(yaml_path, encoding="utf-8") as f:
-                module_data = yaml.safe_load(f)
-
+        for _yaml_path, module_data in enabled_modules:
             for prereq in module_data["prerequisites"]:
                 assert prereq in module_slugs, f"Pré-requisito '{prereq}' não encontrado para {module_data['slug']}"
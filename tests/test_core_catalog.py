@@ -0,0 +1,110 @@
+"""Testes para o catálogo de módulos do curso."""
+
+import os
+
+import pytest
+
+from core.catalog import CatalogError, load_catalog
+
+
+def _write_module(root, slug, order, prerequisites=(), exercises=""):
+    module_dir = root / "modules" / slug
+    module_dir.mkdir(parents=True)
+    prereqs = ", ".join(f'"{p}"' for p in prerequisites)
+    (module_dir / "module.yaml").write_text(
+        f'slug: "{slug}"\n'
+        f'title: "Módulo {slug}"\n'
+        f"order: {order}\n"
+        f"prerequisites: [{prereqs}]\n"
+        "outcomes: []\n"
+        "lessons:\n"
+        '  - slug: "01_intro"\n'
+        '    title: "Intro"\n'
+        '    notebook: "lessons/01_intro.ipynb"\n'
+        "    est_time_min: 30\n"
+        f"exercises: [{exercises}]\n",
+        encoding="utf-8",
+    )
+    return module_dir / "module.yaml"
+
+
+@pytest.fixture
+def course(tmp_path):
+    """Cria um curso com três módulos encadeados."""
+    _write_module(tmp_path, "01-a", 1)
+    _write_module(tmp_path, "02-b", 2, ["01-a"])
+    _write_module(tmp_path, "03-c", 3, ["02-b"])
+    (tmp_path / "modules" / "04-sem-yaml").mkdir()
+    return tmp_path
+
+
+def test_catalog_lookups(course):
+    """Verifica busca por slug de módulos e lições."""
+    catalog = load_catalog(course)
+
+    assert catalog.slugs == {"01-a", "02-b", "03-c"}
+    assert catalog.module("02-b").title == "Módulo 02-b"
+    lesson = catalog.lesson("01-a", "01_intro")
+    assert lesson.est_time_min == 30
+    assert lesson.notebook == course / "modules/01-a/lessons/01_intro.ipynb"
+    assert [p.name for p in catalog.missing_yaml] == ["04-sem-yaml"]
+    with pytest.raises(CatalogError):
+        catalog.module("99-nada")
+
+
+def test_prerequisite_graph(course):
+    """Verifica consultas ao grafo de pré-requisitos."""
+    catalog = load_catalog(course)
+
+    assert catalog.prerequisites("03-c") == ["02-b"]
+    assert catalog.prerequisites("03-c", transitive=True) == ["01-a", "02-b"]
+    assert catalog.dependents("01-a", transitive=True) == ["02-b", "03-c"]
+    assert catalog.topological_order() == ["01-a", "02-b", "03-c"]
+    assert catalog.missing_prerequisites() == {}
+
+
+def test_prerequisite_cycle(tmp_path):
+    """Verifica se ciclos de pré-requisitos são detectados."""
+    _write_module(tmp_path, "01-a", 1, ["02-b"])
+    _write_module(tmp_path, "02-b", 2, ["01-a"])
+    with pytest.raises(ValueError):
+        load_catalog(tmp_path).topological_order()
+
+
+def test_invalid_module_yaml(course):
+    """Um module.yaml inválido falha, a menos que strict=False."""
+    (course / "modules" / "02-b" / "module.yaml").write_text(
+        "slug: [sem fechar\n", encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="02-b"):
+        load_catalog(course)
+    catalog = load_catalog(course, strict=False)
+    assert [module.slug for module in catalog] == ["01-a", "03-c"]
+    assert list(catalog.errors) == [course / "modules" / "02-b" / "module.yaml"]
+
+
+def test_yaml_dates_skip_the_json_cache(course):
+    """Datas do YAML não cabem no cache JSON: o catálogo funciona sem ele."""
+    yaml_path = course / "modules" / "01-a" / "module.yaml"
+    with open(yaml_path, "a", encoding="utf-8") as f:
+        f.write("updated: 2024-01-01\n")
+    catalog = load_catalog(course)
+    assert str(catalog.module("01-a").data["updated"]) == "2024-01-01"
+    assert not list((course / ".cache").glob(".*.tmp"))
+
+
+def test_catalog_cache_invalidation(course):
+    """Verifica se o cache é refeito quando um module.yaml muda."""
+    first = load_catalog(course)
+    assert (course / ".cache" / "catalog.json").exists()
+    assert load_catalog(course) is first
+
+    yaml_path = course / "modules" / "02-b" / "module.yaml"
+    yaml_path.write_text(
+        yaml_path.read_text(encoding="utf-8").replace("Módulo 02-b", "Novo título"),
+        encoding="utf-8",
+    )
+    stat = yaml_path.stat()
+    os.utime(yaml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_catalog(course).module("02-b").title == "Novo título"
@@ -0,0 +1,103 @@
+"""Testes para a avaliação de clusters em blocos e por amostragem."""
+
+import numpy as np
+import pytest
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import (
+    calinski_harabasz_score,
+    davies_bouldin_score,
+    silhouette_samples,
+    silhouette_score,
+)
+
+from core.clustering import (
+    cluster_scores,
+    sampled_silhouette,
+    silhouette_samples_multi,
+    silhouette_scores,
+)
+
+
+@pytest.fixture(scope="module")
+def data():
+    X, _ = make_blobs(n_samples=600, centers=4, n_features=3, random_state=0)
+    labelings = [
+        KMeans(k, n_init=1, random_state=0).fit_predict(X) for k in range(2, 7)
+    ]
+    # Um ponto sozinho no próprio cluster
+    labelings.append(np.r_[0, np.ones(len(X) - 1, dtype=int)])
+    return X, labelings
+
+
+def test_silhouette_matches_sklearn(data):
+    """Verifica a silhueta exata, em blocos pequenos, para vários rótulos."""
+    X, labelings = data
+    scores = silhouette_scores(X, labelings, max_memory_mb=0.05)
+    expected = [silhouette_score(X, labels) for labels in labelings]
+    np.testing.assert_allclose(scores, expected, atol=1e-12)
+
+    samples = silhouette_samples_multi(X, labelings[:2], metric="cityblock")
+    np.testing.assert_allclose(
+        samples[1], silhouette_samples(X, labelings[1], metric="cityblock")
+    )
+
+
+def test_sampled_silhouette_interval(data):
+    """Verifica a estimativa estratificada e a cobertura do intervalo."""
+    X, labelings = data
+    labels = labelings[2]
+    exact = silhouette_score(X, labels)
+
+    full = sampled_silhouette(X, labels, sample_size=10**6)
+    assert full.sample_size == len(X)
+    assert full.mean == pytest.approx(exact) and full.std_error == 0
+
+    covered = 0
+    for seed in range(40):
+        estimate = sampled_silhouette(X, labels, sample_size=80, random_state=seed)
+        assert estimate.low < estimate.mean < estimate.high
+        covered += estimate.low <= exact <= estimate.high
+    assert covered >= 32  # ~95% esperado
+
+
+def test_cluster_scores_match_sklearn(data, tmp_path):
+    """Verifica Calinski-Harabasz, Davies-Bouldin e inércia em blocos."""
+    X, labelings = data
+    np.save(tmp_path / "X.npy", X)
+    scores = cluster_scores(tmp_path / "X.npy", labelings, chunk_size=128)
+    for labels, score in zip(labelings, scores, strict=True):
+        assert score.calinski_harabasz == pytest.approx(
+            calinski_harabasz_score(X, labels)
+        )
+        assert score.davies_bouldin == pytest.approx(davies_bouldin_score(X, labels))
+    labels = labelings[2]
+    centroids = np.array([X[labels == c].mean(axis=0) for c in range(4)])
+    assert scores[2].n_clusters == 4
+    assert scores[2].inertia == pytest.approx(np.sum((X - centroids[labels]) ** 2))
+
+
+def test_cluster_scores_with_feature_offset(data):
+    """Features com média alta não cancelam as somas dentro dos clusters."""
+    X, labelings = data
+    scores = cluster_scores(X + 1e6, labelings[:3], chunk_size=128)
+    # Os índices não mudam com a translação; a referência usa os dados
+    # originais, pois o davies_bouldin_score também perde precisão com 1e6
+    for labels, score in zip(labelings, scores, strict=False):
+        assert score.calinski_harabasz == pytest.approx(
+            calinski_harabasz_score(X, labels), rel=1e-6
+        )
+        assert score.davies_bouldin == pytest.approx(
+            davies_bouldin_score(X, labels), rel=1e-6
+        )
+
+
+def test_invalid_labelings(data):
+    """Verifica os erros de rótulos incompatíveis."""
+    X, labelings = data
+    with pytest.raises(ValueError, match="n_clusters"):
+        silhouette_scores(X, [np.zeros(len(X))])
+    with pytest.raises(ValueError, match="entries"):
+        silhouette_scores(X, [labelings[0][:10]])
+    with pytest.raises(ValueError, match="entries"):
+        cluster_scores(X, [labelings[0][:10]])
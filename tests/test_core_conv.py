@@ -0,0 +1,149 @@
+"""Testes para a convolução e o pooling com im2col em NumPy."""
+
+import numpy as np
+import pytest
+
+from core.models.conv import (
+    avg_pool2d,
+    avg_pool2d_backward,
+    col2im,
+    conv2d,
+    conv2d_backward,
+    conv2d_naive,
+    im2col,
+    max_pool2d,
+    max_pool2d_backward,
+)
+
+# (stride, padding)
+SETTINGS = [(1, 0), (2, 1), (3, 2)]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(5, 3, 9, 8))
+    weight = rng.normal(size=(4, 3, 3, 2))
+    bias = rng.normal(size=4)
+    return x, weight, bias
+
+
+@pytest.mark.parametrize("stride,padding", SETTINGS)
+def test_conv2d_matches_naive_loops(data, stride, padding):
+    """Verifica o im2col + GEMM contra os loops aninhados, com lotes pequenos."""
+    x, weight, bias = data
+    expected = conv2d_naive(x, weight, bias, stride, padding)
+    # Orçamento minúsculo: uma imagem por bloco
+    out = conv2d(x, weight, bias, stride, padding, max_memory_mb=1e-4)
+    np.testing.assert_allclose(out, expected, atol=1e-12)
+    np.testing.assert_allclose(conv2d(x, weight, bias, stride, padding), expected)
+
+
+@pytest.mark.parametrize("stride,padding", SETTINGS)
+def test_conv2d_backward_finite_differences(data, stride, padding):
+    """Verifica os gradientes de entrada, pesos e bias por diferenças finitas."""
+    x, weight, bias = data
+    rng = np.random.default_rng(1)
+    grad_output = rng.normal(size=conv2d(x, weight, bias, stride, padding).shape)
+    grad_x, grad_w, grad_b = conv2d_backward(
+        grad_output, x, weight, stride, padding, max_memory_mb=1e-4
+    )
+
+    def loss(x, weight, bias):
+        return float(np.sum(conv2d(x, weight, bias, stride, padding) * grad_output))
+
+    eps = 1e-6
+    for array, grad in [(x, grad_x), (weight, grad_w), (bias, grad_b)]:
+        for index in rng.choice(array.size, min(10, array.size), replace=False):
+            position = np.unravel_index(index, array.shape)
+            original = array[position]
+            array[position] = original + eps
+            plus = loss(x, weight, bias)
+            array[position] = original - eps
+            minus = loss(x, weight, bias)
+            array[position] = original
+            assert grad[position] == pytest.approx((plus - minus) / (2 * eps), abs=1e-6)
+
+
+def test_col2im_is_adjoint_of_im2col(data):
+    """Verifica <im2col(x), c> == <x, col2im(c)>."""
+    x = data[0]
+    cols = im2col(x, 3, stride=2, padding=1)
+    c = np.random.default_rng(2).normal(size=cols.shape)
+    back = col2im(c, x.shape, 3, stride=2, padding=1)
+    assert np.sum(cols * c) == pytest.approx(np.sum(x * back))
+
+
+@pytest.mark.parametrize("kernel,stride", [(2, None), (3, 2), ((2, 3), None)])
+def test_pooling_forward_and_backward(data, kernel, stride):
+    """Verifica o pooling (máximo e média) e seus gradientes."""
+    x = data[0]
+    pooled = max_pool2d(x, kernel, stride)
+    kh, kw = (kernel, kernel) if isinstance(kernel, int) else kernel
+    assert pooled[0, 0, 0, 0] == x[0, 0, :kh, :kw].max()
+    assert avg_pool2d(x, kernel, stride)[0, 0, 0, 0] == pytest.approx(
+        x[0, 0, :kh, :kw].mean()
+    )
+
+    # Cada gradiente vai inteiro para o máximo da janela ...
+    grad = np.ones_like(pooled)
+    grad_x = max_pool2d_backward(grad, x, kernel, stride)
+    assert grad_x.sum() == pytest.approx(grad.sum())
+    assert grad_x[0, 0, :kh, :kw].argmax() == x[0, 0, :kh, :kw].argmax()
+    # ... ou se divide igualmente pela janela
+    grad_x = avg_pool2d_backward(grad, x, kernel, stride)
+    assert grad_x.sum() == pytest.approx(grad.sum())
+
+
+def test_matches_torch(data):
+    """Verifica o forward e o backward contra torch.nn.functional."""
+    torch = pytest.importorskip("torch")
+    functional = torch.nn.functional
+    x, weight, bias = data
+    tx, tw, tb = (torch.tensor(a, requires_grad=True) for a in (x, weight, bias))
+    out = functional.conv2d(tx, tw, tb, stride=2, padding=1)
+    pooled = functional.max_pool2d(out, 2)
+    grad = np.random.default_rng(3).normal(size=pooled.shape)
+    pooled.backward(torch.tensor(grad))
+
+    ours = conv2d(x, weight, bias, stride=2, padding=1)
+    np.testing.assert_allclose(max_pool2d(ours), pooled.detach().numpy(), atol=1e-12)
+    grad_out = max_pool2d_backward(grad, ours)
+    grad_x, grad_w, grad_b = conv2d_backward(grad_out, x, weight, 2, 1)
+    np.testing.assert_allclose(grad_x, tx.grad.numpy(), atol=1e-12)
+    np.testing.assert_allclose(grad_w, tw.grad.numpy(), atol=1e-12)
+    np.testing.assert_allclose(grad_b, tb.grad.numpy(), atol=1e-12)
+
+
+def test_integer_images_are_computed_in_float():
+    """Imagens uint8 não truncam os pesos nem transbordam na saída."""
+    rng = np.random.default_rng(4)
+    x = rng.integers(0, 256, size=(2, 3, 9, 9), dtype=np.uint8)
+    weight = rng.normal(size=(4, 3, 3, 3)).astype(np.float32)
+    bias = rng.normal(size=4).astype(np.float32)
+    out = conv2d(x, weight, bias, padding=1)
+    assert out.dtype == np.float32
+    reference = conv2d_naive(x.astype(np.float64), weight, bias, padding=1)
+    np.testing.assert_allclose(out, reference, rtol=1e-4, atol=1e-2)
+
+    grad_x, grad_w, _ = conv2d_backward(np.ones_like(out), x, weight, 1, 1)
+    expected = conv2d_backward(np.ones_like(out), x.astype(np.float32), weight, 1, 1)
+    np.testing.assert_allclose(grad_x, expected[0])
+    np.testing.assert_allclose(grad_w, expected[1])
+
+    pooled = avg_pool2d(x, 3)
+    assert pooled.dtype == np.float32
+    np.testing.assert_allclose(pooled[0, 0, 0, 0], x[0, 0, :3, :3].mean(), rtol=1e-6)
+    grad = np.full(pooled.shape, 0.5)
+    assert avg_pool2d_backward(grad, x, 3).sum() == pytest.approx(grad.sum())
+    assert max_pool2d_backward(grad, x, 3).sum() == pytest.approx(grad.sum())
+
+
+def test_invalid_shapes():
+    """Verifica as mensagens de erro de formatos inválidos."""
+    with pytest.raises(ValueError, match="N, C, H, W"):
+        conv2d(np.zeros((3, 8, 8)), np.zeros((1, 3, 3, 3)))
+    with pytest.raises(ValueError, match="input channels"):
+        conv2d(np.zeros((1, 3, 8, 8)), np.zeros((1, 2, 3, 3)))
+    with pytest.raises(ValueError, match="does not fit"):
+        conv2d(np.zeros((1, 1, 2, 2)), np.zeros((1, 1, 3, 3)))
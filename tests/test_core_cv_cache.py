@@ -0,0 +1,124 @@
+"""Testes para a validação cruzada com cache em disco."""
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.metrics import fbeta_score, make_scorer
+from sklearn.model_selection import KFold, cross_validate
+from sklearn.tree import DecisionTreeClassifier
+
+from core.model_selection import cached_cross_val_score, cached_cross_validate
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_classification(n_samples=150, n_features=4, random_state=0)
+
+
+def test_matches_sklearn_cross_validate(tmp_path, data):
+    """Verifica se os scores são os mesmos do cross_validate do sklearn."""
+    X, y = data
+    clf = DecisionTreeClassifier(max_depth=3, random_state=0)
+    kfold = KFold(n_splits=5, shuffle=True, random_state=0)
+    scoring = ["accuracy", "f1"]
+
+    ours = cached_cross_validate(
+        clf,
+        X,
+        y,
+        cv=kfold,
+        scoring=scoring,
+        return_train_score=True,
+        cache_dir=tmp_path,
+    )
+    reference = cross_validate(
+        clf, X, y, cv=kfold, scoring=scoring, return_train_score=True
+    )
+
+    for key in ("test_accuracy", "test_f1", "train_accuracy", "train_f1"):
+        np.testing.assert_allclose(ours[key], reference[key])
+    assert not ours["cached"].any()
+
+
+def test_rerun_and_new_metric_do_not_refit(tmp_path, data, monkeypatch):
+    """Verifica se repetir ou adicionar métrica usa os modelos salvos."""
+    X, y = data
+    clf = DecisionTreeClassifier(max_depth=3, random_state=0)
+    first = cached_cross_val_score(
+        clf, X, y, cv=4, scoring="accuracy", cache_dir=tmp_path
+    )
+
+    def fail_fit(self, *args, **kwargs):
+        raise AssertionError("fold was refit")
+
+    monkeypatch.setattr(DecisionTreeClassifier, "fit", fail_fit)
+    again = cached_cross_val_score(
+        clf, X, y, cv=4, scoring="accuracy", cache_dir=tmp_path
+    )
+    more = cached_cross_validate(
+        clf, X, y, cv=4, scoring=["accuracy", "recall"], cache_dir=tmp_path
+    )
+
+    np.testing.assert_array_equal(first, again)
+    np.testing.assert_array_equal(first, more["test_accuracy"])
+    assert more["cached"].all()
+    assert len(more["test_recall"]) == 4
+
+
+def test_cache_key_changes_with_params_and_data(tmp_path, data):
+    """Verifica se outros parâmetros ou dados não reutilizam o cache."""
+    X, y = data
+    cached_cross_validate(
+        DecisionTreeClassifier(max_depth=2), X, y, cv=3, cache_dir=tmp_path
+    )
+
+    other_params = cached_cross_validate(
+        DecisionTreeClassifier(max_depth=4), X, y, cv=3, cache_dir=tmp_path
+    )
+    other_data = cached_cross_validate(
+        DecisionTreeClassifier(max_depth=2), X + 1.0, y, cv=3, cache_dir=tmp_path
+    )
+    assert not other_params["cached"].any()
+    assert not other_data["cached"].any()
+
+
+def test_callable_scorers_do_not_share_cache(tmp_path, data):
+    """Scorers com argumentos diferentes (ou lambdas) não reutilizam scores."""
+    X, y = data
+    clf = DecisionTreeClassifier(max_depth=3, random_state=0)
+    kwargs = {"cv": 3, "cache_dir": tmp_path}
+    scores = {}
+    for beta in (0.1, 10.0):
+        scorer = make_scorer(fbeta_score, beta=beta)
+        scores[beta] = cached_cross_val_score(clf, X, y, scoring=scorer, **kwargs)
+        reference = cross_validate(clf, X, y, cv=3, scoring=scorer)["test_score"]
+        np.testing.assert_allclose(scores[beta], reference)
+    assert not np.allclose(scores[0.1], scores[10.0])
+
+    for value in (1.0, 2.0):
+        result = cached_cross_validate(
+            clf, X, y, scoring=lambda *_, v=value: v, **kwargs
+        )
+        assert result["cached"].all()
+        np.testing.assert_array_equal(result["test_score"], value)
+
+
+def test_lambda_scorer_with_workers(tmp_path, data):
+    """Lambdas não passam por pickle: os folds rodam no próprio processo."""
+    X, y = data
+    clf = DecisionTreeClassifier(max_depth=3, random_state=0)
+    result = cached_cross_validate(
+        clf, X, y, cv=3, scoring=lambda *_: 0.5, cache_dir=tmp_path, n_jobs=2
+    )
+    np.testing.assert_array_equal(result["test_score"], 0.5)
+
+
+def test_parallel_folds(tmp_path, data):
+    """Verifica se os folds em processos dão o mesmo resultado."""
+    X, y = data
+    clf = DecisionTreeClassifier(random_state=0)
+    serial = cached_cross_val_score(clf, X, y, cv=3, cache_dir=tmp_path / "a")
+    parallel = cached_cross_val_score(
+        clf, X, y, cv=3, cache_dir=tmp_path / "b", n_jobs=2
+    )
+    np.testing.assert_array_equal(serial, parallel)
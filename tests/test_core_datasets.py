@@ -0,0 +1,113 @@
+"""Testes para o registro e carregamento de datasets."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.utils.datasets import (
+    downcast_series,
+    iter_chunks,
+    list_datasets,
+    load_dataset,
+    register_dataset,
+)
+
+
+@pytest.fixture
+def csv_dataset(tmp_path):
+    """Registra um CSV temporário como dataset."""
+    csv_path = tmp_path / "toy.csv"
+    pd.DataFrame(
+        {
+            "x": [0.5, 1.5, 2.5],
+            "count": [1, 200, 3],
+            "label": ["a", "b", "a"],
+            "target": [0, 1, 0],
+        }
+    ).to_csv(csv_path, index=False)
+    register_dataset("toy-test", csv_path, target="target", overwrite=True)
+    return csv_path, tmp_path / "cache"
+
+
+def test_synthetic_datasets_registered():
+    """Verifica se os datasets sintéticos estão no registro."""
+    assert {"regression", "classification", "clustering"} <= set(list_datasets())
+
+
+def test_downcast_series():
+    """Verifica a conversão para tipos compactos."""
+    assert downcast_series(pd.Series([1.0, 2.0])).dtype == np.float32
+    assert downcast_series(pd.Series([1, 100])).dtype == np.int8
+    assert downcast_series(pd.Series([1, 1000])).dtype == np.int16
+    assert downcast_series(pd.Series([1, 10**6])).dtype == np.int32
+
+
+def test_load_dataset_roundtrip(csv_dataset):
+    """Verifica se o cache reproduz o CSV com tipos compactos."""
+    csv_path, cache_dir = csv_dataset
+    df = load_dataset("toy-test", cache_dir=cache_dir)
+
+    assert list(df.columns) == ["x", "count", "label", "target"]
+    assert df["x"].dtype == np.float32
+    assert df["count"].dtype == np.int16
+    assert list(df["label"]) == ["a", "b", "a"]
+    np.testing.assert_allclose(df["x"], [0.5, 1.5, 2.5])
+
+    X, y = load_dataset("toy-test", cache_dir=cache_dir, return_X_y=True)
+    assert "target" not in X.columns
+    assert list(y) == [0, 1, 0]
+
+
+def test_load_dataset_uses_memory_map(csv_dataset):
+    """Verifica se a segunda leitura vem do memory-map sem reler o CSV."""
+    csv_path, cache_dir = csv_dataset
+    load_dataset("toy-test", cache_dir=cache_dir)
+
+    df = load_dataset("toy-test", cache_dir=cache_dir)
+    values = df["x"].to_numpy()
+    while not isinstance(values, np.memmap) and values.base is not None:
+        values = values.base
+    assert isinstance(values, np.memmap)
+    assert len(list(cache_dir.glob("toy-test-*"))) == 1
+
+
+def test_load_dataset_invalidates_on_change(csv_dataset):
+    """Verifica se o cache é refeito quando o CSV muda."""
+    csv_path, cache_dir = csv_dataset
+    load_dataset("toy-test", cache_dir=cache_dir)
+
+    pd.DataFrame({"x": [9.0], "count": [7], "label": ["z"], "target": [1]}).to_csv(
+        csv_path, index=False
+    )
+    df = load_dataset("toy-test", cache_dir=cache_dir)
+
+    assert len(df) == 1
+    assert df["x"].iloc[0] == 9.0
+    assert len(list(cache_dir.glob("toy-test-*"))) == 1
+
+
+def test_iter_chunks_sources(tmp_path):
+    """Verifica se todas as fontes produzem os mesmos blocos."""
+    X = np.arange(20, dtype=np.float64).reshape(10, 2)
+    frame = pd.DataFrame(X, columns=["a", "b"]).assign(target=np.arange(10) % 2)
+    frame.to_csv(tmp_path / "data.csv", index=False)
+    np.save(tmp_path / "data.npy", X)
+    register_dataset("chunks-test", tmp_path / "data.csv", "target", overwrite=True)
+
+    sources = [
+        X,
+        frame[["a", "b"]],
+        tmp_path / "data.npy",
+        "chunks-test",
+        lambda: (X[i : i + 4] for i in range(0, 10, 4)),
+    ]
+    for source in sources:
+        blocks = list(iter_chunks(source, chunk_size=4))
+        assert [len(b) for b in blocks] == [4, 4, 2]
+        assert all(b.dtype == np.float32 for b in blocks)
+        np.testing.assert_array_equal(np.concatenate(blocks), X)
+
+    only_b = np.concatenate(list(iter_chunks(tmp_path / "data.csv", 3, ["b"])))
+    np.testing.assert_array_equal(only_b[:, 0], X[:, 1])
+    with pytest.raises(TypeError, match="read once"):
+        next(iter_chunks(iter([X])))
@@ -0,0 +1,125 @@
+"""Testes para o cache de embeddings de um backbone congelado."""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from torch import nn  # noqa: E402
+from torch.utils.data import TensorDataset  # noqa: E402
+
+from core.deep_learning import (  # noqa: E402
+    ImageBatchDataset,
+    backbone_fingerprint,
+    cache_embeddings,
+    write_image_store,
+)
+
+
+class _CountingBackbone(nn.Module):
+    """Backbone pequeno que conta as passagens forward."""
+
+    calls = 0
+
+    def __init__(self):
+        super().__init__()
+        self.features = nn.Sequential(
+            nn.Conv2d(1, 4, 3), nn.BatchNorm2d(4), nn.ReLU(), nn.AdaptiveAvgPool2d(2)
+        )
+
+    def forward(self, x):
+        _CountingBackbone.calls += 1
+        return self.features(x)
+
+
+@pytest.fixture
+def data():
+    generator = torch.Generator().manual_seed(0)
+    X = torch.randn(40, 1, 8, 8, generator=generator)
+    return X, (X.mean(dim=(1, 2, 3)) > 0).long()
+
+
+def _backbone(seed=0):
+    torch.manual_seed(seed)
+    return _CountingBackbone()
+
+
+def test_cache_is_reused_and_matches_forward(tmp_path, data):
+    """Verifica se o mesmo dado, em outro formato, reutiliza o cache."""
+    X, y = data
+    backbone = _backbone()
+    first = cache_embeddings(backbone, (X, y), tmp_path, batch_size=16)
+    calls = _CountingBackbone.calls
+    second = cache_embeddings(backbone, TensorDataset(X, y), tmp_path, batch_size=8)
+
+    assert not first.cached and second.cached
+    assert _CountingBackbone.calls == calls  # o hash dos dados não roda o backbone
+    assert first.key == second.key
+    assert first.embeddings.shape == (40, 16) and first.embeddings.dtype == np.float32
+    with torch.inference_mode():
+        expected = backbone(X).flatten(1).numpy()
+    np.testing.assert_allclose(second.embeddings, expected, atol=1e-6)
+    np.testing.assert_array_equal(second.labels, y.numpy())
+
+
+def test_key_changes_with_weights_and_data(tmp_path, data):
+    """Verifica a chave: pesos, buffers e dados diferentes geram outro cache."""
+    X, y = data
+    assert backbone_fingerprint(_backbone(0)) == backbone_fingerprint(_backbone(0))
+    assert backbone_fingerprint(_backbone(0)) != backbone_fingerprint(_backbone(1))
+    changed = _backbone(0)
+    changed.features[1].running_mean += 1
+    assert backbone_fingerprint(changed) != backbone_fingerprint(_backbone(0))
+
+    base = cache_embeddings(_backbone(), (X, y), tmp_path)
+    other = cache_embeddings(_backbone(), (X[:20], y[:20]), tmp_path)
+    half = cache_embeddings(_backbone(), (X, y), tmp_path, dtype=np.float16)
+    assert len({base.key, other.key, half.key}) == 3
+    assert half.embeddings.dtype == np.float16
+
+
+def test_float64_numpy_inputs(tmp_path):
+    """Verifica se arrays float64 do NumPy passam no backbone float32."""
+    rng = np.random.default_rng(0)
+    X, y = rng.random((20, 5)), rng.integers(0, 2, 20)
+    torch.manual_seed(0)
+    backbone = nn.Linear(5, 3)
+    cache = cache_embeddings(backbone, (X, y), tmp_path, batch_size=8)
+    with torch.inference_mode():
+        expected = backbone(torch.as_tensor(X, dtype=torch.float32)).numpy()
+    np.testing.assert_allclose(cache.embeddings, expected, atol=1e-6)
+    np.testing.assert_array_equal(cache.labels, y)
+
+
+def test_image_store_key_includes_labels(tmp_path, data):
+    """Verifica se trocar só os rótulos do store invalida o cache."""
+    X, y = data
+    images = (X.numpy() * 40 + 128).clip(0, 255)
+    store = write_image_store(tmp_path / "store", images, y.numpy())
+    first = cache_embeddings(_backbone(), ImageBatchDataset(store), tmp_path / "c")
+
+    store = write_image_store(tmp_path / "store", images, 1 - y.numpy())
+    second = cache_embeddings(_backbone(), ImageBatchDataset(store), tmp_path / "c")
+    assert not second.cached and first.key != second.key
+    np.testing.assert_array_equal(second.labels, 1 - y.numpy())
+
+
+def test_train_head_from_cache(tmp_path, data):
+    """Verifica o treino da cabeça direto dos embeddings."""
+    X, y = data
+    train = cache_embeddings(_backbone(), (X, y), tmp_path)
+    torch.manual_seed(0)
+    head = nn.Linear(16, 2)
+    calls = _CountingBackbone.calls
+    reports = train.train_head(
+        head,
+        torch.optim.Adam(head.parameters(), lr=0.05),
+        nn.CrossEntropyLoss(),
+        epochs=5,
+        batch_size=8,
+        val_cache=train,
+        seed=0,
+    )
+    assert _CountingBackbone.calls == calls
+    assert len(reports) == 5 and reports[-1].train_loss < reports[0].train_loss
+    assert reports[-1].val_accuracy is not None
@@ -0,0 +1,70 @@
+"""Testes para o clustering hierárquico com a cadeia de vizinhos mais próximos."""
+
+import numpy as np
+import pytest
+from scipy.cluster.hierarchy import dendrogram, linkage
+from scipy.spatial.distance import pdist
+from sklearn.base import clone
+from sklearn.cluster import AgglomerativeClustering
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+
+from core.clustering import NNChainClustering, condensed_distances, nn_chain_linkage
+
+
+@pytest.fixture(scope="module")
+def X():
+    return np.random.default_rng(0).normal(size=(300, 4))
+
+
+def test_condensed_distances_match_pdist(X):
+    """Verifica a matriz condensada em float32, calculada em blocos."""
+    condensed = condensed_distances(X, block_rows=7)
+    assert condensed.dtype == np.float32
+    np.testing.assert_allclose(condensed, pdist(X), rtol=1e-6)
+    np.testing.assert_allclose(
+        condensed_distances(X, "cityblock"), pdist(X, "cityblock"), rtol=1e-6
+    )
+
+
+@pytest.mark.parametrize("method", ["ward", "complete", "average", "single"])
+def test_linkage_matches_scipy(X, method):
+    """Verifica se a matriz de ligação é a mesma do scipy."""
+    Z = nn_chain_linkage(X, method)
+    expected = linkage(X, method)
+    np.testing.assert_array_equal(Z[:, [0, 1, 3]], expected[:, [0, 1, 3]])
+    # float32 nas ligações com matriz; ward é exato
+    np.testing.assert_allclose(Z[:, 2], expected[:, 2], rtol=1e-5)
+
+
+def test_precomputed_and_dendrogram(X):
+    """Verifica distâncias pré-calculadas e o dendrograma do scipy."""
+    Z = nn_chain_linkage(pdist(X, "cosine"), "average", metric="precomputed")
+    expected = linkage(X, "average", metric="cosine")
+    np.testing.assert_array_equal(Z[:, [0, 1, 3]], expected[:, [0, 1, 3]])
+    tree = dendrogram(Z, no_plot=True, truncate_mode="lastp", p=10)
+    assert len(tree["leaves"]) == 10
+
+
+@pytest.mark.parametrize("method", ["ward", "complete", "average"])
+def test_estimator_matches_agglomerative(method):
+    """Verifica os rótulos contra o AgglomerativeClustering do sklearn."""
+    X, _ = make_blobs(n_samples=400, centers=4, random_state=0)
+    model = clone(NNChainClustering(n_clusters=4, linkage=method)).fit(X)
+    expected = AgglomerativeClustering(n_clusters=4, linkage=method).fit(X)
+    assert model.n_clusters_ == 4 and set(model.labels_) == {0, 1, 2, 3}
+    assert adjusted_rand_score(model.labels_, expected.labels_) == 1.0
+
+    threshold = model.linkage_matrix_[-4, 2]  # corta acima da 4ª maior fusão
+    cut = NNChainClustering(distance_threshold=threshold, linkage=method).fit(X)
+    assert cut.n_clusters_ == 4
+
+
+def test_invalid_arguments(X):
+    """Verifica as mensagens de erro."""
+    with pytest.raises(ValueError, match="method must be"):
+        nn_chain_linkage(X, "centroid")
+    with pytest.raises(ValueError, match="euclidean"):
+        nn_chain_linkage(X, "ward", metric="cityblock")
+    with pytest.raises(ValueError, match="condensed"):
+        nn_chain_linkage(np.ones(4), "average", metric="precomputed")
@@ -0,0 +1,98 @@
+"""Testes para o armazenamento de imagens em uint8 e o aumento em lote."""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from core.deep_learning import (  # noqa: E402
+    BatchAugment,
+    ImageBatchDataset,
+    image_loader,
+    write_image_store,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    rng = np.random.default_rng(0)
+    # Como o MNIST do fetch_openml: linhas achatadas com valores de 0 a 255
+    X = rng.integers(0, 256, (50, 64)).astype(np.float64)
+    y = np.arange(50) % 10
+    chunks = (X[i : i + 16] for i in range(0, 50, 16))
+    return write_image_store(tmp_path / "store", chunks, y, shape=(1, 8, 8)), X, y
+
+
+def test_store_is_uint8_and_normalized(store):
+    """Verifica a conversão para uint8 e a normalização por lote."""
+    store, X, y = store
+    images = store.images()
+    assert images.dtype == np.uint8 and images.shape == (50, 1, 8, 8)
+    assert images.nbytes * 8 == X.nbytes
+    np.testing.assert_array_equal(images.reshape(50, -1), X)
+    assert store.mean[0] == pytest.approx((X / 255).mean())
+    assert store.std[0] == pytest.approx((X / 255).std())
+
+    dataset = ImageBatchDataset(store)
+    batch, labels = dataset[[7, 2, 30]]
+    assert batch.dtype == torch.float32 and batch.shape == (3, 1, 8, 8)
+    expected = (X[[7, 2, 30]] / 255 - store.mean[0]) / store.std[0]
+    np.testing.assert_allclose(batch.reshape(3, -1).numpy(), expected, atol=1e-6)
+    np.testing.assert_array_equal(labels.numpy(), y[[7, 2, 30]])
+
+
+def test_batch_augment():
+    """Verifica flips, deslocamentos, recortes e ruído vetorizados."""
+    rng = np.random.default_rng(0)
+    batch = rng.random((6, 3, 8, 8), dtype=np.float32)
+
+    flipped = BatchAugment(hflip=1.0)(batch.copy(), rng)
+    np.testing.assert_array_equal(flipped, batch[..., ::-1])
+
+    shifted = BatchAugment(max_shift=2)(batch.copy(), rng)
+    assert shifted.shape == batch.shape
+    for image, original in zip(shifted, batch, strict=True):
+        # Cada imagem é a original transladada: algum deslocamento reproduz
+        matches = [
+            np.array_equal(
+                image,
+                np.pad(original, ((0, 0), (2, 2), (2, 2)))[
+                    :, 2 - dy : 10 - dy, 2 - dx : 10 - dx
+                ],
+            )
+            for dy in range(-2, 3)
+            for dx in range(-2, 3)
+        ]
+        assert any(matches)
+
+    cropped = BatchAugment(crop=(5, 6), noise_std=0.1)(batch.copy(), rng)
+    assert cropped.shape == (6, 3, 5, 6)
+    assert cropped.min() >= 0.0 and cropped.max() <= 1.0
+
+
+def test_loader_with_workers(store):
+    """Verifica o DataLoader com workers montando lotes inteiros."""
+    store, _, y = store
+    dataset = ImageBatchDataset(store, augment=BatchAugment(hflip=0.5, max_shift=1))
+    loader = image_loader(dataset, batch_size=16, shuffle=True, num_workers=2, seed=0)
+    seen = []
+    for X_batch, y_batch in loader:
+        assert X_batch.shape[1:] == (1, 8, 8)
+        seen.extend(y_batch.tolist())
+    assert sorted(seen) == sorted(y.tolist())
+
+
+def test_loader_seed_without_workers(store):
+    """Sem workers, o seed também fixa o aumento de dados."""
+    store, _, _ = store
+    dataset = ImageBatchDataset(store, augment=BatchAugment(hflip=0.5, noise_std=0.1))
+
+    def first_batch(seed):
+        loader = image_loader(dataset, batch_size=16, num_workers=0, seed=seed)
+        return next(iter(loader))[0]
+
+    torch.manual_seed(1)
+    first = first_batch(0)
+    torch.manual_seed(2)
+    assert torch.equal(first, first_batch(0))
+    assert not torch.equal(first, first_batch(1))
@@ -0,0 +1,94 @@
+"""Testes para o K-Means em mini-batches sobre dados em blocos."""
+
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+
+from core.clustering import StreamingKMeans, reservoir_sample, streaming_kmeans_sweep
+
+K_VALUES = [2, 3, 4, 5, 6, 7, 8]
+
+
+@pytest.fixture(scope="module")
+def blobs():
+    X, y = make_blobs(
+        n_samples=20000, centers=4, n_features=3, cluster_std=1.0, random_state=0
+    )
+    return X.astype(np.float32), y
+
+
+def test_reservoir_sample_is_uniform():
+    """Verifica se cada linha entra na amostra com probabilidade size / n."""
+    stream = np.arange(50).reshape(-1, 1)
+    rng = np.random.default_rng(0)
+    hits = np.zeros(50)
+    for _ in range(2000):
+        sample, n_rows = reservoir_sample(stream, 10, chunk_size=7, random_state=rng)
+        assert n_rows == 50 and len(np.unique(sample)) == 10
+        hits[sample[:, 0].astype(int)] += 1
+    np.testing.assert_allclose(hits / 2000, 0.2, atol=0.05)
+    # Fluxo menor que a amostra: todas as linhas
+    sample, _ = reservoir_sample(stream[:5], 10)
+    assert sorted(sample[:, 0]) == [0, 1, 2, 3, 4]
+
+
+def test_sweep_matches_full_batch_kmeans(blobs):
+    """Verifica a curva do cotovelo contra um KMeans completo por k."""
+    X, _ = blobs
+    result = streaming_kmeans_sweep(
+        X, K_VALUES, batch_size=1024, chunk_size=5000, random_state=0
+    )
+    expected = [KMeans(k, n_init=3, random_state=0).fit(X).inertia_ for k in K_VALUES]
+
+    assert result.k_values == K_VALUES and result.n_samples == len(X)
+    assert result.elbow_k == 4
+    # Mini-batch fica perto do ótimo do KMeans completo
+    np.testing.assert_allclose(result.inertia, expected, rtol=0.1)
+    assert np.all(np.diff(result.inertia) < 0)
+    assert [len(c) for c in result.centers] == K_VALUES
+    assert all(sizes.sum() == len(X) for sizes in result.cluster_sizes)
+    assert list(result.to_dict()) == ["k", "inertia"]
+
+
+def test_sweep_with_feature_offset(blobs):
+    """Features com média alta (ex.: renda) não degradam as distâncias."""
+    X, _ = blobs
+    X = X.astype(np.float64) + 1e4
+    k_values = [3, 4, 5]
+    result = streaming_kmeans_sweep(X, k_values, chunk_size=5000, random_state=0)
+    expected = [KMeans(k, n_init=3, random_state=0).fit(X).inertia_ for k in k_values]
+    np.testing.assert_allclose(result.inertia, expected, rtol=0.1)
+    assert np.all(np.diff(result.inertia) < 0)
+    model = StreamingKMeans(4, random_state=0).fit(X)
+    assert -model.score(X) == pytest.approx(expected[1], rel=0.1)
+
+
+def test_sweep_streams_from_file(blobs, tmp_path):
+    """Verifica se ler do disco em blocos dá o mesmo resultado que o array."""
+    X, _ = blobs
+    np.save(tmp_path / "X.npy", X)
+    kwargs = {"k_values": [3, 4], "chunk_size": 3000, "random_state": 1}
+    from_array = streaming_kmeans_sweep(X, **kwargs)
+    from_file = streaming_kmeans_sweep(tmp_path / "X.npy", **kwargs)
+    np.testing.assert_allclose(from_file.inertia, from_array.inertia)
+
+    with pytest.raises(ValueError, match="needs at least"):
+        streaming_kmeans_sweep(X[:3], [4])
+
+
+def test_streaming_kmeans_estimator(blobs):
+    """Verifica fit/predict, partial_fit e a compatibilidade com o sklearn."""
+    X, y = blobs
+    model = clone(StreamingKMeans(n_clusters=4, random_state=0)).fit(X)
+    assert adjusted_rand_score(y, model.labels_) > 0.95
+    assert model.cluster_centers_.shape == (4, 3)
+    assert model.score(X) == pytest.approx(-model.inertia_, rel=1e-5)
+    assert model.transform(X[:5]).shape == (5, 4)
+
+    online = StreamingKMeans(n_clusters=4, batch_size=500, random_state=0)
+    for start in range(0, len(X), 2000):
+        online.partial_fit(X[start : start + 2000])
+    assert adjusted_rand_score(y, online.predict(X)) > 0.95
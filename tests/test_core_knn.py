@@ -0,0 +1,71 @@
+"""Testes para o KNN em blocos do core."""
+
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+
+from core.models.knn import BlockedKNNClassifier, kneighbors, knn_k_sweep
+
+K_VALUES = [1, 3, 5, 7, 9, 15]
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = (X[:, 0] + X[:, 1] ** 2 + rng.normal(scale=0.5, size=300) > 1).astype(int)
+    return X[:200], y[:200], X[200:], y[200:]
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "manhattan", "chebyshev"])
+@pytest.mark.parametrize("weights", ["uniform", "distance"])
+def test_k_sweep_matches_sklearn(data, metric, weights):
+    """Verifica se o sweep reproduz um KNeighborsClassifier por k."""
+    X_train, y_train, X_test, y_test = data
+    result = knn_k_sweep(
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        K_VALUES,
+        metric=metric,
+        weights=weights,
+        block_size=17,
+    )
+
+    for i, k in enumerate(K_VALUES):
+        knn = KNeighborsClassifier(n_neighbors=k, metric=metric, weights=weights)
+        knn.fit(X_train, y_train)
+        assert result.train_accuracy[i] == pytest.approx(knn.score(X_train, y_train))
+        assert result.test_accuracy[i] == pytest.approx(knn.score(X_test, y_test))
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "manhattan", "chebyshev"])
+def test_kneighbors_breaks_ties_by_index(metric):
+    """Verifica a ordem (distância, índice) com muitos empates em grade inteira."""
+    rng = np.random.default_rng(1)
+    X_train = rng.integers(0, 4, size=(120, 2)).astype(float)
+    X_query = rng.integers(0, 4, size=(30, 2)).astype(float)
+
+    distances, indices = kneighbors(X_train, X_query, 10, metric=metric, block_size=7)
+
+    diff = np.abs(X_query[:, None, :] - X_train[None, :, :])
+    full = {
+        "euclidean": np.sqrt((diff**2).sum(-1)),
+        "manhattan": diff.sum(-1),
+        "chebyshev": diff.max(-1),
+    }[metric]
+    order = np.lexsort((np.broadcast_to(np.arange(120), full.shape), full), axis=-1)
+    np.testing.assert_array_equal(indices, order[:, :10])
+    np.testing.assert_allclose(
+        distances, np.take_along_axis(full, order[:, :10], axis=1)
+    )
+
+
+def test_vote_ties_go_to_smallest_label():
+    """Verifica o desempate de votos pelo menor rótulo, como no sklearn."""
+    X_train = np.array([[-1.0], [1.0]])
+    y_train = np.array(["b", "a"])
+    knn = BlockedKNNClassifier(n_neighbors=2).fit(X_train, y_train)
+    assert knn.predict([[0.0]])[0] == "a"
+    assert knn.predict_sweep([[0.0]], [1, 2])[:, 0].tolist() == ["b", "a"]
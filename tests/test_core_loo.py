@@ -0,0 +1,138 @@
+"""Testes para o leave-one-out com atalhos exatos."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import make_column_transformer
+from sklearn.datasets import make_classification, make_regression
+from sklearn.linear_model import LinearRegression, LogisticRegression, Ridge
+from sklearn.model_selection import LeaveOneOut, cross_val_predict
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from core.model_selection import loo_predict, loocv_score
+from core.models import BlockedKNNClassifier
+
+
+@pytest.fixture(scope="module")
+def regression():
+    return make_regression(n_samples=60, n_features=4, noise=5.0, random_state=0)
+
+
+@pytest.fixture(scope="module")
+def classification():
+    X, y = make_classification(
+        n_samples=80,
+        n_features=4,
+        n_informative=3,
+        n_redundant=0,
+        n_classes=3,
+        random_state=0,
+    )
+    return X, y
+
+
+def _reference(estimator, X, y):
+    return cross_val_predict(estimator, X, y, cv=LeaveOneOut())
+
+
+@pytest.mark.parametrize(
+    "estimator",
+    [LinearRegression(), Ridge(alpha=3.0), Ridge(alpha=1.0, fit_intercept=False)],
+)
+def test_hat_matrix_matches_refits(regression, estimator):
+    """Verifica a fórmula da matriz chapéu contra n reajustes."""
+    X, y = regression
+    predictions, method = loo_predict(estimator, X, y)
+    assert method == "hat_matrix"
+    np.testing.assert_allclose(predictions, _reference(estimator, X, y))
+
+
+@pytest.mark.parametrize(
+    "estimator", [LinearRegression(positive=True), Ridge(alpha=1.0, positive=True)]
+)
+def test_constrained_linear_models_refit(regression, estimator):
+    """positive=True não tem forma fechada: usa os reajustes."""
+    X, y = regression
+    predictions, method = loo_predict(estimator, X, y)
+    assert method == "refit"
+    np.testing.assert_allclose(predictions, _reference(estimator, X, y))
+
+
+@pytest.mark.parametrize(
+    "estimator",
+    [
+        KNeighborsClassifier(5),
+        KNeighborsClassifier(4, weights="distance", metric="manhattan"),
+        BlockedKNNClassifier(3, metric="chebyshev"),
+    ],
+)
+def test_knn_exclusion_matches_refits(classification, estimator):
+    """Verifica se excluir o próprio ponto equivale a retreinar sem ele."""
+    X, y = classification
+    X = np.vstack([X, X[:10]])  # pontos duplicados: o próprio ponto sai, a cópia fica
+    y = np.concatenate([y, y[:10]])
+    predictions, method = loo_predict(estimator, X, y)
+    assert method == "knn_exclusion"
+    np.testing.assert_array_equal(predictions, _reference(estimator, X, y))
+
+
+@pytest.mark.parametrize("weights", ["uniform", "distance"])
+def test_knn_regressor(regression, weights):
+    """Verifica o KNN de regressão."""
+    X, y = regression
+    estimator = KNeighborsRegressor(5, weights=weights)
+    predictions, _ = loo_predict(estimator, X, y)
+    np.testing.assert_allclose(predictions, _reference(estimator, X, y))
+
+
+def test_gaussian_nb_downdate_matches_refits(classification):
+    """Verifica a atualização das médias e variâncias por classe."""
+    X, y = classification
+    y = y.copy()
+    y[0] = 3  # classe com um único exemplo: some quando ele é deixado de fora
+    predictions, method = loo_predict(GaussianNB(), X, y)
+    assert method == "gaussian_nb"
+    np.testing.assert_array_equal(predictions, _reference(GaussianNB(), X, y))
+
+
+def test_fallback_refits_in_parallel(classification):
+    """Verifica o caminho de reajuste para modelos sem atalho."""
+    X, y = classification
+    model = make_pipeline(StandardScaler(), LogisticRegression())
+    serial = loocv_score(model, X, y)
+    parallel = loocv_score(model, X, y, n_jobs=2)
+    assert serial.method == parallel.method == "refit"
+    np.testing.assert_array_equal(serial.predictions, _reference(model, X, y))
+    np.testing.assert_array_equal(serial.scores, parallel.scores)
+
+
+def test_fallback_keeps_dataframe_input(classification):
+    """Pipelines com colunas de texto recebem o DataFrame sem conversão."""
+    X, y = classification
+    frame = pd.DataFrame(X, columns=["a", "b", "c", "d"])
+    frame["grupo"] = np.where(y == 0, "x", "y")
+    model = make_pipeline(
+        make_column_transformer(
+            (OneHotEncoder(), ["grupo"]), remainder=StandardScaler()
+        ),
+        LogisticRegression(),
+    )
+    predictions, method = loo_predict(model, frame, y)
+    assert method == "refit"
+    np.testing.assert_array_equal(predictions, _reference(model, frame, y))
+
+
+def test_default_scoring(regression, classification):
+    """Verifica a métrica padrão de cada tipo de modelo."""
+    X, y = regression
+    result = loocv_score(Ridge(), X, y)
+    expected = -np.mean((y - _reference(Ridge(), X, y)) ** 2)
+    assert result.mean == pytest.approx(expected)
+    X, y = classification
+    result = loocv_score(KNeighborsClassifier(), X, y)
+    assert result.mean == pytest.approx(
+        np.mean(_reference(KNeighborsClassifier(), X, y) == y)
+    )
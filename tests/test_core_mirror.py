@@ -0,0 +1,68 @@
+"""Testes para o espelho local de datasets."""
+
+import hashlib
+import os
+import zipfile
+
+import pytest
+
+from core.utils.mirror import DatasetMirror, MirrorError
+
+HANDLE = "owner/toy-dataset"
+CONTENT = b"a,b\n1,2\n3,4\n"
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Cria um arquivo zip como o baixado do Kaggle."""
+    zip_path = tmp_path / "toy.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("toy.csv", CONTENT)
+        zf.writestr("extra/readme.txt", b"docs")
+    return zip_path
+
+
+def test_import_is_content_addressed(tmp_path, archive):
+    """Verifica se os arquivos são armazenados pelo checksum."""
+    mirror = DatasetMirror(tmp_path / "mirror")
+    entry = mirror.import_archive(HANDLE, archive)
+
+    digest = hashlib.sha256(CONTENT).hexdigest()
+    assert entry.files["toy.csv"] == digest
+    assert mirror.object_path(digest).read_bytes() == CONTENT
+    assert mirror.handles() == [HANDLE]
+    assert mirror.verify() == []
+
+
+def test_import_checks_expected_checksum(tmp_path, archive):
+    """Verifica se um checksum divergente é rejeitado."""
+    mirror = DatasetMirror(tmp_path / "mirror")
+    with pytest.raises(MirrorError):
+        mirror.import_archive(HANDLE, archive, expected={"toy.csv": "0" * 64})
+    # Nada entra no armazenamento quando a verificação falha
+    assert not [p for p in mirror.objects_dir.rglob("*") if p.is_file()]
+    assert mirror.handles() == []
+
+
+def test_materialize_hardlinks(tmp_path, archive):
+    """Verifica se a materialização usa hardlinks para o espelho."""
+    mirror = DatasetMirror(tmp_path / "mirror")
+    entry = mirror.import_archive(HANDLE, archive)
+    dest = tmp_path / "kaggle"
+
+    paths = mirror.materialize(HANDLE, dest=dest, files=["toy.csv"])
+
+    assert paths == [dest / "toy.csv"]
+    assert paths[0].read_bytes() == CONTENT
+    obj = mirror.object_path(entry.files["toy.csv"])
+    assert os.path.samefile(paths[0], obj)
+
+    # Segunda chamada não recria o arquivo
+    assert mirror.materialize(HANDLE, dest=dest, files=["toy.csv"]) == paths
+
+
+def test_materialize_unknown_handle(tmp_path):
+    """Verifica erro ao materializar dataset ausente do espelho."""
+    mirror = DatasetMirror(tmp_path / "mirror")
+    with pytest.raises(MirrorError):
+        mirror.materialize(HANDLE, dest=tmp_path / "kaggle")
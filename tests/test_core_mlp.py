@@ -0,0 +1,105 @@
+"""Testes para o MLP vetorizado em NumPy."""
+
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.datasets import make_moons
+from sklearn.model_selection import train_test_split
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from core.models import SGD, NumpyMLPClassifier, Optimizer
+from core.models.mlp import _activate
+
+
+class _Capture(Optimizer):
+    """Guarda os gradientes sem alterar os pesos."""
+
+    # Atributo de classe: o fit trabalha com uma cópia do otimizador
+    grads: list = []
+
+    def step(self, params, grads):
+        _Capture.grads = [g.copy() for g in grads]
+
+
+@pytest.fixture(scope="module")
+def moons():
+    X, y = make_moons(n_samples=500, noise=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.3, random_state=42, stratify=y
+    )
+    scaler = StandardScaler().fit(X_train)
+    return scaler.transform(X_train), scaler.transform(X_test), y_train, y_test
+
+
+@pytest.mark.parametrize("activation", ["relu", "tanh", "logistic"])
+def test_gradients_match_finite_differences(activation):
+    """Verifica o backward contra diferenças finitas (float64)."""
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(20, 3)), rng.integers(0, 3, 20)
+    mlp = NumpyMLPClassifier(
+        (4,),
+        activation=activation,
+        optimizer=_Capture(),
+        alpha=0.1,
+        batch_size=20,
+        max_iter=1,
+        shuffle=False,
+        random_state=0,
+        dtype=np.float64,
+    ).fit(X, y)
+    W1, b0, b1 = mlp.coefs_[1], *mlp.intercepts_
+
+    def loss(W0):
+        hidden = X @ W0 + b0
+        _activate(activation, hidden)
+        logits = hidden @ W1 + b1
+        logits -= logits.max(axis=1, keepdims=True)
+        log_p = logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+        penalty = 0.05 * ((W0**2).sum() + (W1**2).sum()) / len(X)
+        return -log_p[np.arange(len(X)), y].mean() + penalty
+
+    W0 = mlp.coefs_[0]
+    numeric = np.zeros_like(W0)
+    for idx in np.ndindex(W0.shape):
+        step = np.zeros_like(W0)
+        step[idx] = 1e-6
+        numeric[idx] = (loss(W0 + step) - loss(W0 - step)) / 2e-6
+    np.testing.assert_allclose(_Capture.grads[0], numeric, atol=1e-7)
+
+
+@pytest.mark.parametrize("optimizer", ["adam", "sgd"])
+def test_accuracy_close_to_sklearn(moons, optimizer):
+    """Verifica se a acurácia fica próxima à do MLPClassifier."""
+    X_train, X_test, y_train, y_test = moons
+    kwargs = {"hidden_layer_sizes": (20, 10), "max_iter": 300, "random_state": 0}
+    ours = NumpyMLPClassifier(optimizer=optimizer, **kwargs).fit(X_train, y_train)
+    sk = MLPClassifier(solver=optimizer, **kwargs).fit(X_train, y_train)
+
+    assert ours.score(X_test, y_test) >= sk.score(X_test, y_test) - 0.03
+    assert ours.coefs_[0].dtype == np.float32
+    assert ours.predict_proba(X_test).sum(axis=1) == pytest.approx(1.0, abs=1e-5)
+    assert ours.loss_curve_[-1] < ours.loss_curve_[0]
+
+
+def test_custom_optimizer_and_clone(moons):
+    """Verifica um otimizador passado como instância e o clone do sklearn."""
+    X_train, X_test, y_train, y_test = moons
+    optimizer = SGD(learning_rate=0.05, momentum=0.0)
+    mlp = NumpyMLPClassifier((10,), optimizer=optimizer, max_iter=50, random_state=0)
+    copy = clone(mlp)
+
+    mlp.fit(X_train, y_train)
+    copy.fit(X_train, y_train)
+    assert not hasattr(optimizer, "_velocities")  # o original não guarda estado
+    np.testing.assert_array_equal(mlp.coefs_[0], copy.coefs_[0])
+    assert mlp.score(X_test, y_test) > 0.8
+
+
+def test_invalid_settings(moons):
+    """Verifica as mensagens de erro."""
+    X_train, _, y_train, _ = moons
+    with pytest.raises(ValueError, match="activation"):
+        NumpyMLPClassifier(activation="softplus").fit(X_train, y_train)
+    with pytest.raises(ValueError, match="optimizer"):
+        NumpyMLPClassifier(optimizer="rmsprop").fit(X_train, y_train)
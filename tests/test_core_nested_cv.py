@@ -0,0 +1,100 @@
+"""Testes para a validação cruzada aninhada com checkpoints."""
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.metrics import accuracy_score, make_scorer
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.tree import DecisionTreeClassifier
+
+from core.model_selection import nested_cross_validate
+
+GRID = {"max_depth": [1, 3, None], "min_samples_leaf": [1, 5]}
+OUTER = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+INNER = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_classification(n_samples=150, n_features=5, random_state=0)
+
+
+def _run(X, y, **kwargs):
+    return nested_cross_validate(
+        DecisionTreeClassifier(random_state=0),
+        GRID,
+        X,
+        y,
+        outer_cv=OUTER,
+        inner_cv=INNER,
+        scoring="accuracy",
+        **kwargs,
+    )
+
+
+def test_matches_manual_grid_search_loop(data):
+    """Verifica se o resultado é o mesmo do loop manual da aula."""
+    X, y = data
+    result = _run(X, y)
+
+    for fold, (train, test) in enumerate(OUTER.split(X, y)):
+        grid = GridSearchCV(
+            DecisionTreeClassifier(random_state=0), GRID, cv=INNER, scoring="accuracy"
+        ).fit(X[train], y[train])
+        score = accuracy_score(y[test], grid.best_estimator_.predict(X[test]))
+        assert result.best_params[fold] == grid.best_params_
+        assert result.scores[fold] == pytest.approx(score)
+        np.testing.assert_allclose(
+            result.inner_scores[fold], grid.cv_results_["mean_test_score"]
+        )
+    assert [row["fold"] for row in result.folds()] == [1, 2, 3]
+
+
+def test_resumes_from_checkpoint(tmp_path, data, monkeypatch):
+    """Verifica se uma execução interrompida continua de onde parou."""
+    X, y = data
+    full = _run(X, y, checkpoint_dir=tmp_path)
+    log = next(tmp_path.glob("nested-*.jsonl"))
+    lines = log.read_text().splitlines(keepends=True)
+    n_tasks = 3 * 6 * 3 + 3
+    assert len(lines) == n_tasks
+
+    # Simula uma interrupção: metade das tarefas e uma linha cortada
+    log.write_text("".join(lines[:30]) + lines[30][:10])
+    resumed = _run(X, y, checkpoint_dir=tmp_path)
+    assert resumed.resumed_tasks == 30
+    np.testing.assert_array_equal(resumed.scores, full.scores)
+
+    def fail_fit(self, *args, **kwargs):
+        raise AssertionError("task was run again")
+
+    monkeypatch.setattr(DecisionTreeClassifier, "fit", fail_fit)
+    again = _run(X, y, checkpoint_dir=tmp_path)
+    assert again.best_params == full.best_params
+
+
+def test_callable_scoring_checkpoint_key(tmp_path, data):
+    """Verifica se um scorer do make_scorer reabre o mesmo log e lambdas falham."""
+    X, y = data
+    tree = DecisionTreeClassifier(random_state=0)
+    kwargs = {"outer_cv": OUTER, "inner_cv": INNER, "checkpoint_dir": tmp_path}
+    nested_cross_validate(
+        tree, GRID, X, y, scoring=make_scorer(accuracy_score), **kwargs
+    )
+    again = nested_cross_validate(
+        tree, GRID, X, y, scoring=make_scorer(accuracy_score), **kwargs
+    )
+    assert again.resumed_tasks == 3 * 6 * 3 + 3
+    assert len(list(tmp_path.glob("nested-*.jsonl"))) == 1
+
+    with pytest.raises(ValueError, match="checkpoint_dir"):
+        nested_cross_validate(tree, GRID, X, y, scoring=lambda *_: 0.0, **kwargs)
+
+
+def test_parallel_matches_serial(data):
+    """Verifica se o grafo de tarefas em processos dá o mesmo resultado."""
+    X, y = data
+    serial = _run(X, y)
+    parallel = _run(X, y, n_jobs=2)
+    np.testing.assert_array_equal(serial.scores, parallel.scores)
+    assert serial.best_params == parallel.best_params
@@ -0,0 +1,175 @@
+"""Testes para o PCA em blocos (randomizado e incremental)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from core.decomposition import StreamingPCA
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Dados com espectro decrescente e média longe da origem."""
+    rng = np.random.default_rng(0)
+    scales = np.geomspace(10, 0.1, 40)
+    X = (
+        rng.standard_normal((3000, 40))
+        * scales
+        @ np.linalg.qr(rng.standard_normal((40, 40)))[0]
+    )
+    return X + 1000.0
+
+
+def assert_same_subspace(components, reference, atol):
+    """Compara componentes a menos do sinal de cada uma."""
+    dots = np.abs(np.sum(components * reference, axis=1))
+    np.testing.assert_allclose(dots, 1.0, atol=atol)
+
+
+def test_randomized_matches_full_pca(data):
+    """Verifica variâncias e componentes contra o PCA completo do sklearn."""
+    reference = PCA(n_components=5).fit(data)
+    pca = StreamingPCA(n_components=5, chunk_size=700, random_state=0).fit(data)
+    assert pca.components_.dtype == np.float32
+    assert pca.n_samples_seen_ == len(data)
+    np.testing.assert_allclose(pca.mean_, reference.mean_, rtol=1e-10)
+    np.testing.assert_allclose(
+        pca.explained_variance_, reference.explained_variance_, rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        pca.explained_variance_ratio_, reference.explained_variance_ratio_, rtol=1e-6
+    )
+    assert_same_subspace(pca.components_, reference.components_, 1e-5)
+    Z = pca.transform(data)
+    assert Z.dtype == np.float32
+    np.testing.assert_allclose(
+        np.abs(Z), np.abs(reference.transform(data)), rtol=1e-3, atol=1e-2
+    )
+
+
+def test_default_passes_on_flat_spectrum():
+    """Com o n_iter padrão, espectros pouco decrescentes ainda convergem."""
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((4000, 100)) * np.geomspace(3, 1, 100)
+    reference = PCA(n_components=5).fit(X)
+    pca = StreamingPCA(n_components=5, random_state=0).fit(X)
+    # Ângulos principais entre os subespaços de 5 componentes
+    cosines = np.linalg.svd(reference.components_ @ pca.components_.T, compute_uv=False)
+    assert cosines.min() > 0.95
+    np.testing.assert_allclose(
+        pca.explained_variance_, reference.explained_variance_, rtol=0.02
+    )
+
+
+def test_exact_path_when_basis_covers_features(data):
+    """Com oversampling >= número de features a covariância é exata."""
+    reference = PCA(n_components=3).fit(data[:, :8])
+    pca = StreamingPCA(n_components=3, chunk_size=500).fit(data[:, :8])
+    np.testing.assert_allclose(
+        pca.explained_variance_, reference.explained_variance_, rtol=1e-9
+    )
+    assert_same_subspace(pca.components_, reference.components_, 1e-6)
+
+
+def test_fit_from_files(tmp_path, data):
+    """Verifica o ajuste a partir de .npy (memmap) e CSV, sem carregar tudo."""
+    npy = tmp_path / "dados.npy"
+    np.save(npy, data)
+    csv = tmp_path / "dados.csv"
+    columns = [f"x{i}" for i in range(data.shape[1])]
+    pd.DataFrame(data, columns=columns).assign(alvo=0).to_csv(csv, index=False)
+
+    in_memory = StreamingPCA(n_components=4, random_state=1).fit(data)
+    from_npy = StreamingPCA(n_components=4, chunk_size=512, random_state=1).fit(
+        str(npy)
+    )
+    from_csv = StreamingPCA(
+        n_components=4, chunk_size=512, columns=columns, random_state=1
+    ).fit(str(csv))
+    for pca in (from_npy, from_csv):
+        np.testing.assert_allclose(
+            pca.explained_variance_, in_memory.explained_variance_, rtol=1e-5
+        )
+        assert_same_subspace(pca.components_, in_memory.components_, 1e-5)
+
+    blocks = list(from_npy.iter_transform(str(npy)))
+    assert [len(b) for b in blocks] == [512] * 5 + [440]
+    np.testing.assert_allclose(
+        np.vstack(blocks), from_npy.transform(data), rtol=1e-5, atol=1e-3
+    )
+
+
+def test_partial_fit_matches_incremental_pca(data):
+    """Verifica partial_fit contra o IncrementalPCA do sklearn."""
+    pca = StreamingPCA(n_components=5)
+    reference = IncrementalPCA(n_components=5)
+    for block in np.array_split(data, 6):
+        pca.partial_fit(block)
+        reference.partial_fit(block)
+    assert pca.n_samples_seen_ == len(data)
+    np.testing.assert_allclose(pca.mean_, reference.mean_, rtol=1e-10)
+    np.testing.assert_allclose(
+        pca.explained_variance_, reference.explained_variance_, rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        pca.explained_variance_ratio_, reference.explained_variance_ratio_, rtol=1e-6
+    )
+    assert_same_subspace(pca.components_, reference.components_, 1e-6)
+
+
+def test_transform_with_large_offset(tmp_path):
+    """A média é subtraída em float64: offset 1e5 com dispersão ~0.01."""
+    rng = np.random.default_rng(1)
+    scales = np.array([5.0, 3.0, 2.0, 0.5, 0.3, 0.1])
+    X = 1e5 + 0.01 * rng.standard_normal((2000, 6)) * scales
+    # svd_solver="full": o solver de covariância do sklearn perde precisão aqui
+    reference = PCA(n_components=3, svd_solver="full").fit(X)
+    pca = StreamingPCA(n_components=3, chunk_size=500).fit(X)
+    expected = np.abs(reference.transform(X))
+    np.testing.assert_allclose(np.abs(pca.transform(X)), expected, atol=1e-6)
+    np.save(tmp_path / "X.npy", X)
+    blocks = np.vstack(list(pca.iter_transform(str(tmp_path / "X.npy"))))
+    np.testing.assert_allclose(np.abs(blocks), expected, atol=1e-6)
+    restored = pca.inverse_transform(pca.transform(X))
+    np.testing.assert_allclose(
+        restored, reference.inverse_transform(reference.transform(X)), atol=1e-6
+    )
+
+
+def test_whiten_and_inverse_transform(data):
+    """Projeções branqueadas têm variância 1 e a inversa reconstrói os dados."""
+    pca = StreamingPCA(n_components=40, whiten=True).fit(data)
+    Z = pca.transform(data)
+    np.testing.assert_allclose(Z.var(axis=0, ddof=1), 1.0, rtol=1e-2)
+    np.testing.assert_allclose(pca.inverse_transform(Z), data, atol=1e-2)
+
+
+def test_pipeline_and_clone(data):
+    """Funciona como etapa de Pipeline e é clonável."""
+    y = (data[:, 0] > np.median(data[:, 0])).astype(int)
+    pipeline = make_pipeline(
+        StandardScaler(),
+        StreamingPCA(n_components=10, random_state=0),
+        LogisticRegression(),
+    )
+    pipeline.fit(data, y)
+    assert pipeline.score(data, y) > 0.9
+    copy = clone(StreamingPCA(n_components=3, chunk_size=100))
+    assert copy.get_params()["chunk_size"] == 100
+
+
+def test_invalid_arguments(data):
+    """Erros para n_components inválido e fonte vazia."""
+    with pytest.raises(ValueError, match="n_components"):
+        StreamingPCA(n_components=0).fit(data)
+    with pytest.raises(ValueError, match="n_components"):
+        StreamingPCA(n_components=41).fit(data)
+    with pytest.raises(ValueError, match="empty"):
+        StreamingPCA().fit(np.empty((0, 3)))
+    with pytest.raises(ValueError, match="n_components"):
+        StreamingPCA(n_components=5).partial_fit(data[:3])
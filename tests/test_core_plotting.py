@@ -0,0 +1,208 @@
+"""Testes para os utilitários de gráficos."""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+from matplotlib.collections import PathCollection  # noqa: E402
+from matplotlib.image import AxesImage  # noqa: E402
+
+from core.utils.metrics import ConfusionMatrixAccumulator  # noqa: E402
+from core.utils.plotting import (  # noqa: E402
+    FigureJob,
+    compute_decision_boundary,
+    export_figures,
+    plot_classification_results,
+    plot_decision_boundary,
+    plot_regression_results,
+    stratified_subsample,
+    summarize_residuals,
+)
+
+
+@pytest.fixture(autouse=True)
+def _close_figures():
+    yield
+    plt.close("all")
+
+
+def _regression_data(n, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.normal(size=n)
+    return y_true, y_true + rng.normal(scale=0.3, size=n)
+
+
+def test_summarize_residuals_matches_numpy():
+    """Verifica as estatísticas de resíduos calculadas em uma passada."""
+    y_true, y_pred = _regression_data(10_000)
+    summary = summarize_residuals(y_true, y_pred, chunk_size=999)
+    residuals = y_true - y_pred
+
+    assert summary.n == 10_000
+    assert summary.residual_mean == pytest.approx(residuals.mean())
+    assert summary.residual_std == pytest.approx(residuals.std())
+    assert summary.rmse == pytest.approx(np.sqrt(np.mean(residuals**2)))
+    assert summary.true_max == y_true.max()
+    assert summary.residual_min == residuals.min()
+
+
+def test_stratified_subsample_keeps_outliers():
+    """Verifica se a subamostragem mantém os outliers."""
+    y_true, y_pred = _regression_data(50_000)
+    y_true[123] += 50.0
+    idx = stratified_subsample(y_pred, y_true - y_pred, size=1_000)
+
+    assert len(idx) <= 1_000
+    assert 123 in idx
+    assert len(np.unique(idx)) == len(idx)
+
+
+def test_plot_regression_small_uses_scatter():
+    """Verifica se poucos pontos continuam como gráfico de dispersão."""
+    y_true, y_pred = _regression_data(200)
+    fig = plot_regression_results(y_true, y_pred, title="Teste")
+
+    for ax in fig.axes[:2]:
+        assert any(isinstance(c, PathCollection) for c in ax.collections)
+        assert not ax.images
+
+
+def test_plot_regression_large_uses_density():
+    """Verifica se muitos pontos ativam o modo de densidade."""
+    y_true, y_pred = _regression_data(5_000)
+    fig = plot_regression_results(y_true, y_pred, density_threshold=1_000)
+
+    ax1, ax2 = fig.axes[:2]
+    assert isinstance(ax1.images[0], AxesImage)
+    assert isinstance(ax2.images[0], AxesImage)
+    assert not ax1.collections
+    assert np.nansum(ax1.images[0].get_array()) == 5_000
+
+
+def test_confusion_accumulator_matches_sklearn():
+    """Verifica se o acumulador em lotes reproduz o sklearn."""
+    from sklearn.metrics import confusion_matrix
+
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 5, size=2_000)
+    y_pred = np.where(rng.random(2_000) < 0.7, y_true, rng.integers(0, 5, 2_000))
+
+    dense = ConfusionMatrixAccumulator()
+    sparse = ConfusionMatrixAccumulator(sparse=True)
+    for start in range(0, 2_000, 300):
+        batch = slice(start, start + 300)
+        dense.update(y_true[batch], y_pred[batch])
+        sparse.update(y_true[batch], y_pred[batch])
+
+    expected = confusion_matrix(y_true, y_pred)
+    np.testing.assert_array_equal(dense.to_dense(), expected)
+    np.testing.assert_array_equal(sparse.to_dense(), expected)
+    np.testing.assert_array_equal(sparse.to_sparse().toarray(), expected)
+    assert dense.accuracy() == pytest.approx(np.mean(y_true == y_pred))
+
+
+def test_confusion_accumulator_labels_and_merge():
+    """Verifica rótulos arbitrários e a combinação de acumuladores."""
+    labels = ["gato", "cão", "pássaro"]
+    a = ConfusionMatrixAccumulator(labels=labels).update(
+        ["gato", "cão"], ["cão", "cão"]
+    )
+    b = ConfusionMatrixAccumulator(labels=labels).update(["pássaro"], ["gato"])
+    cm = a.merge(b).to_dense()
+
+    assert cm[0, 1] == 1 and cm[1, 1] == 1 and cm[2, 0] == 1
+    assert a.n_samples == 3
+    with pytest.raises(ValueError):
+        a.update(["peixe"], ["gato"])
+
+
+def test_plot_classification_many_classes():
+    """Verifica se muitas classes mostram só as mais confundidas, sem anotação."""
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 1_000, size=20_000)
+    y_pred = np.where(rng.random(20_000) < 0.9, y_true, rng.integers(0, 1_000, 20_000))
+    fig = plot_classification_results(y_true, y_pred, top_k=25)
+
+    ax = fig.axes[0]
+    assert len(ax.get_xticklabels()) <= 25
+    assert not ax.texts
+
+
+def test_plot_classification_small_annotated():
+    """Verifica se poucas classes mantêm a matriz anotada."""
+    fig = plot_classification_results(np.array([0, 1, 1, 2]), np.array([0, 1, 2, 2]))
+    assert len(fig.axes[0].texts) == 9
+
+
+class _CountingCircle:
+    """Classificador de círculo que conta os pontos preditos.
+
+    O contador fica na classe: o cache identifica o modelo pelo hash do
+    estado, que não deve mudar a cada ``predict``.
+    """
+
+    calls: list = []
+
+    def __init__(self):
+        type(self).calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return np.where((X**2).sum(axis=1) < 1.0, "dentro", "fora")
+
+
+def test_decision_boundary_matches_full_grid():
+    """Verifica se o refinamento adaptativo reproduz a grade completa."""
+    model = _CountingCircle()
+    boundary = compute_decision_boundary(
+        model, (-2.0, 2.0), (-2.0, 2.0), coarse=16, levels=4, batch_size=1000
+    )
+
+    full = model.predict(np.c_[boundary.xx.ravel(), boundary.yy.ravel()])
+    assert boundary.labels.shape == (257, 257)
+    np.testing.assert_array_equal(boundary.labels.ravel(), full)
+    assert boundary.n_predicted < boundary.n_points / 4
+    assert max(model.calls[:-1]) <= 1000
+
+
+def test_plot_decision_boundary_reuses_cache():
+    """Verifica se mudar só o estilo não chama predict de novo."""
+    model = _CountingCircle()
+    X = np.array([[-1.0, -1.0], [0.0, 0.0], [1.0, 1.0]])
+    y = np.array([1, 0, 1])
+
+    plot_decision_boundary(model, X, y, levels=3)
+    n_calls = len(model.calls)
+    fig, ax = plt.subplots()
+    result = plot_decision_boundary(
+        model, X, y, ax=ax, title="Outro", cmap="viridis", levels=3
+    )
+
+    assert len(model.calls) == n_calls
+    assert result is fig
+    assert ax.get_title() == "Outro"
+
+    plot_decision_boundary(model, X, y, levels=4)
+    assert len(model.calls) > n_calls
+
+
+def test_export_figures_skips_cached(tmp_path):
+    """Verifica se figuras com as mesmas entradas não são renderizadas de novo."""
+    y_true, y_pred = _regression_data(200)
+    jobs = [
+        FigureJob("a", plot_regression_results, (y_true, y_pred)),
+        FigureJob("b", plot_regression_results, (y_true, y_pred), {"title": "B"}),
+    ]
+
+    first = export_figures(jobs, tmp_path, formats=("png", "svg"), n_jobs=2)
+    assert [r.cached for r in first] == [False, False]
+    assert all(path.stat().st_size > 0 for r in first for path in r.paths)
+    assert (tmp_path / "b.svg").exists()
+
+    jobs[1] = FigureJob("b", plot_regression_results, (y_true, y_pred * 2))
+    second = export_figures(jobs, tmp_path, formats=("png", "svg"), n_jobs=1)
+    assert [r.cached for r in second] == [True, False]
+    assert second[0].paths == first[0].paths
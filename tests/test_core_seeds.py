@@ -0,0 +1,109 @@
+"""Testes para utilitários de sementes aleatórias."""
+
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from core.utils.seeds import (
+    fix_random_seeds,
+    map_with_streams,
+    preserve_random_state,
+    rng_stream,
+    spawn_generators,
+    spawn_streams,
+)
+
+
+def _draw(chunk, stream):
+    """Tarefa de exemplo: amostra números a partir do stream recebido."""
+    return chunk, stream.numpy().normal(size=3).tolist()
+
+
+def test_fix_random_seeds_reproducible():
+    """Verifica se fix_random_seeds torna o numpy global reprodutível."""
+    fix_random_seeds(0)
+    first = np.random.rand(3)
+    fix_random_seeds(0)
+    np.testing.assert_array_equal(first, np.random.rand(3))
+
+
+def test_fix_random_seeds_does_not_import_torch():
+    """Verifica se fix_random_seeds não importa torch sem necessidade."""
+    project_root = Path(__file__).parent.parent
+    code = (
+        "import sys\n"
+        "from core.utils.seeds import fix_random_seeds\n"
+        "fix_random_seeds(1)\n"
+        "assert 'torch' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=project_root, check=True)
+
+
+def test_preserve_random_state_restores():
+    """Verifica se o estado global é restaurado ao sair do bloco."""
+    fix_random_seeds(3)
+    expected = (random.random(), np.random.rand())
+
+    fix_random_seeds(3)
+    with preserve_random_state(seed=99):
+        inside = np.random.rand()
+    assert (random.random(), np.random.rand()) == expected
+
+    with preserve_random_state(seed=99):
+        assert np.random.rand() == inside
+
+
+def test_preserve_random_state_torch():
+    """Verifica se o estado do torch também é restaurado."""
+    torch = pytest.importorskip("torch")
+    torch.manual_seed(5)
+    expected = torch.rand(2)
+
+    torch.manual_seed(5)
+    with preserve_random_state(seed=1):
+        torch.rand(10)
+    assert torch.equal(torch.rand(2), expected)
+
+
+def test_spawn_matches_seed_sequence():
+    """Verifica se os streams equivalem a SeedSequence.spawn."""
+    children = np.random.SeedSequence(7).spawn(4)
+    for child, stream in zip(children, spawn_streams(7, 4), strict=True):
+        np.testing.assert_array_equal(
+            child.generate_state(4), stream.seed_sequence.generate_state(4)
+        )
+
+
+def test_stream_independent_of_count():
+    """Verifica se o stream de uma tarefa não depende do total de tarefas."""
+    a = spawn_streams(3, 2)[1].numpy().random(5)
+    b = spawn_streams(3, 10)[1].numpy().random(5)
+    c = rng_stream(3, 1).numpy().random(5)
+    np.testing.assert_array_equal(a, b)
+    np.testing.assert_array_equal(a, c)
+
+
+def test_streams_are_distinct():
+    """Verifica se streams diferentes geram números diferentes."""
+    g1, g2 = spawn_generators(5, 2)
+    assert not np.allclose(g1.random(5), g2.random(5))
+
+
+def test_map_with_streams_independent_of_workers():
+    """Verifica se o resultado é igual para qualquer número de workers."""
+    serial = map_with_streams(_draw, range(6), seed=11, n_jobs=1)
+    parallel = map_with_streams(_draw, range(6), seed=11, n_jobs=3)
+    assert serial == parallel
+
+
+def test_torch_generator_matches_stream():
+    """Verifica se o gerador torch é determinístico por stream."""
+    torch = pytest.importorskip("torch")
+    stream = rng_stream(1, 2)
+    a = torch.rand(3, generator=stream.torch())
+    b = torch.rand(3, generator=stream.torch())
+    assert torch.equal(a, b)
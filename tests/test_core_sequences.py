@@ -0,0 +1,78 @@
+"""Testes para as janelas de sequência sem cópia."""
+
+import pickle
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from core.deep_learning import (  # noqa: E402
+    CharVocabulary,
+    SequenceDataset,
+    encode_corpus,
+    load_corpus,
+)
+
+TEXT = "to be, or not to be: that is the question.\nWhether 'tis nobler… ✓\n" * 20
+
+
+def test_vocabulary_round_trip():
+    """Verifica codificação, decodificação e o tipo compacto."""
+    vocab = CharVocabulary.from_text(TEXT)
+    codes = vocab.encode(TEXT)
+    assert codes.dtype == np.uint8
+    assert vocab.decode(codes) == TEXT
+    with pytest.raises(ValueError, match="'#'"):
+        vocab.encode("#")
+
+    wide = CharVocabulary("".join(chr(0x4E00 + i) for i in range(300)))
+    assert wide.encode(wide.chars).dtype == np.uint16
+    # Tensores uint16 só existem a partir do torch 2.3: viram int32
+    dataset = SequenceDataset(wide.encode(wide.chars * 2), seq_length=8, vocab=wide)
+    X, y = next(dataset.batches(4, dtype=None))
+    assert X.dtype == torch.int32
+    np.testing.assert_array_equal(X.numpy(), dataset.windows[:4, :-1])
+
+
+def test_windows_match_naive_slicing():
+    """Verifica as janelas contra o fatiamento ingênuo."""
+    dataset = SequenceDataset.from_text(TEXT, seq_length=10, stride=3)
+    codes = dataset.codes
+    starts = range(0, len(codes) - 10, 3)
+    assert len(dataset) == len(starts)
+    assert np.shares_memory(dataset.windows, codes)
+
+    X, y = dataset[5]
+    np.testing.assert_array_equal(X.numpy(), codes[15:25])
+    np.testing.assert_array_equal(y.numpy(), codes[16:26])
+
+    batches = list(dataset.batches(32, shuffle=True, seed=0))
+    inputs = torch.cat([X for X, _ in batches]).numpy()
+    expected = np.array([codes[s : s + 10] for s in starts])
+    assert inputs.dtype == np.int64
+    assert sorted(map(bytes, inputs.astype(np.uint8))) == sorted(map(bytes, expected))
+
+
+def test_sequential_batches_share_memory(tmp_path):
+    """Verifica lotes sem cópia sobre um corpus mapeado em memória."""
+    text_path = tmp_path / "corpus.txt"
+    text_path.write_text(TEXT, encoding="utf-8")
+    codes, vocab = encode_corpus(text_path, tmp_path / "corpus.npy", chunk_chars=100)
+    assert isinstance(codes, np.memmap) and vocab.decode(codes) == TEXT
+
+    dataset = SequenceDataset.from_corpus(
+        tmp_path / "corpus.npy", seq_length=16, stride=16
+    )
+    X, y = next(dataset.batches(4, dtype=None))
+    assert X.dtype == torch.uint8 and X.shape == (4, 16)
+    assert np.shares_memory(X.numpy(), dataset.codes)
+    assert vocab.decode(X.flatten().numpy()) == TEXT[:64]
+    assert vocab.decode(y.flatten().numpy()) == TEXT[1:65]
+
+    # Os workers do DataLoader reabrem o arquivo em vez de copiar os dados
+    state = pickle.dumps(dataset)
+    assert len(state) < len(codes)
+    restored = pickle.loads(state)
+    np.testing.assert_array_equal(restored[3][0], dataset[3][0])
+    assert load_corpus(tmp_path / "corpus.npy")[1] == vocab
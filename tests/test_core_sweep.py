@@ -0,0 +1,69 @@
+"""Testes para o sweep paralelo com dados em memória compartilhada."""
+
+import numpy as np
+import pytest
+from sklearn.datasets import make_moons
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import ParameterGrid
+from sklearn.neural_network import MLPClassifier
+
+from core.model_selection import iter_sweep, run_sweep
+from core.model_selection._workers import attach_arrays, share_arrays
+
+ARCHITECTURES = [(5,), (10,), (10, 10)]
+
+
+@pytest.fixture(scope="module")
+def data():
+    X, y = make_moons(n_samples=300, noise=0.2, random_state=42)
+    return X[:200], y[:200], X[200:], y[200:]
+
+
+def test_shared_arrays_are_read_only_views():
+    """Verifica a cópia única para a memória compartilhada."""
+    X = np.arange(12, dtype=np.float32).reshape(3, 4)
+    segments, specs = share_arrays({"X": X, "y": None})
+    try:
+        handles, arrays = attach_arrays(specs)
+        np.testing.assert_array_equal(arrays["X"], X)
+        assert arrays["X"].dtype == np.float32
+        assert "y" not in arrays
+        with pytest.raises(ValueError):
+            arrays["X"][0, 0] = 1
+        del arrays
+        for handle in handles:
+            handle.close()
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    with pytest.raises(ValueError, match="object"):
+        share_arrays({"y": np.array(["a", None], dtype=object)})
+
+
+def test_parallel_matches_serial(data):
+    """Verifica se os processos dão os mesmos scores e curvas de perda."""
+    configs = [{"hidden_layer_sizes": arch} for arch in ARCHITECTURES]
+    model = MLPClassifier(max_iter=50, random_state=42)
+    seen = []
+    parallel = run_sweep(model, configs, *data, n_jobs=2, callback=seen.append)
+    serial = run_sweep(model, configs, *data, n_jobs=1)
+
+    assert sorted(r.index for r in seen) == [0, 1, 2]
+    assert [r.params for r in parallel] == configs
+    for a, b in zip(parallel, serial, strict=True):
+        assert a.test_score == pytest.approx(b.test_score)
+        np.testing.assert_allclose(a.loss_curve, b.loss_curve)
+        assert len(a.loss_curve) == a.to_dict()["n_iter"] > 0
+
+
+def test_stream_can_stop_early(data):
+    """Verifica se parar a iteração encerra o pool sem erro."""
+    X_train, y_train, _, _ = data
+    configs = ParameterGrid({"C": [0.01, 0.1, 1.0, 10.0]})
+    results = iter_sweep(LogisticRegression(), configs, X_train, y_train, n_jobs=2)
+    first = next(results)
+    results.close()
+    assert first.test_score is None
+    assert first.loss_curve == []
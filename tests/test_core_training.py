@@ -0,0 +1,84 @@
+"""Testes para o laço de treino em CPU com PyTorch."""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from torch import nn  # noqa: E402
+from torch.utils.data import TensorDataset  # noqa: E402
+
+from core.deep_learning import CPUTrainer, make_loader  # noqa: E402
+
+
+def _images(n=64):
+    generator = torch.Generator().manual_seed(0)
+    X = torch.randn(n, 1, 8, 8, generator=generator)
+    y = (X.mean(dim=(1, 2, 3)) > 0).long()
+    return TensorDataset(X, y)
+
+
+def _cnn():
+    torch.manual_seed(0)
+    return nn.Sequential(
+        nn.Conv2d(1, 4, 3, padding=1),
+        nn.ReLU(),
+        nn.AdaptiveAvgPool2d(1),
+        nn.Flatten(),
+        nn.Linear(4, 2),
+    )
+
+
+@pytest.mark.parametrize("channels_last", [False, True])
+def test_fit_reports_throughput(channels_last):
+    """Verifica o relatório de cada época."""
+    model = _cnn()
+    trainer = CPUTrainer(
+        model,
+        torch.optim.Adam(model.parameters(), lr=0.05),
+        nn.CrossEntropyLoss(),
+        channels_last=channels_last,
+    )
+    loader = make_loader(_images(), batch_size=16, shuffle=True, num_workers=0)
+    reports = trainer.fit(loader, epochs=3, val_loader=loader)
+
+    assert [r.epoch for r in reports] == [1, 2, 3]
+    assert all(r.samples == 64 and r.samples_per_sec > 0 for r in reports)
+    assert reports[0].step_ms_p50 <= reports[0].step_ms_p99
+    assert 0.0 <= reports[0].data_wait_fraction <= 1.0
+    assert reports[-1].val_accuracy is not None
+    assert reports[-1].train_loss < reports[0].train_loss
+    assert "samples/s" in str(reports[-1])
+    if channels_last:
+        weight = model[0].weight
+        assert weight.is_contiguous(memory_format=torch.channels_last)
+
+
+def test_bf16_autocast_keeps_float32_weights():
+    """Verifica o autocast bfloat16: pesos em float32, saídas finitas."""
+    model = _cnn()
+    trainer = CPUTrainer(
+        model,
+        torch.optim.SGD(model.parameters(), lr=0.1),
+        nn.CrossEntropyLoss(),
+        bf16=True,
+        grad_clip=1.0,
+    )
+    loader = make_loader(_images(), batch_size=32, num_workers=0)
+    report = trainer.train_epoch(loader)
+    outputs = trainer.predict(_images().tensors[0], batch_size=20)
+
+    assert model[0].weight.dtype == torch.float32
+    assert outputs.dtype == torch.float32 and outputs.shape == (64, 2)
+    assert torch.isfinite(outputs).all() and report.train_loss > 0
+
+
+def test_loader_with_persistent_workers():
+    """Verifica os workers do DataLoader com prefetch."""
+    loader = make_loader(_images(), batch_size=16, num_workers=1)
+    assert loader.persistent_workers and loader.prefetch_factor == 2
+    model = nn.Sequential(nn.Flatten(), nn.Linear(64, 2))
+    trainer = CPUTrainer(
+        model, torch.optim.SGD(model.parameters(), lr=0.1), nn.CrossEntropyLoss()
+    )
+    reports = trainer.fit(loader, epochs=2)
+    assert [r.samples for r in reports] == [64, 64]
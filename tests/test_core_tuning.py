@@ -0,0 +1,90 @@
+"""Testes para a busca de hiperparâmetros por successive halving."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import cross_val_score
+
+from core.model_selection import HalvingSearchCV, HyperbandSearchCV, resource_levels
+
+GRID = {"max_depth": [2, 4, None], "min_samples_split": [2, 10]}
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_classification(n_samples=200, n_features=6, random_state=0)
+
+
+def test_resource_levels():
+    """Verifica os orçamentos de cada rodada."""
+    assert resource_levels(7, 200, 3) == [7, 22, 67, 200]
+    assert resource_levels(1, 81, 3) == [1, 3, 9, 27, 81]
+    with pytest.raises(ValueError):
+        resource_levels(0, 10, 3)
+
+
+def test_halving_results_match_cv_results_layout(data):
+    """Verifica se o resultado funciona com as análises do cv_results_."""
+    X, y = data
+    search = HalvingSearchCV(
+        RandomForestClassifier(random_state=0),
+        GRID,
+        max_resource=27,
+        cv=3,
+        scoring="accuracy",
+    ).fit(X, y)
+
+    results = pd.DataFrame(search.cv_results_)
+    assert search.n_resources_ == [3, 9, 27]
+    assert search.n_candidates_ == [6, 2, 1]
+    assert len(results) == 9
+    assert {"split2_test_score", "mean_test_score", "rank_test_score"} <= set(results)
+    assert set(results.groupby("param_n_estimators").groups) == {3, 9, 27}
+    assert search.best_params_["n_estimators"] == 27
+    assert search.best_estimator_.n_estimators == 27
+
+
+def test_warm_start_matches_fit_from_scratch(data):
+    """Verifica se crescer a floresta dá o mesmo score que treinar do zero."""
+    X, y = data
+    search = HalvingSearchCV(
+        RandomForestClassifier(random_state=0), GRID, max_resource=27, cv=3
+    ).fit(X, y)
+
+    scratch = cross_val_score(
+        RandomForestClassifier(random_state=0, **search.best_params_), X, y, cv=3
+    )
+    assert search.best_score_ == pytest.approx(scratch.mean())
+
+
+def test_parallel_matches_serial(data):
+    """Verifica se os processos dão o mesmo resultado que a execução serial."""
+    X, y = data
+    kwargs = {"resource": "n_samples", "factor": 2, "cv": 3, "random_state": 0}
+    grid = {"C": [0.01, 0.1, 1.0, 10.0]}
+    serial = HalvingSearchCV(LogisticRegression(), grid, n_jobs=1, **kwargs).fit(X, y)
+    parallel = HalvingSearchCV(LogisticRegression(), grid, n_jobs=2, **kwargs).fit(X, y)
+
+    np.testing.assert_allclose(
+        serial.cv_results_["mean_test_score"], parallel.cv_results_["mean_test_score"]
+    )
+    assert serial.n_resources_[-1] == len(X) * 2 // 3
+
+
+def test_hyperband_runs_brackets(data):
+    """Verifica se o hyperband avalia vários brackets."""
+    X, y = data
+    search = HyperbandSearchCV(
+        RandomForestClassifier(random_state=0),
+        {"max_depth": list(range(1, 10)), "min_samples_split": [2, 5, 10]},
+        max_resource=9,
+        min_resource=1,
+        cv=3,
+        random_state=0,
+    ).fit(X, y)
+
+    assert set(search.cv_results_["bracket"]) == {0, 1, 2}
+    assert search.best_params_["n_estimators"] == 9